@@ -7,15 +7,40 @@ import io
 import json
 import time
 import shutil
+import sqlite3
+import gzip
+import hashlib
 import logging
 import tempfile
-from dataclasses import dataclass
+import heapq
+import itertools
+import bisect
+import random
+import threading
+import uuid
+import queue
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 
 import requests
 from flask import Flask, request, jsonify
+
+try:  # optional: only needed for the asyncio fetch engine
+    import asyncio
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+try:  # Unix only: peak RSS reporting
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+try:  # optional: brotli variant of precomputed pages
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
 import subprocess
 import os
 import requests
@@ -25,8 +50,10 @@ import shutil
 import json
 import time
 from pathlib import Path
-from urllib.parse import urljoin
-from flask import Flask, render_template, request, Response, jsonify
+from urllib.parse import urljoin, urlsplit
+from http.cookiejar import DefaultCookiePolicy
+from email.utils import parsedate_to_datetime
+from flask import Flask, render_template, request, Response, jsonify, g
 import logging
 from model_data import model_data
 
@@ -43,6 +70,8 @@ logger = logging.getLogger(__name__)
 logging.getLogger('werkzeug').setLevel(logging.INFO)
 logging.getLogger('urllib3.connectionpool').setLevel(logging.WARNING)
 
+PROCESS_STARTED_AT = time.monotonic()  # startup timings are measured from here
+
 DOMINO_DOMAIN = os.environ.get("DOMINO_DOMAIN", "")
 DOMINO_API_KEY = os.environ.get("DOMINO_API_KEY", "")
 print('apikey', DOMINO_API_KEY)
@@ -52,31 +81,364 @@ logger.info(f"DOMINO_API_KEY: {'***' if DOMINO_API_KEY else 'NOT SET'}")
 
 DEFAULT_FILE_REGEX = r"\.py$"  # only scan Python files by default
 MAX_WORKERS = int(os.environ.get("SEC_SCAN_MAX_WORKERS", "16"))
+LIST_WORKERS = int(os.environ.get("SEC_SCAN_LIST_WORKERS", "8"))
+MAX_FILE_BYTES = int(os.environ.get("SEC_SCAN_MAX_FILE_BYTES", "0"))  # 0 = no per-file cap
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+FETCH_ENGINE = os.environ.get("SEC_SCAN_FETCH_ENGINE", "thread")  # "thread" or "asyncio"
+ASYNC_CONCURRENCY = int(os.environ.get("SEC_SCAN_ASYNC_CONCURRENCY", "128"))
+METADATA_CACHE_SIZE = int(os.environ.get("SEC_SCAN_METADATA_CACHE_SIZE", "1024"))
+MODEL_VERSION_TTL_SEC = int(os.environ.get("SEC_SCAN_MODEL_VERSION_TTL_SEC", "3600"))
+GIT_BROWSE_TTL_SEC = int(os.environ.get("SEC_SCAN_GIT_BROWSE_TTL_SEC", "600"))
+HTTP_RETRIES = int(os.environ.get("SEC_SCAN_HTTP_RETRIES", "4"))
+HTTP_BACKOFF_BASE_SEC = float(os.environ.get("SEC_SCAN_HTTP_BACKOFF_BASE_SEC", "0.5"))
+HTTP_BACKOFF_MAX_SEC = float(os.environ.get("SEC_SCAN_HTTP_BACKOFF_MAX_SEC", "30"))
 DEFAULT_SEMGREP_CONFIG = os.environ.get("SEMGREP_CONFIG", "p/default")
+SEMGREP_SHARDS = int(os.environ.get("SEC_SCAN_SEMGREP_SHARDS", "1"))
+SEMGREP_CPU_BUDGET = int(os.environ.get("SEC_SCAN_SEMGREP_CPU_BUDGET", str(os.cpu_count() or 1)))
+SEMGREP_MAX_PROCESSES = int(os.environ.get("SEC_SCAN_SEMGREP_MAX_PROCESSES", str(os.cpu_count() or 1)))
+BATCH_CONCURRENCY = int(os.environ.get("SEC_SCAN_BATCH_CONCURRENCY", "4"))
+MAX_ISSUES = int(os.environ.get("SEC_SCAN_MAX_ISSUES", "0"))  # 0 = keep every issue
+ISSUES_PAGE_SIZE = 50
+ISSUES_PAGE_MAX = 500
+SEMGREP_READ_CHUNK = 256 * 1024
+DEFAULT_EXCLUDE_REGEX = r"(^|/)(node_modules|\.git|\.venv|\.streamlit|venv|env|__pycache__|\.ipynb_checkpoints)(/|$)"
+
+SEC_SCAN_CACHE_DIR = os.environ.get("SEC_SCAN_CACHE_DIR", os.path.expanduser("~/.cache/domino-secscan"))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("SEC_SCAN_RESULT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+RESULT_CACHE_MAX_AGE_SEC = int(os.environ.get("SEC_SCAN_RESULT_CACHE_MAX_AGE_SEC", str(7 * 24 * 3600)))
+BLOB_CACHE_MAX_BYTES = int(os.environ.get("SEC_SCAN_BLOB_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+# Checkouts start on RAM_DIR (tmpfs) and move to disk once their listed size passes RAM_MAX_BYTES; 0 = always disk
+RAM_DIR = os.environ.get("SEC_SCAN_RAM_DIR", "/dev/shm")
+RAM_MAX_BYTES = int(os.environ.get("SEC_SCAN_RAM_MAX_BYTES", str(64 * 1024 * 1024)))
+
+SCAN_JOB_WORKERS = int(os.environ.get("SEC_SCAN_JOB_WORKERS", "2"))
+# Pipelined materialization keeps listings and downloads in flight at the same time: one
+# connection per worker for each queued job, plus a batch's listings over its shared downloads
+HTTP_POOL_SIZE = int(os.environ.get(
+    "SEC_SCAN_HTTP_POOL_SIZE",
+    str(SCAN_JOB_WORKERS * (MAX_WORKERS + LIST_WORKERS) + BATCH_CONCURRENCY * LIST_WORKERS + MAX_WORKERS),
+))
+SCAN_JOB_QUEUE_DEPTH = int(os.environ.get("SEC_SCAN_JOB_QUEUE_DEPTH", "32"))
+SCAN_JOB_TTL_SEC = int(os.environ.get("SEC_SCAN_JOB_TTL_SEC", "3600"))
+PROGRESS_INTERVAL_SEC = 0.25  # minimum spacing of download counter updates and progress events
+SCAN_EVENTS_HEARTBEAT_SEC = float(os.environ.get("SEC_SCAN_EVENTS_HEARTBEAT_SEC", "1"))
+
+PROXY_POOL_SIZE = int(os.environ.get("PROXY_POOL_SIZE", "16"))  # kept-alive connections per upstream host
+PROXY_CACHE_SIZE = int(os.environ.get("PROXY_CACHE_SIZE", "256"))  # cached GET responses; 0 disables
+PROXY_CACHE_MAX_ENTRY_BYTES = int(os.environ.get("PROXY_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))
+PROXY_TIMEOUT_SEC = 30
+CONNECTIVITY_PROBE_INTERVAL_SEC = int(os.environ.get("CONNECTIVITY_PROBE_INTERVAL_SEC", "60"))  # 0 = probe once
+
+# ─────────────────────────────── Metrics ─────────────────────────────────────
+
+# Seconds; spans a cached lookup up to a large repository scan
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def _format_value(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (n, str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for n, v in pairs
+    )
+    return "{" + ",".join(f'{n}="{v}"' for n, v in escaped) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount <= 0:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (last is +Inf), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: Optional[float], **labels) -> None:
+        if value is None:
+            return
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = (("le", _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """Counter or gauge read at scrape time from state kept elsewhere (cache hit counts, sizes)."""
+
+    def __init__(self, name: str, help_text: str, kind: str, labelnames: Tuple[str, ...], collect: Callable[[], list]):
+        super().__init__(name, help_text, labelnames)
+        self.kind = kind
+        self.collect = collect
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, tuple(label_values))} {_format_value(v)}"
+            for label_values, v in self.collect()
+            if v is not None
+        ]
+
+
+class MetricsRegistry:
+    """Process-wide metrics, rendered in the Prometheus text exposition format by GET /metrics."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DURATION_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def callback(self, name: str, help_text: str, kind: str, labelnames: Tuple[str, ...], collect: Callable[[], list]) -> CallbackMetric:
+        return self.register(CallbackMetric(name, help_text, kind, labelnames, collect))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for m in metrics:
+            try:
+                samples = m.samples()
+            except Exception as e:
+                logger.warning(f"Collecting metric {m.name} failed: {e}")
+                continue
+            lines.append(f"# HELP {m.name} {m.help_text}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds", "Time to response headers per route", ("route", "method", "status"))
+DOMINO_REQUEST_SECONDS = metrics.histogram(
+    "secscan_domino_request_duration_seconds", "Domino API response time per attempt", ("endpoint", "status"))
+DOMINO_RETRIES = metrics.counter(
+    "secscan_domino_retries_total", "Domino API attempts that were retried", ("endpoint", "reason"))
+SCAN_PHASE_SECONDS = metrics.histogram(
+    "secscan_phase_duration_seconds",
+    "Scan pipeline time per phase (resolve, listing, download, semgrep, summarize)", ("phase",))
+SCANS = metrics.counter("secscan_scans_total", "Snapshot scans completed, fresh or from the result cache", ("result",))
+SCAN_ERRORS = metrics.counter("secscan_scan_errors_total", "Scan requests that failed, by cause", ("kind",))
+SCAN_FILES = metrics.counter(
+    "secscan_files_total", "Repository files handled by checkouts and scans", ("state",))
+SCAN_BYTES = metrics.counter(
+    "secscan_bytes_total", "Bytes fetched from Domino, reused from the blob cache and read from semgrep", ("source",))
+SCAN_ISSUES = metrics.counter("secscan_issues_found_total", "Issues reported by fresh scans", ("severity",))
+PROXY_UPSTREAM_SECONDS = metrics.histogram(
+    "proxy_upstream_request_duration_seconds", "Upstream response time of /proxy calls", ("method", "status"))
+
+
+def domino_endpoint(url: str) -> str:
+    """Low-cardinality metric label for a Domino API URL."""
+    path = urlsplit(url).path
+    if "/registeredmodels/" in path:
+        return "registered_model_version"
+    if path.endswith("/gitBrowse"):
+        return "git_browse"
+    if path.endswith("/git/browse"):
+        return "repo_listing"
+    if path.endswith("/git/raw"):
+        return "repo_raw"
+    return "other"
 
 # ─────────────────────────────── HTTP Helpers ────────────────────────────────
 class DominoApiError(RuntimeError):
     pass
 
+class FileTooLargeError(DominoApiError):
+    pass
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+
+
+def retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before retry number `attempt` (0-based): Retry-After if sent, else full-jitter backoff."""
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(0.0, delay), HTTP_BACKOFF_MAX_SEC)
+    return random.uniform(0, min(HTTP_BACKOFF_MAX_SEC, HTTP_BACKOFF_BASE_SEC * (2 ** attempt)))
+
 class DominoClient:
-    def __init__(self, base: str, api_key: str, timeout: int = 30):
+    """
+    Session-backed Domino API client.
+
+    Safe to share across threads: the session headers are fixed at construction and
+    each request passes its own overrides. The connection pool is sized so every
+    listing and download worker of the queued jobs and a batch can hold a kept-alive
+    connection; beyond that (e.g. many synchronous scans at once) requests wait for a
+    free connection rather than opening one that would be discarded.
+
+    Throttling (429/503), 5xx gateway errors and connection failures are retried up to
+    `retries` times, honouring Retry-After and otherwise backing off with full jitter.
+    """
+
+    def __init__(
+        self,
+        base: str,
+        api_key: str,
+        timeout: int = 30,
+        pool_size: int = HTTP_POOL_SIZE,
+        retries: int = HTTP_RETRIES,
+    ):
         if not base or not api_key:
             raise DominoApiError("Missing DOMINO_DOMAIN or DOMINO_API_KEY")
         self.base = base.rstrip("/")
         self.timeout = timeout
+        self.pool_size = pool_size
+        self.retries = retries
+        self.n_retries = 0
+        self.n_throttled = 0
+        self._counter_lock = threading.Lock()
         self.s = requests.Session()
+        self._adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+        self.s.mount("https://", self._adapter)
+        self.s.mount("http://", self._adapter)
         self.s.headers.update({
             "X-Domino-Api-Key": api_key,
             "Accept": "application/json",
             "User-Agent": "domino-secscan/1.0",
         })
 
+    def connection_stats(self) -> dict:
+        """Requests served vs. connections opened across this client's pools (process lifetime)."""
+        pools = self._adapter.poolmanager.pools
+        n_requests = n_connections = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                n_requests += pool.num_requests
+                n_connections += pool.num_connections
+        return {
+            "requests": n_requests,
+            "connections_opened": n_connections,
+            "connections_reused": max(0, n_requests - n_connections),
+            "pool_size": self.pool_size,
+            "retries": self.n_retries,
+            "throttled": self.n_throttled,
+        }
+
     def _url(self, path: str) -> str:
         return f"{self.base}{path}"
 
+    def _get(
+        self,
+        url: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        stream: bool = False,
+        on_throttle: Optional[Callable[[], None]] = None,
+    ) -> requests.Response:
+        """GET with retries; returns the final response, whatever its status."""
+        endpoint = domino_endpoint(url)
+        attempt = 0
+        while True:
+            t0 = time.perf_counter()
+            try:
+                r = self.s.get(url, params=params, headers=headers, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                DOMINO_REQUEST_SECONDS.observe(time.perf_counter() - t0, endpoint=endpoint, status="error")
+                if attempt >= self.retries:
+                    raise
+                DOMINO_RETRIES.inc(endpoint=endpoint, reason="connection")
+                delay = retry_delay(attempt)
+            else:
+                DOMINO_REQUEST_SECONDS.observe(time.perf_counter() - t0, endpoint=endpoint, status=r.status_code)
+                if r.status_code not in RETRYABLE_STATUSES or attempt >= self.retries:
+                    return r
+                if r.status_code in THROTTLE_STATUSES:
+                    with self._counter_lock:
+                        self.n_throttled += 1
+                    if on_throttle is not None:
+                        on_throttle()
+                DOMINO_RETRIES.inc(endpoint=endpoint, reason="throttled" if r.status_code in THROTTLE_STATUSES else "server_error")
+                delay = retry_delay(attempt, r.headers.get("Retry-After"))
+                r.close()
+            with self._counter_lock:
+                self.n_retries += 1
+            attempt += 1
+            time.sleep(delay)
+
     def get_json(self, path: str, params: Optional[dict] = None) -> dict:
         url = self._url(path)
-        r = self.s.get(url, params=params, timeout=self.timeout)
+        r = self._get(url, params=params)
         if r.status_code != 200:
             raise DominoApiError(f"GET {url} -> {r.status_code} {r.text[:300]}")
         try:
@@ -88,25 +450,284 @@ class DominoClient:
         url = self._url(path)
         # Override Accept to allow raw content
         headers = {**self.s.headers, "Accept": "*/*"}
-        r = self.s.get(url, params=params, headers=headers, timeout=self.timeout)
+        r = self._get(url, params=params, headers=headers)
         if r.status_code != 200:
             raise DominoApiError(f"GET {url} -> {r.status_code} ({r.headers.get('content-type')})")
         return r.content
 
+    def download_to(
+        self,
+        path: str,
+        dest: Path,
+        params: Optional[dict] = None,
+        max_bytes: Optional[int] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_BYTES,
+        on_throttle: Optional[Callable[[], None]] = None,
+        on_write: Optional[Callable[[float], None]] = None,
+    ) -> int:
+        """
+        Stream a raw response body to dest, holding at most one chunk in memory.
+
+        The body is written to a temporary sibling and renamed into place once complete.
+        Raises FileTooLargeError, leaving nothing behind, when the body exceeds max_bytes.
+        Returns the number of bytes written. on_throttle is called for each throttled attempt;
+        on_write, once the file is in place, with the seconds spent writing it (not receiving).
+        """
+        url = self._url(path)
+        headers = {**self.s.headers, "Accept": "*/*"}
+        part = dest.with_name(f"{dest.name}.part")
+        with self._get(url, params=params, headers=headers, stream=True, on_throttle=on_throttle) as r:
+            if r.status_code != 200:
+                raise DominoApiError(f"GET {url} -> {r.status_code} ({r.headers.get('content-type')})")
+            declared = r.headers.get("content-length")
+            if max_bytes and declared and declared.isdigit() and int(declared) > max_bytes:
+                raise FileTooLargeError(f"GET {url} -> {declared} bytes exceeds cap of {max_bytes}")
+            written = 0
+            write_sec = 0.0
+            try:
+                with open(part, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=chunk_size):
+                        written += len(chunk)
+                        if max_bytes and written > max_bytes:
+                            raise FileTooLargeError(f"GET {url} -> more than {max_bytes} bytes")
+                        t = time.perf_counter()
+                        f.write(chunk)
+                        write_sec += time.perf_counter() - t
+                    t = time.perf_counter()
+                os.replace(part, dest)
+                write_sec += time.perf_counter() - t
+            except BaseException:
+                part.unlink(missing_ok=True)
+                raise
+        if on_write is not None:
+            on_write(write_sec)
+        return written
+
+_domino_clients: Dict[Tuple[str, str], DominoClient] = {}
+_domino_clients_lock = threading.Lock()
+
+
+def get_domino_client(base: str = DOMINO_DOMAIN, api_key: str = DOMINO_API_KEY) -> DominoClient:
+    """Process-wide DominoClient per (domain, key), so scans share one warm connection pool."""
+    with _domino_clients_lock:
+        dc = _domino_clients.get((base, api_key))
+        if dc is None:
+            dc = DominoClient(base, api_key)
+            _domino_clients[(base, api_key)] = dc
+        return dc
+
+# ───────────────────────────── Metadata Cache ───────────────────────────────
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ttl_sec after they were stored."""
+
+    def __init__(self, name: str, maxsize: int, ttl_sec: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_sec = ttl_sec
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[tuple, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple):
+        """Cached value, or _MISSING."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and time.monotonic() - item[0] < self.ttl_sec:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return _MISSING
+
+    def put(self, key: tuple, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, predicate: Optional[Callable[[tuple], bool]] = None) -> int:
+        """Drop entries whose key matches predicate (all entries when None); returns how many."""
+        with self._lock:
+            keys = [k for k in self._data if predicate is None or predicate(k)]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "size": len(self._data),
+            }
+
+
+# A registered version's commit is immutable; a project's main repository rarely moves
+model_version_cache = TTLCache("model_version", METADATA_CACHE_SIZE, MODEL_VERSION_TTL_SEC)
+git_browse_cache = TTLCache("git_browse", METADATA_CACHE_SIZE, GIT_BROWSE_TTL_SEC)
+metrics.callback(
+    "secscan_metadata_cache_lookups_total", "Model-version and gitBrowse cache lookups", "counter", ("cache", "outcome"),
+    lambda: [
+        ((c.name, outcome), c.stats()[outcome])
+        for c in (model_version_cache, git_browse_cache)
+        for outcome in ("hits", "misses")
+    ],
+)
+
+
+def _cached_lookup(cache: TTLCache, key: tuple, fetch: Callable[[], dict]) -> dict:
+    value = cache.get(key)
+    hit = value is not _MISSING
+    if not hit:
+        value = fetch()
+        cache.put(key, value)
+    # Hit and miss counts are exported as secscan_metadata_cache_lookups_total
+    logger.debug(f"{cache.name} cache {'hit' if hit else 'miss'} {key[1:]}")
+    return value
+
 # ───────────────────────────── Domino API Calls ─────────────────────────────
 
 def get_registered_model_version(dc: DominoClient, model_name: str, version: int) -> dict:
-    return dc.get_json(f"/api/registeredmodels/v1/{requests.utils.quote(model_name)}/versions/{version}")
+    return _cached_lookup(
+        model_version_cache,
+        (dc.base, model_name, int(version)),
+        lambda: dc.get_json(f"/api/registeredmodels/v1/{requests.utils.quote(model_name)}/versions/{version}"),
+    )
+
+
+def get_latest_model_version(dc: DominoClient, model_name: str) -> int:
+    """The newest registered version number of a model (not cached: it moves on every registration)."""
+    url = f"/api/registeredmodels/v1/{requests.utils.quote(model_name)}"
+    latest = dc.get_json(url).get("latestVersion")
+    if isinstance(latest, dict):
+        latest = latest.get("modelVersion", latest.get("version"))
+    if latest is None:
+        raise DominoApiError(f"GET {dc._url(url)} reported no latestVersion")
+    return int(latest)
 
 
 def get_git_browse(dc: DominoClient, owner_username: str, project_name: str) -> dict:
-    return dc.get_json("/v4/code/gitBrowse", params={
-        "ownerUsername": owner_username,
-        "projectName": project_name,
-    })
+    return _cached_lookup(
+        git_browse_cache,
+        (dc.base, owner_username, project_name),
+        lambda: dc.get_json("/v4/code/gitBrowse", params={
+            "ownerUsername": owner_username,
+            "projectName": project_name,
+        }),
+    )
 
 
-def list_repo_paths(
+def invalidate_metadata_cache(
+    model_name: Optional[str] = None,
+    version: Optional[int] = None,
+    owner_username: Optional[str] = None,
+    project_name: Optional[str] = None,
+) -> dict:
+    """
+    Drop cached model-version / gitBrowse lookups. With no arguments both caches are
+    cleared; otherwise only entries matching every given field are dropped.
+    """
+    if not any(v is not None for v in (model_name, version, owner_username, project_name)):
+        return {"model_version": model_version_cache.invalidate(), "git_browse": git_browse_cache.invalidate()}
+
+    def _matches_version(key: tuple) -> bool:
+        _, name, ver = key
+        return (
+            model_name is not None
+            and name == model_name
+            and (version is None or ver == int(version))
+        )
+
+    def _matches_project(key: tuple) -> bool:
+        _, owner, project = key
+        return (
+            (owner_username is not None or project_name is not None)
+            and (owner_username is None or owner == owner_username)
+            and (project_name is None or project == project_name)
+        )
+
+    return {
+        "model_version": model_version_cache.invalidate(_matches_version),
+        "git_browse": git_browse_cache.invalidate(_matches_project),
+    }
+
+
+def _browse_directory(dc: DominoClient, project_id: str, repo_id: str, commit: str, directory: str) -> List[dict]:
+    params = {"commit": commit}
+    if directory:
+        params["directory"] = directory
+
+    payload = dc.get_json(
+        f"/v4/projects/{project_id}/gitRepositories/{repo_id}/git/browse",
+        params,
+    )
+    return (payload or {}).get("data", {}).get("items", [])
+
+
+@dataclass(frozen=True)
+class RepoEntry:
+    """A file listed by /git/browse. blob_id is whatever content identity the listing exposes."""
+    path: str
+    size: Optional[int] = None
+    blob_id: Optional[str] = None
+
+
+# Listing fields that identify file content, in order of preference
+_BLOB_ID_FIELDS = ("sha", "blobId", "objectId", "oid", "lastCommitId")
+
+
+def _blob_id(item: dict) -> Optional[str]:
+    for field in _BLOB_ID_FIELDS:
+        value = item.get(field)
+        if value:
+            return str(value)
+    last_commit = item.get("lastCommit")
+    if isinstance(last_commit, dict) and (last_commit.get("sha") or last_commit.get("id")):
+        return str(last_commit.get("sha") or last_commit.get("id"))
+    return None
+
+
+def _classify_browse_items(
+    items: List[dict],
+    include_regex: Optional[re.Pattern],
+    exclude_regex: Optional[re.Pattern],
+) -> Tuple[List[str], List[RepoEntry]]:
+    """Split one /git/browse listing into (directories to descend into, matching files)."""
+    dirs: List[str] = []
+    entries: List[RepoEntry] = []
+    for it in items:
+        kind = it.get("kind")
+        path = it.get("path") or it.get("name")
+        if not path:
+            continue
+
+        if kind == "dir":
+            # add trailing slash so exclude patterns like .../dir/ match directories only
+            dir_key = path + "/"
+            if exclude_regex and exclude_regex.search(dir_key):
+                continue  # block descent
+            dirs.append(path)
+
+        elif kind == "file":
+            if exclude_regex and exclude_regex.search(path):
+                continue
+            if include_regex is None or include_regex.search(path):
+                size = it.get("size")
+                entries.append(RepoEntry(path, size if isinstance(size, int) else None, _blob_id(it)))
+    return dirs, entries
+
+
+def iter_repo_entries(
     dc: DominoClient,
     project_id: str,
     repo_id: str,
@@ -114,70 +735,388 @@ def list_repo_paths(
     include_regex: Optional[re.Pattern] = None,
     exclude_regex: Optional[re.Pattern] = None,
     max_files: int = 10000,
-) -> List[str]:
+    workers: int = LIST_WORKERS,
+    on_listing: Optional[Callable[[str], None]] = None,
+) -> Iterator[RepoEntry]:
     """
-    Recursively list repo files at a commit using /git/browse.
+    Yield repo files at a commit as their directories are listed via /git/browse.
+
+    Directories are browsed breadth-first with up to `workers` listings in flight over
+    dc's shared session. Listings are consumed in the order they were submitted (the
+    oldest is waited on while the others keep running), so the files kept under the
+    max_files cap do not depend on response timing. Filtering happens on the consuming
+    thread:
 
     - Do NOT descend into directories that match exclude_regex.
     - Skip files that match exclude_regex.
     - Keep files that match include_regex (or everything if include_regex is None).
-    """
-    paths: List[str] = []
-    stack: List[str] = [""]  # "" = repo root
-
-    while stack:
-        directory = stack.pop()
-        params = {"commit": commit}
-        if directory:
-            params["directory"] = directory
-
-        payload = dc.get_json(
-            f"/v4/projects/{project_id}/gitRepositories/{repo_id}/git/browse",
-            params,
-        )
-        items = (payload or {}).get("data", {}).get("items", [])
-        for it in items:
-            kind = it.get("kind")
-            path = it.get("path") or it.get("name")
-            if not path:
-                continue
+    - Stop after exactly max_files matches; outstanding listings are cancelled.
 
-            if kind == "dir":
-                # add trailing slash so exclude patterns like .../dir/ match directories only
-                dir_key = path + "/"
-                if exclude_regex and exclude_regex.search(dir_key):
-                    continue  # block descent
-                stack.append(path)
+    on_listing(directory), when given, is called on the consuming thread for each
+    directory whose listing has arrived.
+    """
+    found = 0
+    ex = ThreadPoolExecutor(max_workers=max(1, workers))
+    pending = deque([(ex.submit(_browse_directory, dc, project_id, repo_id, commit, ""), "")])  # "" = repo root
+    try:
+        while pending:
+            fut, directory = pending.popleft()
+            dirs, entries = _classify_browse_items(fut.result(), include_regex, exclude_regex)
+            if on_listing is not None:
+                on_listing(directory)
+            for path in dirs:
+                pending.append((ex.submit(_browse_directory, dc, project_id, repo_id, commit, path), path))
+            for entry in entries:
+                yield entry
+                found += 1
+                if found >= max_files:
+                    logger.warning("Reached max_files cap: %d", max_files)
+                    return
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_repo_paths(
+    dc: DominoClient,
+    project_id: str,
+    repo_id: str,
+    commit: str,
+    include_regex: Optional[re.Pattern] = None,
+    exclude_regex: Optional[re.Pattern] = None,
+    max_files: int = 10000,
+    workers: int = LIST_WORKERS,
+) -> Iterator[str]:
+    """Yield matching repo file paths at a commit; see iter_repo_entries()."""
+    for entry in iter_repo_entries(
+        dc, project_id, repo_id, commit, include_regex, exclude_regex, max_files, workers
+    ):
+        yield entry.path
 
-            elif kind == "file":
-                if exclude_regex and exclude_regex.search(path):
-                    continue
-                if include_regex is None or include_regex.search(path):
-                    paths.append(path)
-                    if len(paths) >= max_files:
-                        logger.warning("Reached max_files cap: %d", max_files)
-                        return paths
 
-    return sorted(paths)
+def list_repo_paths(
+    dc: DominoClient,
+    project_id: str,
+    repo_id: str,
+    commit: str,
+    include_regex: Optional[re.Pattern] = None,
+    exclude_regex: Optional[re.Pattern] = None,
+    max_files: int = 10000,
+    workers: int = LIST_WORKERS,
+) -> List[str]:
+    """Recursively list repo files at a commit; see iter_repo_entries() for the filtering rules."""
+    return sorted(iter_repo_paths(
+        dc, project_id, repo_id, commit, include_regex, exclude_regex, max_files, workers
+    ))
 
 
 def fetch_file_bytes(dc: DominoClient, project_id: str, repo_id: str, commit: str, path: str) -> bytes:
     return dc.get_bytes(f"/v4/projects/{project_id}/gitRepositories/{repo_id}/git/raw",
                         params={"fileName": path, "commit": commit})
 
-# ───────────────────────────── Repo Materialization ──────────────────────────
 
-def materialize_repo(
+def fetch_file_to(
     dc: DominoClient,
     project_id: str,
     repo_id: str,
     commit: str,
-    file_regex: Optional[str],
-    exclude_regex: Optional[str],
-    max_files: int,
-    workers: int = MAX_WORKERS,
-) -> Tuple[str, List[str]]:
-    """Creates a temp dir, downloads matching files at the commit, returns (dir, paths)."""
+    path: str,
+    dest: Path,
+    max_bytes: Optional[int] = None,
+    on_throttle: Optional[Callable[[], None]] = None,
+    on_write: Optional[Callable[[float], None]] = None,
+) -> int:
+    return dc.download_to(f"/v4/projects/{project_id}/gitRepositories/{repo_id}/git/raw", dest,
+                          params={"fileName": path, "commit": commit}, max_bytes=max_bytes,
+                          on_throttle=on_throttle, on_write=on_write)
+
+# ───────────────────────────── Repo Blob Cache ───────────────────────────────
+
+class BlobCache:
+    """
+    On-disk cache of fetched repo files, shared across scans and commits.
+
+    Files are keyed by (project, repo, path, content identity) and linked into a
+    scan's checkout instead of being downloaded again. Hard links are used where
+    the filesystem allows, falling back to copies. Once the cache grows past
+    max_bytes the least recently used files are removed.
+    """
+
+    def __init__(self, root: str, max_bytes: int = BLOB_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    @staticmethod
+    def key(project_id: str, repo_id: str, path: str, identity: str) -> str:
+        return hashlib.sha256(json.dumps([project_id, repo_id, path, identity]).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    @staticmethod
+    def _link_or_copy(src: Path, dest: Path) -> None:
+        try:
+            os.link(src, dest)
+        except OSError:
+            shutil.copyfile(src, dest)
+
+    def fetch_into(self, key: str, dest: Path) -> Optional[int]:
+        """Place the cached file at dest; returns its size, or None on a miss."""
+        cached = self._path(key)
+        try:
+            size = cached.stat().st_size
+            self._link_or_copy(cached, dest)
+            os.utime(cached)  # mtime doubles as the LRU clock
+        except FileNotFoundError:
+            return None
+        return size
+
+    def add(self, key: str, src: Path) -> None:
+        cached = self._path(key)
+        if cached.exists():
+            return
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_name(f"{cached.name}.{uuid.uuid4().hex}.tmp")
+        self._link_or_copy(src, tmp)
+        os.replace(tmp, cached)
+        size = cached.stat().st_size
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(f.stat().st_size for f in self.root.glob("*/*") if f.is_file())
+            else:
+                self._total_bytes += size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        files = []
+        for f in self.root.glob("*/*"):
+            try:
+                st = f.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, f))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        target = int(self.max_bytes * 0.9)  # leave headroom so eviction doesn't run on every add
+        for _, size, f in files:
+            if total <= target:
+                break
+            try:
+                f.unlink()
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._total_bytes = total
+
+
+repo_blob_cache = BlobCache(os.path.join(SEC_SCAN_CACHE_DIR, "blobs")) if BLOB_CACHE_MAX_BYTES > 0 else None
+
+# ───────────────────────────── Repo Materialization ──────────────────────────
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for upstream fetches.
+
+    Each throttling signal halves the limit (at most once per cooldown, so one burst
+    of 429s counts once); every `limit` consecutive successes raise it by one, up to
+    `maximum`. Use as a context manager around each fetch.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1, cooldown_sec: float = 1.0):
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = self.maximum
+        self.lowest_limit = self.limit
+        self.throttle_signals = 0
+        self.cooldown_sec = cooldown_sec
+        self._in_flight = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def __enter__(self) -> "AdaptiveLimiter":
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        with self._cond:
+            self._release(exc_type is None)
+            self._cond.notify_all()
+
+    def _release(self, success: bool) -> None:
+        self._in_flight -= 1
+        if success:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self._successes = 0
+
+    def on_throttle(self) -> None:
+        with self._cond:
+            self.throttle_signals += 1
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown_sec:
+                return
+            self._last_decrease = now
+            self._successes = 0
+            self.limit = max(self.minimum, self.limit // 2)
+            self.lowest_limit = min(self.lowest_limit, self.limit)
+
+
+class AsyncAdaptiveLimiter(AdaptiveLimiter):
+    """
+    AdaptiveLimiter for tasks on one event loop: use `async with`, which waits for a
+    slot without blocking the loop. The AIMD rules are the same.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1, cooldown_sec: float = 1.0):
+        super().__init__(maximum, minimum, cooldown_sec)
+        self._async_cond = asyncio.Condition()
+
+    async def __aenter__(self) -> "AsyncAdaptiveLimiter":
+        async with self._async_cond:
+            await self._async_cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        async with self._async_cond:
+            self._release(exc_type is None)
+            self._async_cond.notify_all()
+
+
+@dataclass
+class MaterializeStats:
+    """Timings and counters for one materialize_repo() call (seconds are since its start)."""
+    dirs_listed: int = 0
+    files_listed: int = 0
+    files_written: int = 0
+    files_failed: int = 0
+    files_too_large: int = 0
+    files_reused: int = 0
+    bytes_fetched: int = 0
+    bytes_reused: int = 0
+    throttle_signals: int = 0
+    concurrency_lowest: Optional[int] = None
+    concurrency_final: Optional[int] = None
+    listing_sec: float = 0.0
+    first_file_sec: Optional[float] = None
+    duration_sec: float = 0.0
+    storage: Optional[str] = None  # "memory" (RAM_DIR) or "disk"
+    projected_bytes: Optional[int] = None  # listed size of the checkout when placed in memory
+    write_sec: float = 0.0  # summed over download threads; time in file writes/links only
+
+
+class _CheckoutPlanner:
+    """
+    Chooses where a checkout is written from the sizes reported by the listing.
+
+    The checkout starts on RAM_DIR and every listed entry is downloaded right away,
+    so fetches overlap the listing whatever the repo size. While the projected total
+    (files over the per-file cap are skipped, so not counted) stays within
+    ram_max_bytes (and half of RAM_DIR's free space), entries land in RAM. Once it
+    would be exceeded, or a size is unknown, later entries go to a disk directory
+    and settle() moves the files already in RAM there after the downloads finish,
+    so RAM holds at most ram_max_bytes of any one checkout.
+    """
+
+    def __init__(self, ram_max_bytes: int, max_file_bytes: Optional[int]):
+        self.max_file_bytes = max_file_bytes
+        self.projected = 0
+        self.repo_dir: Optional[str] = None
+        self.storage: Optional[str] = None
+        self._spilled_dir: Optional[str] = None
+        self.ram_max_bytes = 0
+        if ram_max_bytes > 0 and os.path.isdir(RAM_DIR):
+            try:
+                # Leave headroom on the tmpfs for other scans' checkouts
+                self.ram_max_bytes = min(ram_max_bytes, shutil.disk_usage(RAM_DIR).free // 2)
+                if self.ram_max_bytes > 0:
+                    self.repo_dir = tempfile.mkdtemp(prefix="domino_repo_", dir=RAM_DIR)
+                    self.storage = "memory"
+            except OSError as e:
+                logger.warning(f"RAM-backed checkout unavailable in {RAM_DIR}: {e}")
+        if self.repo_dir is None:
+            self._to_disk()
+
+    def add(self, entry: RepoEntry) -> None:
+        """
+        Count a listed entry before its download starts; repo_dir then names where it
+        goes (files over the per-file cap are skipped, so not counted).
+        """
+        if self.storage != "memory":
+            return
+        if self.max_file_bytes and entry.size is not None and entry.size > self.max_file_bytes:
+            return
+        if entry.size is None or self.projected + entry.size > self.ram_max_bytes:
+            self._spilled_dir = self.repo_dir
+            self._to_disk()
+        else:
+            self.projected += entry.size
+
+    def settle(self) -> float:
+        """
+        All downloads are done; moves files written to RAM before a spill into the
+        disk checkout. Returns the seconds spent.
+        """
+        if self._spilled_dir is None:
+            return 0.0
+        t = time.perf_counter()
+        ram_dir, self._spilled_dir = self._spilled_dir, None
+        for root, _, files in os.walk(ram_dir):
+            for name in files:
+                src = os.path.join(root, name)
+                dest = os.path.join(self.repo_dir, os.path.relpath(src, ram_dir))
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                shutil.move(src, dest)
+        shutil.rmtree(ram_dir, ignore_errors=True)
+        return time.perf_counter() - t
+
+    def discard(self) -> None:
+        """Removes the checkout, including any part still in RAM."""
+        for d in (self.repo_dir, self._spilled_dir):
+            if d:
+                shutil.rmtree(d, ignore_errors=True)
+
+    def _to_disk(self) -> None:
+        self.repo_dir = tempfile.mkdtemp(prefix="domino_repo_")
+        self.storage = "disk"
+
+
+def _download_progress(progress: Optional[ProgressCallback], stats: MaterializeStats) -> Callable[..., None]:
+    """
+    Returns emit(final=False), which reports stats' counters as a "downloading" phase
+    update through progress at most every PROGRESS_INTERVAL_SEC (always when final).
+    """
+    last = [0.0]
+
+    def emit(final: bool = False) -> None:
+        now = time.time()
+        if progress is None or (not final and now - last[0] < PROGRESS_INTERVAL_SEC):
+            return
+        last[0] = now
+        counters = {
+            "dirs_listed": stats.dirs_listed,
+            "files_listed": stats.files_listed,
+            "files_downloaded": stats.files_written,
+            "files_failed": stats.files_failed,
+            "bytes_fetched": stats.bytes_fetched,
+            "bytes_reused": stats.bytes_reused,
+        }
+        # The total is only known once the tree walk has finished
+        if stats.listing_sec:
+            counters["files_total"] = stats.files_listed
+        progress("downloading", **counters)
+
+    return emit
+
+
+def _compile_filters(file_regex: Optional[str], exclude_regex: Optional[str]) -> Tuple[Optional[re.Pattern], Optional[re.Pattern]]:
     # include: None/".*" means ALL files
     include_re = None
     if file_regex and file_regex not in (".*", "*", "ALL"):
@@ -185,43 +1124,366 @@ def materialize_repo(
 
     # exclude: compile if provided
     exclude_re = re.compile(exclude_regex) if exclude_regex else None
+    return include_re, exclude_re
 
-    repo_dir = tempfile.mkdtemp(prefix="domino_repo_")
 
-    # List the file paths first (now with include/exclude applied)
-    paths = list_repo_paths(
-        dc, project_id, repo_id, commit, include_re, exclude_re, max_files
-    )
-    if not paths:
-        return repo_dir, []
+def materialize_repo(
+    dc: DominoClient,
+    project_id: str,
+    repo_id: str,
+    commit: str,
+    file_regex: Optional[str],
+    exclude_regex: Optional[str],
+    max_files: int,
+    workers: int = MAX_WORKERS,
+    stats: Optional[MaterializeStats] = None,
+    blob_cache: Optional[BlobCache] = repo_blob_cache,
+    max_file_bytes: Optional[int] = MAX_FILE_BYTES,
+    executor: Optional[ThreadPoolExecutor] = None,
+    progress: Optional[ProgressCallback] = None,
+    ram_max_bytes: int = RAM_MAX_BYTES,
+) -> Tuple[str, List[str]]:
+    """
+    Creates a temp dir, downloads matching files at the commit, returns (dir, paths).
+
+    Listing and downloading are pipelined: each path is queued for download as soon
+    as its directory listing arrives, so fetches overlap the rest of the tree walk.
+    Files already in blob_cache (same path and content identity) are linked from it
+    rather than fetched. Downloads stream straight to disk; files larger than
+    max_file_bytes (when set) are skipped. Fetch concurrency adapts to upstream
+    throttling through an AdaptiveLimiter capped at `workers`. When `executor` is
+    given, downloads run on it (shared with other scans) instead of a private pool.
+    Listing and download counters are reported through progress as they change.
+    Checkouts whose listed size fits within ram_max_bytes are written to RAM_DIR
+    instead of disk, without holding downloads back; see _CheckoutPlanner.
+    """
+    t0 = time.time()
+    stats = stats if stats is not None else MaterializeStats()
+    include_re, exclude_re = _compile_filters(file_regex, exclude_regex)
+
+    planner = _CheckoutPlanner(ram_max_bytes, max_file_bytes)
 
+    paths: List[str] = []
     errors: List[str] = []
+    stats_lock = threading.Lock()
+    limiter = AdaptiveLimiter(workers)
+    emit_progress = _download_progress(progress, stats)
+
+    def _on_listing(directory: str) -> None:
+        stats.dirs_listed += 1
+        emit_progress()
+
+    def _on_write(seconds: float) -> None:
+        with stats_lock:
+            stats.write_sec += seconds
 
-    def _download_and_write(p: str) -> Optional[str]:
+    def _download_and_write(entry: RepoEntry) -> Optional[str]:
+        p = entry.path
         try:
-            content = fetch_file_bytes(dc, project_id, repo_id, commit, p)
-            abs_path = Path(repo_dir, p)
+            if max_file_bytes and entry.size is not None and entry.size > max_file_bytes:
+                raise FileTooLargeError(f"listed size {entry.size} exceeds cap of {max_file_bytes}")
+            abs_path = Path(planner.repo_dir, p)
             abs_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(abs_path, "wb") as f:
-                f.write(content)
+            # Without a content id from the listing, the commit still pins the content
+            blob_key = blob_cache.key(project_id, repo_id, p, entry.blob_id or commit) if blob_cache else None
+            t = time.perf_counter()
+            reused = blob_cache.fetch_into(blob_key, abs_path) if blob_key else None
+            link_sec = time.perf_counter() - t
+            if reused is None:
+                with limiter:
+                    fetched = fetch_file_to(dc, project_id, repo_id, commit, p, abs_path,
+                                            max_bytes=max_file_bytes, on_throttle=limiter.on_throttle,
+                                            on_write=_on_write)
+                if blob_key:
+                    try:
+                        blob_cache.add(blob_key, abs_path)
+                    except OSError as e:
+                        logger.warning(f"Blob cache store failed for {p}: {e}")
+            with stats_lock:
+                if reused is None:
+                    stats.bytes_fetched += fetched
+                else:
+                    stats.write_sec += link_sec
+                    stats.files_reused += 1
+                    stats.bytes_reused += reused
+                stats.files_written += 1
+                if stats.first_file_sec is None:
+                    stats.first_file_sec = round(time.time() - t0, 3)
+            emit_progress()
             return p
         except Exception as e:
+            with stats_lock:
+                stats.files_failed += 1
+                if isinstance(e, FileTooLargeError):
+                    stats.files_too_large += 1
             errors.append(f"{p}: {e}")
+            emit_progress()
             return None
 
-    with ThreadPoolExecutor(max_workers=workers) as ex:
-        futs = [ex.submit(_download_and_write, p) for p in paths]
-        for _ in as_completed(futs):
-            pass
+    ex = executor or ThreadPoolExecutor(max_workers=workers)
+    futures = []
+    try:
+        # Paths stream in with include/exclude already applied
+        for entry in iter_repo_entries(dc, project_id, repo_id, commit, include_re, exclude_re, max_files,
+                                       on_listing=_on_listing):
+            paths.append(entry.path)
+            stats.files_listed += 1
+            planner.add(entry)
+            futures.append(ex.submit(_download_and_write, entry))
+        stats.listing_sec = round(time.time() - t0, 3)
+        emit_progress(final=True)
+        wait(futures)
+        stats.write_sec += planner.settle()
+        emit_progress(final=True)
+    except BaseException:
+        for f in futures:
+            f.cancel()
+        wait(futures)
+        planner.discard()
+        raise
+    finally:
+        stats.duration_sec = round(time.time() - t0, 3)
+        stats.write_sec = round(stats.write_sec, 3)
+        stats.storage = planner.storage
+        stats.projected_bytes = planner.projected if planner.storage == "memory" else None
+        stats.throttle_signals = limiter.throttle_signals
+        stats.concurrency_lowest = limiter.lowest_limit
+        stats.concurrency_final = limiter.limit
+        if executor is None:
+            ex.shutdown(wait=False)
 
     if errors:
         logger.warning("Some files failed to fetch: %s", errors[:5])
 
-    written = [p for p in paths if Path(repo_dir, p).exists()]
+    repo_dir = planner.repo_dir
+    written = [p for p in sorted(paths) if Path(repo_dir, p).exists()]
+    return repo_dir, written
+
+# ───────────────────────────── Async Fetch Engine ────────────────────────────
+
+def materialize_repo_async(
+    dc: DominoClient,
+    project_id: str,
+    repo_id: str,
+    commit: str,
+    file_regex: Optional[str],
+    exclude_regex: Optional[str],
+    max_files: int,
+    concurrency: int = ASYNC_CONCURRENCY,
+    stats: Optional[MaterializeStats] = None,
+    blob_cache: Optional[BlobCache] = repo_blob_cache,
+    max_file_bytes: Optional[int] = MAX_FILE_BYTES,
+    progress: Optional[ProgressCallback] = None,
+    ram_max_bytes: int = RAM_MAX_BYTES,
+) -> Tuple[str, List[str]]:
+    """
+    Drop-in alternative to materialize_repo() built on asyncio + aiohttp.
+
+    Listings and downloads share one event loop and an AsyncAdaptiveLimiter of up to
+    `concurrency` requests, so hundreds of small git/raw fetches can be in flight
+    without a thread each. Filtering, the max_files cap, the blob cache and the
+    per-file byte cap, throttling backoff, per-read timeouts, RAM-backed checkouts and
+    progress reporting behave exactly as in the thread engine.
+    """
+    if aiohttp is None:
+        raise RuntimeError("The asyncio fetch engine requires the aiohttp package")
+    stats = stats if stats is not None else MaterializeStats()
+    planner = _CheckoutPlanner(ram_max_bytes, max_file_bytes)
+    try:
+        paths = asyncio.run(_materialize_async(
+            dc, project_id, repo_id, commit, file_regex, exclude_regex, max_files,
+            concurrency, stats, blob_cache, max_file_bytes, planner, progress,
+        ))
+        stats.write_sec += planner.settle()
+    except Exception:
+        planner.discard()
+        raise
+    finally:
+        stats.write_sec = round(stats.write_sec, 3)
+        stats.storage = planner.storage
+        stats.projected_bytes = planner.projected if planner.storage == "memory" else None
+    repo_dir = planner.repo_dir
+    written = [p for p in sorted(paths) if Path(repo_dir, p).exists()]
     return repo_dir, written
 
+
+async def _materialize_async(
+    dc: DominoClient,
+    project_id: str,
+    repo_id: str,
+    commit: str,
+    file_regex: Optional[str],
+    exclude_regex: Optional[str],
+    max_files: int,
+    concurrency: int,
+    stats: MaterializeStats,
+    blob_cache: Optional[BlobCache],
+    max_file_bytes: Optional[int],
+    planner: _CheckoutPlanner,
+    progress: Optional[ProgressCallback] = None,
+) -> List[str]:
+    t0 = time.time()
+    emit_progress = _download_progress(progress, stats)
+    include_re, exclude_re = _compile_filters(file_regex, exclude_regex)
+    repo_path = f"/v4/projects/{project_id}/gitRepositories/{repo_id}/git"
+    limiter = AsyncAdaptiveLimiter(concurrency)
+    paths: List[str] = []
+    errors: List[str] = []
+
+    async def _get(session: "aiohttp.ClientSession", url: str, params: dict, accept: str) -> "aiohttp.ClientResponse":
+        """GET with the same retry policy as DominoClient; the caller releases the response."""
+        endpoint = domino_endpoint(url)
+        attempt = 0
+        while True:
+            t0 = time.perf_counter()
+            try:
+                r = await session.get(url, params=params, headers={"Accept": accept})
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                DOMINO_REQUEST_SECONDS.observe(time.perf_counter() - t0, endpoint=endpoint, status="error")
+                if attempt >= dc.retries:
+                    raise
+                DOMINO_RETRIES.inc(endpoint=endpoint, reason="connection")
+                delay = retry_delay(attempt)
+            else:
+                DOMINO_REQUEST_SECONDS.observe(time.perf_counter() - t0, endpoint=endpoint, status=r.status)
+                if r.status not in RETRYABLE_STATUSES or attempt >= dc.retries:
+                    return r
+                if r.status in THROTTLE_STATUSES:
+                    limiter.on_throttle()
+                DOMINO_RETRIES.inc(endpoint=endpoint, reason="throttled" if r.status in THROTTLE_STATUSES else "server_error")
+                delay = retry_delay(attempt, r.headers.get("Retry-After"))
+                r.release()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _list(session: "aiohttp.ClientSession", directory: str) -> List[dict]:
+        params = {"commit": commit}
+        if directory:
+            params["directory"] = directory
+        url = dc._url(f"{repo_path}/browse")
+        async with limiter:
+            r = await _get(session, url, params, "application/json")
+            try:
+                if r.status != 200:
+                    raise DominoApiError(f"GET {url} -> {r.status} {(await r.text())[:300]}")
+                try:
+                    payload = await r.json(content_type=None)
+                except ValueError:
+                    raise DominoApiError(f"Non-JSON response from {url}")
+            finally:
+                r.release()
+        return (payload or {}).get("data", {}).get("items", [])
+
+    async def _download(session: "aiohttp.ClientSession", entry: RepoEntry) -> None:
+        p = entry.path
+        try:
+            if max_file_bytes and entry.size is not None and entry.size > max_file_bytes:
+                raise FileTooLargeError(f"listed size {entry.size} exceeds cap of {max_file_bytes}")
+            abs_path = Path(planner.repo_dir, p)
+            blob_key = blob_cache.key(project_id, repo_id, p, entry.blob_id or commit) if blob_cache else None
+            # Filesystem work (directories, blob cache links/copies, file writes) runs on
+            # worker threads so a slow disk doesn't stall the other transfers on the loop
+            await asyncio.to_thread(abs_path.parent.mkdir, parents=True, exist_ok=True)
+            t = time.perf_counter()
+            reused = await asyncio.to_thread(blob_cache.fetch_into, blob_key, abs_path) if blob_key else None
+            link_sec = time.perf_counter() - t
+            if reused is None:
+                url = dc._url(f"{repo_path}/raw")
+                part = abs_path.with_name(f"{abs_path.name}.part")
+                fetched = 0
+                async with limiter:
+                    r = await _get(session, url, {"fileName": p, "commit": commit}, "*/*")
+                    try:
+                        if r.status != 200:
+                            raise DominoApiError(f"GET {url} -> {r.status} ({r.headers.get('content-type')})")
+                        f = await asyncio.to_thread(open, part, "wb")
+                        try:
+                            async for chunk in r.content.iter_chunked(DOWNLOAD_CHUNK_BYTES):
+                                fetched += len(chunk)
+                                if max_file_bytes and fetched > max_file_bytes:
+                                    raise FileTooLargeError(f"GET {url} -> more than {max_file_bytes} bytes")
+                                t = time.perf_counter()
+                                await asyncio.to_thread(f.write, chunk)
+                                stats.write_sec += time.perf_counter() - t
+                        finally:
+                            await asyncio.to_thread(f.close)
+                        t = time.perf_counter()
+                        await asyncio.to_thread(os.replace, part, abs_path)
+                        stats.write_sec += time.perf_counter() - t
+                    except BaseException:
+                        part.unlink(missing_ok=True)
+                        raise
+                    finally:
+                        r.release()
+                if blob_key:
+                    try:
+                        await asyncio.to_thread(blob_cache.add, blob_key, abs_path)
+                    except OSError as e:
+                        logger.warning(f"Blob cache store failed for {p}: {e}")
+                stats.bytes_fetched += fetched
+            else:
+                stats.write_sec += link_sec
+                stats.files_reused += 1
+                stats.bytes_reused += reused
+            stats.files_written += 1
+            if stats.first_file_sec is None:
+                stats.first_file_sec = round(time.time() - t0, 3)
+        except Exception as e:
+            stats.files_failed += 1
+            if isinstance(e, FileTooLargeError):
+                stats.files_too_large += 1
+            errors.append(f"{p}: {e}")
+        emit_progress()
+
+    # Like the thread engine's timeout, applied per connect and per read rather than to a whole body
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=dc.timeout, sock_read=dc.timeout)
+    connector = aiohttp.TCPConnector(limit=max(1, concurrency))
+    async with aiohttp.ClientSession(headers=dict(dc.s.headers), timeout=timeout, connector=connector) as session:
+        # Listings are consumed in submission (breadth-first) order, as in iter_repo_entries
+        listings = deque([asyncio.create_task(_list(session, ""))])  # "" = repo root
+        downloads = set()
+        try:
+            while listings:
+                dirs, entries = _classify_browse_items(await listings.popleft(), include_re, exclude_re)
+                stats.dirs_listed += 1
+                emit_progress()
+                for path in dirs:
+                    listings.append(asyncio.create_task(_list(session, path)))
+                for entry in entries:
+                    paths.append(entry.path)
+                    stats.files_listed += 1
+                    planner.add(entry)
+                    downloads.add(asyncio.create_task(_download(session, entry)))
+                    if len(paths) >= max_files:
+                        logger.warning("Reached max_files cap: %d", max_files)
+                        break
+                if len(paths) >= max_files:
+                    for task in listings:
+                        task.cancel()
+                    listings.clear()
+            stats.listing_sec = round(time.time() - t0, 3)
+            emit_progress(final=True)
+            if downloads:
+                await asyncio.gather(*downloads)
+            emit_progress(final=True)
+        finally:
+            for task in [*listings, *downloads]:
+                task.cancel()
+            stats.duration_sec = round(time.time() - t0, 3)
+            stats.throttle_signals = limiter.throttle_signals
+            stats.concurrency_lowest = limiter.lowest_limit
+            stats.concurrency_final = limiter.limit
+
+    if errors:
+        logger.warning("Some files failed to fetch: %s", errors[:5])
+    return paths
+
 # ───────────────────────────── Semgrep Integration ───────────────────────────
 
+# Process-wide cap on concurrently running semgrep processes
+semgrep_slots = threading.BoundedSemaphore(max(1, SEMGREP_MAX_PROCESSES))
+
+
 def check_semgrep() -> Tuple[bool, Optional[str]]:
     try:
         r = subprocess.run(["semgrep", "--version"], capture_output=True, text=True)
@@ -232,113 +1494,1321 @@ def check_semgrep() -> Tuple[bool, Optional[str]]:
         return False, "semgrep not found in PATH"
 
 
-def run_semgrep_scan(target_dir: str, config: str = DEFAULT_SEMGREP_CONFIG, timeout_sec: int = 300) -> dict:
-    ok, msg = check_semgrep()
-    if not ok:
-        raise RuntimeError(f"Semgrep not available: {msg}")
+@dataclass
+class SemgrepRunStats:
+    """Output size and parser footprint of one run_semgrep_scan() call."""
+    output_bytes: int = 0
+    results: int = 0
+    parse_buffer_peak_bytes: int = 0
+    duration_sec: float = 0.0
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """High-water mark of this process's resident memory (None where unsupported)."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Linux reports KiB
+
+
+metrics.callback("process_peak_rss_bytes", "High-water mark of resident memory", "gauge", (), lambda: [((), peak_rss_bytes())])
+
+
+class SemgrepJsonStream:
+    """
+    Incremental reader for `semgrep --json` output.
+
+    Top-level members are decoded one at a time as the text arrives. Elements of
+    "results" are decoded individually and handed to on_result instead of being kept,
+    so memory is bounded by the largest single result (or other member), not by the
+    size of the output.
+    """
+
+    def __init__(
+        self,
+        stream: io.TextIOBase,
+        on_result: Callable[[dict], None],
+        stats: Optional[SemgrepRunStats] = None,
+        chunk_size: int = SEMGREP_READ_CHUNK,
+    ):
+        self.stream = stream
+        self.on_result = on_result
+        self.stats = stats if stats is not None else SemgrepRunStats()
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, at_least: int = 0) -> bool:
+        data = self.stream.read(max(self.chunk_size, at_least))
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        self.stats.output_bytes += len(data)
+        self.stats.parse_buffer_peak_bytes = max(self.stats.parse_buffer_peak_bytes, len(self._buf))
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character without consuming it; "" at end of input."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _take(self, expected: str) -> str:
+        ch = self._peek()
+        if ch not in expected:
+            raise ValueError(f"Expected one of {expected!r} at offset {self.stats.output_bytes - len(self._buf) + self._pos}, got {ch!r}")
+        self._pos += 1
+        return ch
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A number at the end of the buffer, or cut after a "." or exponent
+                # marker (which the decoder leaves unconsumed), may continue in the next chunk
+                split_number = (
+                    isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and (end == len(self._buf) or self._buf[end] in ".eE+-0123456789")
+                )
+                if not split_number or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # Read at least as much again as is pending, so re-decoding stays linear overall
+            self._fill(len(self._buf) - self._pos)
+
+    def parse(self) -> dict:
+        """Consume the stream; returns the top-level object with "results" left empty."""
+        output: dict = {"results": []}
+        if self._peek() == "":
+            return output  # no output at all: treated as no findings
+        self._take("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return output
+        while True:
+            key = self._value()
+            self._take(":")
+            if key == "results" and self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        self.on_result(self._value())
+                        self.stats.results += 1
+                        if self._take(",]") == "]":
+                            break
+            else:
+                output[key] = self._value()
+            if self._take(",}") == "}":
+                return output
+
+
+def run_semgrep_scan(
+    target_dir: str,
+    config: str = DEFAULT_SEMGREP_CONFIG,
+    timeout_sec: int = 300,
+    jobs: Optional[int] = None,
+    on_result: Optional[Callable[[dict], None]] = None,
+    stats: Optional[SemgrepRunStats] = None,
+) -> dict:
+    """
+    Run semgrep on target_dir and return its JSON output.
+
+    stdout is parsed incrementally as semgrep writes it (see SemgrepJsonStream). With
+    on_result, each finding is passed to it and the returned output's "results" is
+    empty; otherwise findings are collected into "results" as before. Findings already
+    passed to on_result must be discarded if this raises. stats, when given, receives
+    the output size and parser footprint.
+    """
+    ok, msg = check_semgrep()
+    if not ok:
+        raise RuntimeError(f"Semgrep not available: {msg}")
+
+    cmd = [
+        "semgrep", "--config", config,
+        "--json",
+        "--no-git-ignore",
+        "--exclude", "*/tests/*",
+        "--exclude", "*/test*/*", 
+        "--exclude", "*/.git/*",
+        "--exclude", "*/venv/*",
+        "--exclude", "*/env/*",
+        "--exclude", "*/__pycache__/*",
+    ]
+    if jobs:
+        cmd += ["--jobs", str(jobs)]
+    cmd.append(target_dir)
+
+    results: List[dict] = []
+    stats = stats if stats is not None else SemgrepRunStats()
+    t0 = time.time()
+    
+    logger.info(f"Running semgrep command: {' '.join(cmd)}")
+    # Concurrent scans (shards, batch jobs, queued jobs) share a bounded number of processes
+    with semgrep_slots, tempfile.TemporaryFile(mode="w+") as stderr_file:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True)
+        timed_out = threading.Event()
+
+        def _kill_on_timeout() -> None:
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout_sec, _kill_on_timeout)
+        timer.start()
+        parser = SemgrepJsonStream(proc.stdout, on_result or results.append, stats)
+        parse_error: Optional[ValueError] = None
+        try:
+            try:
+                output = parser.parse()
+            except ValueError as e:
+                parse_error = e
+            # Drain whatever follows so semgrep never blocks on a full pipe
+            while proc.stdout.read(SEMGREP_READ_CHUNK):
+                pass
+            returncode = proc.wait()
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+        stderr_file.seek(0)
+        stderr = stderr_file.read(4096)
+    stats.duration_sec = round(time.time() - t0, 3)
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout_sec)
+    
+    logger.info(f"Semgrep exit code: {returncode}")
+    logger.info(f"Semgrep stdout length: {stats.output_bytes}")
+    logger.info(f"Semgrep stderr length: {len(stderr)}")
+    
+    if stderr:
+        logger.warning(f"Semgrep stderr: {stderr[:500]}")
+
+    # semgrep exits 0 when no issues, 1 when issues found, >1 for errors
+    if returncode in (0, 1):
+        if parse_error is not None:
+            logger.error(f"Failed to parse semgrep JSON: {parse_error}")
+            raise RuntimeError(f"Failed to parse semgrep JSON: {parse_error}")
+        output["results"] = results
+        logger.info(f"Semgrep found {stats.results} issues")
+        return output
+    
+    # For non-zero/non-one exit codes, provide more detailed error info
+    error_msg = f"Semgrep failed (code {returncode})"
+    if stderr:
+        error_msg += f": {stderr[:300]}"
+    if parse_error is not None:
+        error_msg += f" | stdout: {parse_error}"
+    
+    logger.error(error_msg)
+    raise RuntimeError(error_msg)
+
+
+class SemgrepSummary:
+    """
+    Running summarize_semgrep(): counts severities and builds issue entries one
+    finding at a time, keeping at most max_issues issues (0/None = all). With base_dir,
+    issue filenames are reported relative to it.
+    """
+
+    def __init__(self, max_issues: Optional[int] = None, base_dir: Optional[str] = None):
+        self.max_issues = max_issues
+        self.base_dir = base_dir
+        self.sev = {"HIGH": 0, "MEDIUM": 0, "LOW": 0, "INFO": 0}
+        self.total = 0
+        self.issues: List[dict] = []
+        self.issues_truncated = 0
+
+    def add(self, r: dict) -> None:
+        # Map semgrep severity to bandit-style levels
+        semgrep_sev = r.get("extra", {}).get("severity", "INFO").upper()
+        # Convert semgrep severities to bandit-style
+        if semgrep_sev == "ERROR":
+            mapped_sev = "HIGH"
+        elif semgrep_sev == "WARNING":
+            mapped_sev = "MEDIUM"
+        elif semgrep_sev == "INFO":
+            mapped_sev = "LOW"
+        else:
+            mapped_sev = "LOW"
+            
+        if mapped_sev in self.sev:
+            self.sev[mapped_sev] += 1
+        self.total += 1
+
+        if self.max_issues and len(self.issues) >= self.max_issues:
+            self.issues_truncated += 1
+            return
+        filename = r.get("path")
+        if self.base_dir and filename:
+            filename = os.path.relpath(filename, self.base_dir)
+        self.issues.append({
+            "filename": filename,
+            "line_number": r.get("start", {}).get("line"),
+            "test_id": r.get("check_id"),
+            "test_name": r.get("extra", {}).get("message", ""),
+            "issue_severity": mapped_sev,
+            "issue_confidence": "HIGH",  # semgrep doesn't have confidence levels
+            "issue_text": r.get("extra", {}).get("message", ""),
+        })
+
+    def summary(self, metrics: Optional[dict] = None) -> dict:
+        return {
+            "total_issues": self.total,
+            "high": self.sev["HIGH"],
+            "medium": self.sev["MEDIUM"],
+            "low": self.sev["LOW"],
+            "issues": self.issues,
+            "issues_truncated": self.issues_truncated,
+            "metrics": metrics or {},
+        }
+
+
+def summarize_semgrep(output: dict, max_issues: Optional[int] = None, base_dir: Optional[str] = None) -> dict:
+    results = output.get("results", []) if isinstance(output, dict) else []
+    acc = SemgrepSummary(max_issues, base_dir)
+    for r in results:
+        acc.add(r)
+    return acc.summary(output.get("paths", {}) if isinstance(output, dict) else {})
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _link_subset(src_dir: str, rel_paths: List[str], dest_dir: str) -> None:
+    """Mirror rel_paths from src_dir into dest_dir (hard links where possible)."""
+    for rel in rel_paths:
+        dest = Path(dest_dir, rel)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(Path(src_dir, rel), dest)
+        except OSError:
+            shutil.copyfile(Path(src_dir, rel), dest)
+
+
+def _group_result(grouped: Dict[str, List[dict]], r: dict, base_dir: str) -> None:
+    """
+    Add one semgrep result to grouped under its path relative to base_dir, keeping only
+    the fields summarize_semgrep() reads (the rest — source lines, metadata, fixes — is
+    most of each result's size).
+    """
+    rel = os.path.relpath(r.get("path") or "", base_dir)
+    extra = r.get("extra", {})
+    grouped.setdefault(rel, []).append({
+        "check_id": r.get("check_id"),
+        "path": rel,
+        "start": {"line": r.get("start", {}).get("line")},
+        "extra": {"severity": extra.get("severity", "INFO"), "message": extra.get("message", "")},
+    })
+
+
+def _results_by_file(results: List[dict], base_dir: str) -> Dict[str, List[dict]]:
+    """Group semgrep results by path relative to base_dir; see _group_result()."""
+    grouped: Dict[str, List[dict]] = {}
+    for r in results:
+        _group_result(grouped, r, base_dir)
+    return grouped
+
+
+def _balanced_shards(target_dir: str, rel_paths: List[str], n: int) -> List[List[str]]:
+    """Split rel_paths into n shards of roughly equal total size (largest files placed first)."""
+    sized = sorted(((os.path.getsize(Path(target_dir, p)), p) for p in rel_paths), reverse=True)
+    heap = [(0, i) for i in range(n)]
+    shards: List[List[str]] = [[] for _ in range(n)]
+    for size, p in sized:
+        total, i = heapq.heappop(heap)
+        shards[i].append(p)
+        heapq.heappush(heap, (total + size, i))
+    return [sorted(shard) for shard in shards if shard]
+
+
+def run_sharded_semgrep_scan(
+    target_dir: str,
+    rel_paths: List[str],
+    config: str = DEFAULT_SEMGREP_CONFIG,
+    timeout_sec: int = 300,
+    shards: int = SEMGREP_SHARDS,
+    cpu_budget: int = SEMGREP_CPU_BUDGET,
+) -> Tuple[dict, List[dict], List[str]]:
+    """
+    Scan rel_paths under target_dir with several semgrep processes in parallel.
+
+    Files are split into size-balanced shards, each mirrored into its own scratch dir and
+    scanned with an equal share of cpu_budget. Outputs are merged with result paths
+    rewritten to target_dir. A shard that times out or fails is reported instead of
+    failing the whole scan.
+
+    Returns (merged semgrep output, per-shard errors, paths of the failed shards).
+    Raises TimeoutExpired only when every shard timed out.
+    """
+    n = max(1, min(shards, cpu_budget, len(rel_paths)))
+    jobs = max(1, cpu_budget // n)
+    parts = _balanced_shards(target_dir, rel_paths, n)
+
+    def _scan_shard(part: List[str]) -> dict:
+        # Beside the checkout, so hard links work whether it lives in RAM or on disk
+        shard_dir = tempfile.mkdtemp(prefix="domino_shard_", dir=os.path.dirname(os.path.abspath(target_dir)))
+        try:
+            _link_subset(target_dir, part, shard_dir)
+            output = run_semgrep_scan(shard_dir, config=config, timeout_sec=timeout_sec, jobs=jobs)
+        finally:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+        rebase = lambda p: str(Path(target_dir, os.path.relpath(p, shard_dir)))
+        output["results"] = [{**r, "path": rebase(r.get("path") or "")} for r in output.get("results", [])]
+        paths = output.get("paths") or {}
+        output["paths"] = {**paths, "scanned": [rebase(p) for p in paths.get("scanned", [])]}
+        return output
+
+    merged: dict = {"results": [], "errors": [], "paths": {"scanned": []}}
+    shard_errors: List[dict] = []
+    failed_paths: List[str] = []
+    timeouts = 0
+    with ThreadPoolExecutor(max_workers=len(parts)) as ex:
+        futs = {ex.submit(_scan_shard, part): (i, part) for i, part in enumerate(parts)}
+        for fut in as_completed(futs):
+            i, part = futs[fut]
+            try:
+                output = fut.result()
+            except subprocess.TimeoutExpired:
+                timeouts += 1
+                error = f"timed out after {timeout_sec}s"
+            except Exception as e:
+                error = str(e)[:300]
+            else:
+                merged["results"].extend(output.get("results", []))
+                merged["errors"].extend(output.get("errors", []))
+                merged["paths"]["scanned"].extend(output["paths"].get("scanned", []))
+                merged.setdefault("version", output.get("version"))
+                continue
+            logger.warning(f"Semgrep shard {i} ({len(part)} files) failed: {error}")
+            shard_errors.append({"shard": i, "file_count": len(part), "error": error})
+            failed_paths.extend(part)
+
+    if timeouts == len(parts):
+        raise subprocess.TimeoutExpired(["semgrep"], timeout_sec)
+    if len(shard_errors) == len(parts):
+        raise RuntimeError(f"All semgrep shards failed: {shard_errors[0]['error']}")
+    logger.info(f"Sharded semgrep scan: {len(parts)} shards x {jobs} jobs, {len(shard_errors)} failed")
+    return merged, shard_errors, failed_paths
+
+
+def run_incremental_semgrep_scan(
+    repo_dir: str,
+    file_paths: List[str],
+    baseline: Dict[str, Tuple[str, list]],
+    config: str = DEFAULT_SEMGREP_CONFIG,
+    timeout_sec: int = 300,
+    shards: int = 1,
+) -> Tuple[dict, Dict[str, Tuple[str, list]], dict]:
+    """
+    Scan only the files whose content differs from the baseline and merge in the
+    baseline's findings for the rest.
+
+    Returns (semgrep-shaped output for the whole of repo_dir, per-file findings to record
+    for this checkout, stats). Rules that correlate findings across files only see the
+    changed files, so a full scan remains the reference result. Changed files are
+    scanned through run_sharded_semgrep_scan(); files of failed shards are left out
+    of the recorded findings and listed in stats["shard_errors"].
+    """
+    hashes = {p: _file_sha256(Path(repo_dir, p)) for p in file_paths}
+    changed = [p for p in file_paths if baseline.get(p, (None,))[0] != hashes[p]]
+    changed_set = set(changed)
+    unchanged = [p for p in file_paths if p not in changed_set]
+
+    output: dict = {"results": [], "errors": [], "paths": {"scanned": []}}
+    shard_errors: List[dict] = []
+    failed: set = set()
+    if changed:
+        output, shard_errors, failed_paths = run_sharded_semgrep_scan(
+            repo_dir, changed, config=config, timeout_sec=timeout_sec, shards=shards
+        )
+        failed = set(failed_paths)
+        fresh = _results_by_file(output.get("results", []), repo_dir)
+        scanned = [os.path.relpath(p, repo_dir) for p in (output.get("paths") or {}).get("scanned", [])]
+    else:
+        fresh, scanned = {}, []
+
+    findings: Dict[str, Tuple[str, list]] = {}
+    for p in changed:
+        if p not in failed:
+            findings[p] = (hashes[p], fresh.get(p, []))
+    for p in unchanged:
+        findings[p] = (hashes[p], baseline[p][1])
+
+    merged_results = [
+        {**r, "path": str(Path(repo_dir, r["path"]))}
+        for p in sorted(findings)
+        for r in findings[p][1]
+    ]
+    merged = {
+        **output,
+        "results": merged_results,
+        "paths": {
+            **(output.get("paths") or {}),
+            "scanned": [str(Path(repo_dir, p)) for p in scanned] + [str(Path(repo_dir, p)) for p in unchanged],
+        },
+    }
+    stats = {"files_changed": len(changed), "files_unchanged": len(unchanged), "shard_errors": shard_errors}
+    return merged, findings, stats
+
+
+def record_file_findings(
+    repo_dir: str,
+    file_paths: List[str],
+    semgrep_raw: dict,
+    skip: Optional[set] = None,
+) -> Dict[str, Tuple[str, list]]:
+    """Per-file findings of a full scan of repo_dir, in the shape FileFindingsStore.save() takes."""
+    return file_findings(repo_dir, file_paths, _results_by_file(semgrep_raw.get("results", []), repo_dir), skip)
+
+
+def file_findings(
+    repo_dir: str,
+    file_paths: List[str],
+    grouped: Dict[str, List[dict]],
+    skip: Optional[set] = None,
+) -> Dict[str, Tuple[str, list]]:
+    """Pair results grouped by _group_result() with each file's content hash."""
+    return {
+        p: (_file_sha256(Path(repo_dir, p)), grouped.get(p, []))
+        for p in file_paths
+        if not skip or p not in skip
+    }
+
+# ───────────────────────────── Scan Result Cache ─────────────────────────────
+
+_semgrep_version: Optional[str] = None
+
+
+def get_semgrep_version() -> Optional[str]:
+    """Semgrep version string, resolved once per process (None if semgrep is unavailable)."""
+    global _semgrep_version
+    if _semgrep_version is None:
+        ok, msg = check_semgrep()
+        if ok:
+            _semgrep_version = msg
+    return _semgrep_version
+
+
+def scan_cache_key(
+    repo_id: str,
+    commit: str,
+    semgrep_config: str,
+    file_regex: Optional[str],
+    exclude_regex: Optional[str],
+    max_files: int,
+    semgrep_version: str,
+    max_issues: int = 0,
+    max_file_bytes: int = 0,
+    baseline_commit: Optional[str] = None,
+) -> str:
+    """Content address for a scan: everything that can change the findings for a pinned commit."""
+    fields = [repo_id, commit, semgrep_config, file_regex, exclude_regex, max_files, semgrep_version]
+    if max_issues:
+        fields.append(max_issues)  # uncapped scans keep their existing keys
+    if max_file_bytes:
+        fields.append(["max_file_bytes", max_file_bytes])  # tagged so it can't collide with max_issues
+    if baseline_commit:
+        # A differential result merges the baseline's findings, so it is kept apart from full scans
+        fields.append(["baseline_commit", baseline_commit])
+    material = json.dumps(fields)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class _SqliteStore:
+    """Base for the scan stores: one short-lived connection per operation, schema created on first use."""
+
+    schema: Tuple[str, ...] = ()
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialized:
+            for statement in self.schema:
+                conn.execute(statement)
+            conn.commit()
+            self._initialized = True
+        return conn
+
+
+class ScanResultCache(_SqliteStore):
+    """
+    SQLite-backed store of summarized scan results keyed by scan_cache_key().
+
+    Entries older than max_age_sec are dropped, and the least recently used entries
+    are evicted once the stored payloads exceed max_bytes.
+    """
+
+    schema = (
+        "CREATE TABLE IF NOT EXISTS scan_results ("
+        " key TEXT PRIMARY KEY,"
+        " payload TEXT NOT NULL,"
+        " size INTEGER NOT NULL,"
+        " created_at REAL NOT NULL,"
+        " accessed_at REAL NOT NULL)",
+    )
+
+    def __init__(self, db_path: str, max_bytes: int = RESULT_CACHE_MAX_BYTES, max_age_sec: int = RESULT_CACHE_MAX_AGE_SEC):
+        super().__init__(db_path)
+        self.max_bytes = max_bytes
+        self.max_age_sec = max_age_sec
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT payload, created_at FROM scan_results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if now - row[1] > self.max_age_sec:
+                    conn.execute("DELETE FROM scan_results WHERE key = ?", (key,))
+                    conn.commit()
+                    return None
+                conn.execute("UPDATE scan_results SET accessed_at = ? WHERE key = ?", (now, key))
+                conn.commit()
+                return json.loads(row[0])
+            finally:
+                conn.close()
+
+    def put(self, key: str, value: dict) -> None:
+        payload = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO scan_results (key, payload, size, created_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, len(payload), now, now),
+                )
+                self._evict(conn, now)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM scan_results WHERE created_at < ?", (now - self.max_age_sec,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM scan_results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute(
+            "SELECT key, size FROM scan_results ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM scan_results WHERE key = ?", (key,))
+            total -= size
+
+
+class FileFindingsStore(_SqliteStore):
+    """
+    Per-file semgrep results recorded for each scanned commit.
+
+    Rows are scoped by scan_scope() and keyed by (commit, path) with the file's content
+    hash, so a later scan can reuse a baseline commit's findings for unchanged files.
+    """
+
+    schema = (
+        "CREATE TABLE IF NOT EXISTS file_findings ("
+        " scope TEXT NOT NULL,"
+        " commit_sha TEXT NOT NULL,"
+        " path TEXT NOT NULL,"
+        " content_sha TEXT NOT NULL,"
+        " results TEXT NOT NULL,"
+        " created_at REAL NOT NULL,"
+        " PRIMARY KEY (scope, commit_sha, path))",
+    )
+
+    def __init__(self, db_path: str, max_age_sec: int = RESULT_CACHE_MAX_AGE_SEC):
+        super().__init__(db_path)
+        self.max_age_sec = max_age_sec
+
+    def load(self, scope: str, commit: str) -> Dict[str, Tuple[str, list]]:
+        """Returns {relative path: (content sha, semgrep results)} recorded for the commit."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT path, content_sha, results FROM file_findings"
+                    " WHERE scope = ? AND commit_sha = ? AND created_at >= ?",
+                    (scope, commit, time.time() - self.max_age_sec),
+                ).fetchall()
+            finally:
+                conn.close()
+        return {path: (sha, json.loads(results)) for path, sha, results in rows}
+
+    def save(self, scope: str, commit: str, files: Dict[str, Tuple[str, list]]) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM file_findings WHERE scope = ? AND commit_sha = ?", (scope, commit))
+                conn.executemany(
+                    "INSERT INTO file_findings (scope, commit_sha, path, content_sha, results, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    [(scope, commit, path, sha, json.dumps(results), now) for path, (sha, results) in files.items()],
+                )
+                conn.execute("DELETE FROM file_findings WHERE created_at < ?", (now - self.max_age_sec,))
+                conn.commit()
+            finally:
+                conn.close()
+
+
+SEVERITY_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+
+
+class ScanIssuesStore(_SqliteStore):
+    """
+    Issues of each scan, stored under its scan id so clients can page through them
+    (GET /scans/<id>/issues) instead of receiving every issue inline.
+
+    Issues are numbered most severe first, then by file and line; pages are cursors
+    over that sequence, filtered through per-column indexes.
+    """
+
+    schema = (
+        "CREATE TABLE IF NOT EXISTS scans ("
+        " scan_id TEXT PRIMARY KEY,"
+        " total INTEGER NOT NULL,"
+        " created_at REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS scan_issues ("
+        " scan_id TEXT NOT NULL,"
+        " seq INTEGER NOT NULL,"
+        " severity TEXT,"
+        " filename TEXT,"
+        " test_id TEXT,"
+        " issue TEXT NOT NULL,"
+        " PRIMARY KEY (scan_id, seq))",
+        "CREATE INDEX IF NOT EXISTS scan_issues_by_severity ON scan_issues (scan_id, severity, seq)",
+        "CREATE INDEX IF NOT EXISTS scan_issues_by_filename ON scan_issues (scan_id, filename, seq)",
+        "CREATE INDEX IF NOT EXISTS scan_issues_by_test_id ON scan_issues (scan_id, test_id, seq)",
+    )
+
+    def __init__(self, db_path: str, max_age_sec: int = RESULT_CACHE_MAX_AGE_SEC):
+        super().__init__(db_path)
+        self.max_age_sec = max_age_sec
+
+    def save(self, scan_id: str, issues: List[dict]) -> None:
+        ordered = sorted(issues, key=lambda i: (
+            SEVERITY_ORDER.get(i.get("issue_severity"), len(SEVERITY_ORDER)),
+            i.get("filename") or "",
+            i.get("line_number") or 0,
+        ))
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM scan_issues WHERE scan_id = ?", (scan_id,))
+                conn.execute("INSERT OR REPLACE INTO scans (scan_id, total, created_at) VALUES (?, ?, ?)",
+                             (scan_id, len(ordered), now))
+                conn.executemany(
+                    "INSERT INTO scan_issues (scan_id, seq, severity, filename, test_id, issue)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (scan_id, seq, i.get("issue_severity"), i.get("filename"), i.get("test_id"), json.dumps(i))
+                        for seq, i in enumerate(ordered)
+                    ],
+                )
+                expired = now - self.max_age_sec
+                conn.execute("DELETE FROM scan_issues WHERE scan_id IN"
+                             " (SELECT scan_id FROM scans WHERE created_at < ?)", (expired,))
+                conn.execute("DELETE FROM scans WHERE created_at < ?", (expired,))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def total(self, scan_id: str) -> Optional[int]:
+        """Number of issues stored for the scan, or None if it is unknown or expired."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT total FROM scans WHERE scan_id = ? AND created_at >= ?",
+                    (scan_id, time.time() - self.max_age_sec),
+                ).fetchone()
+            finally:
+                conn.close()
+        return row[0] if row else None
+
+    def page(
+        self,
+        scan_id: str,
+        after: int = -1,
+        limit: int = 50,
+        severities: Optional[List[str]] = None,
+        filename: Optional[str] = None,
+        test_id: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        Up to limit issues numbered after `after` that match every given filter; a
+        filename ending in "/" matches everything under that directory. Returns
+        (issues, cursor for the next page or None on the last page).
+        """
+        where = ["scan_id = ?", "seq > ?"]
+        params: list = [scan_id, after]
+        if severities:
+            where.append(f"severity IN ({', '.join('?' * len(severities))})")
+            params.extend(severities)
+        if filename:
+            if filename.endswith("/"):
+                where.append("substr(filename, 1, ?) = ?")
+                params.extend([len(filename), filename])
+            else:
+                where.append("filename = ?")
+                params.append(filename)
+        if test_id:
+            where.append("test_id = ?")
+            params.append(test_id)
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    f"SELECT seq, issue FROM scan_issues WHERE {' AND '.join(where)} ORDER BY seq LIMIT ?",
+                    (*params, limit + 1),
+                ).fetchall()
+            finally:
+                conn.close()
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return [json.loads(issue) for _, issue in rows[:limit]], next_cursor
+
+
+def scan_scope(repo_id: str, semgrep_config: str, semgrep_version: str) -> str:
+    """Per-file findings are only comparable within one repo, rule config and semgrep version."""
+    return hashlib.sha256(json.dumps([repo_id, semgrep_config, semgrep_version]).encode("utf-8")).hexdigest()
+
+
+scan_result_cache = ScanResultCache(os.path.join(SEC_SCAN_CACHE_DIR, "scan_results.sqlite3"))
+file_findings_store = FileFindingsStore(scan_result_cache.db_path)
+scan_issues_store = ScanIssuesStore(scan_result_cache.db_path)
+
+
+def persist_scan_issues(summary: dict, scan_id: Optional[str] = None, replace: bool = True) -> dict:
+    """
+    Store summary's issues for paging under scan_id (a new id if None); with
+    replace=False, issues already stored under that id are kept. Returns the scan
+    block fields pointing at them (both None if the store is unavailable).
+    """
+    scan_id = scan_id or uuid.uuid4().hex
+    try:
+        if replace or scan_issues_store.total(scan_id) is None:
+            scan_issues_store.save(scan_id, summary.get("issues") or [])
+    except sqlite3.Error as e:
+        logger.warning(f"Storing scan issues failed: {e}")
+        return {"scan_id": None, "issues_url": None}
+    return {"scan_id": scan_id, "issues_url": f"scans/{scan_id}/issues"}
+
+
+# ───────────────────────────── Scan Pipeline ────────────────────────────────
+
+ProgressCallback = Callable[..., None]
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self.listeners: List[ProgressCallback] = []
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key onto a single execution.
+
+    The first caller runs fn; callers arriving while it is in flight block until it
+    finishes and receive the same result (or exception). Progress reported by the
+    running call is fanned out to every caller's progress callback.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[tuple, _Flight] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(
+        self,
+        key: tuple,
+        fn: Callable[[ProgressCallback], Tuple[dict, int]],
+        progress: Optional[ProgressCallback] = None,
+    ) -> Tuple[Tuple[dict, int], bool, int]:
+        """Returns (fn result, whether it was shared from another caller, waiters coalesced)."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.executed += 1
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+            if progress is not None:
+                flight.listeners.append(progress)
+
+        if leader:
+            def fan_out(phase: str, **counters) -> None:
+                for listener in list(flight.listeners):
+                    listener(phase, **counters)
+
+            try:
+                flight.result = fn(fan_out)
+            except BaseException as e:
+                flight.error = e
+            finally:
+                # Unregister before waking waiters so the waiter count is final
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+            if flight.waiters:
+                logger.info(f"Coalesced {flight.waiters} concurrent request(s) onto one scan: {key}")
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result, not leader, flight.waiters
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+            }
+
+
+scan_flights = SingleFlight()
+metrics.callback(
+    "secscan_scan_requests_total", "Scan requests that ran a scan or joined one already in flight", "counter", ("outcome",),
+    lambda: [(("executed",), scan_flights.stats()["executed"]), (("coalesced",), scan_flights.stats()["coalesced"])],
+)
+
+
+def perform_security_scan(body: dict, progress: Optional[ProgressCallback] = None) -> Tuple[dict, int]:
+    """
+    Run a security scan described by a /security-scan-model request body.
+
+    Returns (payload, http_status). Runs outside of any Flask request context so the
+    same pipeline can serve synchronous requests and background scan jobs. When given,
+    progress(phase, **counters) is called as the scan moves through its phases.
+
+    Concurrent identical remote scans share one pipeline run; their scan block reports
+    whether the result was shared and how many waiters were coalesced onto it.
+    """
+    if bool(body.get("useLocal", True)):
+        return _run_security_scan(body, progress)
+
+    key = (
+        body.get("modelName"),
+        str(body.get("version")),
+        body.get("semgrepConfig", DEFAULT_SEMGREP_CONFIG),
+        body.get("fileRegex", DEFAULT_FILE_REGEX),
+        body.get("excludeRegex", DEFAULT_EXCLUDE_REGEX),
+        str(body.get("maxFiles", 5000)),
+        bool(body.get("includeIssues", False)),
+        bool(body.get("includeMetrics", False)),
+        str(body.get("maxIssues", MAX_ISSUES)),
+        str(body.get("maxFileBytes", MAX_FILE_BYTES)),
+        bool(body.get("forceRescan", False)),
+        str(body.get("baselineVersion")),
+        str(body.get("baselineCommit")),
+    )
+    (payload, status), shared, waiters = scan_flights.do(
+        key, lambda fan_out: _run_security_scan(body, fan_out), progress
+    )
+    if "scan" in payload:
+        payload = {**payload, "scan": {**payload["scan"], "coalesced": shared, "coalesced_waiters": waiters}}
+    return payload, status
+
+
+class ScanError(Exception):
+    """A scan that cannot proceed; carries the JSON error payload and HTTP status to return."""
+
+    def __init__(self, payload: dict, status: int):
+        super().__init__(payload.get("error"))
+        self.payload = payload
+        self.status = status
+
+
+@dataclass
+class ScanOptions:
+    """Scan inputs from a request body that apply to every model the request covers."""
+    file_regex: Optional[str] = DEFAULT_FILE_REGEX
+    exclude_regex: Optional[str] = DEFAULT_EXCLUDE_REGEX
+    max_files: int = 5000
+    timeout_sec: int = 300
+    semgrep_config: str = DEFAULT_SEMGREP_CONFIG
+    force_rescan: bool = False
+    baseline_commit: Optional[str] = None
+    semgrep_shards: int = SEMGREP_SHARDS
+    max_file_bytes: int = MAX_FILE_BYTES
+    ram_max_bytes: int = RAM_MAX_BYTES
+    max_issues: int = MAX_ISSUES
+    fetch_engine: str = FETCH_ENGINE
+
+    @classmethod
+    def from_body(cls, body: dict) -> "ScanOptions":
+        fetch_engine = body.get("fetchEngine", FETCH_ENGINE)
+        if fetch_engine == "asyncio" and aiohttp is None:
+            logger.warning("fetchEngine=asyncio requested but aiohttp is not installed; using threads")
+            fetch_engine = "thread"
+        return cls(
+            file_regex=body.get("fileRegex", DEFAULT_FILE_REGEX),
+            exclude_regex=body.get("excludeRegex", DEFAULT_EXCLUDE_REGEX),
+            max_files=int(body.get("maxFiles", 5000)),
+            timeout_sec=int(body.get("timeoutSec", 300)),
+            semgrep_config=body.get("semgrepConfig", DEFAULT_SEMGREP_CONFIG),
+            force_rescan=bool(body.get("forceRescan", False)),
+            baseline_commit=body.get("baselineCommit"),
+            semgrep_shards=int(body.get("semgrepShards", SEMGREP_SHARDS)),
+            max_file_bytes=int(body.get("maxFileBytes", MAX_FILE_BYTES)),
+            ram_max_bytes=int(body.get("ramMaxBytes", RAM_MAX_BYTES)),
+            max_issues=int(body.get("maxIssues", MAX_ISSUES)),
+            fetch_engine=fetch_engine,
+        )
+
+
+@dataclass
+class ScanTarget:
+    """A registered model version resolved to the repository snapshot it was built from."""
+    model_name: Optional[str]
+    model_version: Optional[int]
+    experiment_run_id: Optional[str]
+    run_url: Optional[str]
+    project_id: str
+    project_name: str
+    commit: str
+    repo_id: str
+    repo_uri: Optional[str]
+
+    def model_block(self) -> dict:
+        return {
+            "modelName": self.model_name,
+            "modelVersion": self.model_version,
+            "experimentRunId": self.experiment_run_id,
+            "runUrl": self.run_url,
+            "project": {"id": self.project_id, "name": self.project_name},
+            "git": {
+                "commit": self.commit,
+                "projectMainRepositoryId": self.repo_id,
+                "projectMainRepositoryUri": self.repo_uri,
+            },
+        }
+
+
+def resolve_scan_target(dc: DominoClient, model_name: str, version: int) -> ScanTarget:
+    """Registered model version → commit, project and main repository. Raises ScanError."""
+    t0 = time.perf_counter()
+    # 1) Registered model version → commit, experimentRunId, project info
+    mv = get_registered_model_version(dc, model_name, int(version))
+    tags = mv.get("tags", {}) or {}
+    commit = tags.get("mlflow.source.git.commit")
+    owner_username = mv.get("ownerUsername") or mv.get("project", {}).get("ownerUsername")
+    project_id = mv.get("project", {}).get("id") or tags.get("mlflow.domino.project_id")
+    project_name = mv.get("project", {}).get("name") or tags.get("mlflow.domino.project_name")
+    run_url_rel = mv.get("versionUiDetails", {}).get("experimentRunInfo", {}).get("runUrl")
+
+    if not (owner_username and project_name and project_id):
+        raise ScanError({"error": "Unable to resolve ownerUsername/projectName/projectId from model"}, 500)
+    if not commit:
+        raise ScanError({"error": "Model version missing tags.mlflow.source.git.commit; cannot pin snapshot."}, 400)
+
+    # 2) Resolve main repository id/uri via gitBrowse
+    gb = get_git_browse(dc, owner_username, project_name)
+    repo_id = gb.get("projectMainRepositoryId")
+    if not repo_id:
+        raise ScanError({"error": "No main repository found for project"}, 404)
+
+    SCAN_PHASE_SECONDS.observe(time.perf_counter() - t0, phase="resolve")
+    return ScanTarget(
+        model_name=mv.get("modelName"),
+        model_version=mv.get("modelVersion"),
+        experiment_run_id=mv.get("experimentRunId"),
+        run_url=f"{DOMINO_DOMAIN}{run_url_rel}" if run_url_rel else None,
+        project_id=project_id,
+        project_name=project_name,
+        commit=commit,
+        repo_id=repo_id,
+        repo_uri=gb.get("projectMainRepositoryUri"),
+    )
 
-    cmd = [
-        "semgrep", "--config", config,
-        "--json",
-        "--no-git-ignore",
-        "--exclude", "*/tests/*",
-        "--exclude", "*/test*/*", 
-        "--exclude", "*/.git/*",
-        "--exclude", "*/venv/*",
-        "--exclude", "*/env/*",
-        "--exclude", "*/__pycache__/*",
-        target_dir
-    ]
-    
-    logger.info(f"Running semgrep command: {' '.join(cmd)}")
-    proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout_sec)
-    
-    logger.info(f"Semgrep exit code: {proc.returncode}")
-    logger.info(f"Semgrep stdout length: {len(proc.stdout or '')}")
-    logger.info(f"Semgrep stderr length: {len(proc.stderr or '')}")
-    
-    if proc.stderr:
-        logger.warning(f"Semgrep stderr: {proc.stderr[:500]}")
 
-    # semgrep exits 0 when no issues, 1 when issues found, >1 for errors
-    if proc.returncode in (0, 1):
-        try:
-            result = json.loads(proc.stdout or '{"results": []}')
-            logger.info(f"Semgrep found {len(result.get('results', []))} issues")
-            return result
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse semgrep JSON: {e}")
-            logger.error(f"Raw stdout: {proc.stdout[:1000]}")
-            raise RuntimeError(f"Failed to parse semgrep JSON: {e}\nSTDOUT[:500]: {proc.stdout[:500]}")
-    
-    # For non-zero/non-one exit codes, provide more detailed error info
-    error_msg = f"Semgrep failed (code {proc.returncode})"
-    if proc.stderr:
-        error_msg += f": {proc.stderr[:300]}"
-    if proc.stdout:
-        error_msg += f" | stdout: {proc.stdout[:300]}"
-    
-    logger.error(error_msg)
-    raise RuntimeError(error_msg)
+def scan_commit(
+    dc: DominoClient,
+    target: ScanTarget,
+    opts: ScanOptions,
+    report: Optional[ProgressCallback] = None,
+    download_pool: Optional[ThreadPoolExecutor] = None,
+) -> Tuple[dict, dict]:
+    """
+    Scan the repository snapshot of a resolved target: result cache lookup, download,
+    semgrep (full, sharded or differential), then record findings and cache the result.
+
+    Returns (summarize_semgrep() summary, scan block fields). Raises ScanError when no
+    files match. download_pool, when given, is shared with other concurrent scans.
+    """
+    t0 = time.time()
+    report = report or (lambda phase, **counters: None)
+    commit, repo_id = target.commit, target.repo_id
+
+    # 3) A pinned commit never changes, so a previous scan with the same inputs is reusable
+    semgrep_version = get_semgrep_version()
+    cache_key = None
+    cached = None
+    if semgrep_version:
+        cache_key = scan_cache_key(
+            repo_id, commit, opts.semgrep_config, opts.file_regex, opts.exclude_regex, opts.max_files, semgrep_version,
+            opts.max_issues, opts.max_file_bytes, opts.baseline_commit,
+        )
+        if not opts.force_rescan:
+            try:
+                cached = scan_result_cache.get(cache_key)
+            except sqlite3.Error as e:
+                logger.warning(f"Scan result cache lookup failed: {e}")
+
+    materialize_stats = MaterializeStats()
+    files_missing = 0
+    incremental = None
+    shard_errors: List[dict] = []
+    semgrep_sec = None
+    semgrep_stats = None
+    if cached is not None:
+        logger.info(f"Scan result cache hit for {target.model_name} v{target.model_version} @ {commit}")
+        SCANS.inc(result="cache_hit")
+        summary = cached["summary"]
+        file_count_scanned = cached["file_count_scanned"]
+    else:
+        # 4) Download repo at commit to temp dir (only files matching regex)
+        report("downloading")
+        if opts.fetch_engine == "asyncio":
+            repo_dir, file_paths = materialize_repo_async(
+                dc, target.project_id, repo_id, commit, opts.file_regex, opts.exclude_regex, opts.max_files,
+                stats=materialize_stats, max_file_bytes=opts.max_file_bytes, progress=report,
+                ram_max_bytes=opts.ram_max_bytes,
+            )
+        else:
+            repo_dir, file_paths = materialize_repo(
+                dc, target.project_id, repo_id, commit, opts.file_regex, opts.exclude_regex, opts.max_files,
+                stats=materialize_stats, max_file_bytes=opts.max_file_bytes, executor=download_pool,
+                progress=report, ram_max_bytes=opts.ram_max_bytes,
+            )
+        SCAN_PHASE_SECONDS.observe(materialize_stats.listing_sec, phase="listing")
+        SCAN_PHASE_SECONDS.observe(materialize_stats.duration_sec, phase="download")
+        SCAN_FILES.inc(materialize_stats.files_written - materialize_stats.files_reused, state="downloaded")
+        SCAN_FILES.inc(materialize_stats.files_reused, state="reused")
+        SCAN_FILES.inc(materialize_stats.files_failed, state="failed")
+        SCAN_FILES.inc(materialize_stats.files_too_large, state="too_large")
+        SCAN_BYTES.inc(materialize_stats.bytes_fetched, source="fetched")
+        SCAN_BYTES.inc(materialize_stats.bytes_reused, source="reused")
+        if not file_paths:
+            shutil.rmtree(repo_dir, ignore_errors=True)
+            raise ScanError({"error": "No files to scan after filtering", "regex": opts.file_regex, "excludeRegex": opts.exclude_regex}, 404)
 
+        # 5) Semgrep scan — differential against a baseline commit when one was requested
+        scope = scan_scope(repo_id, opts.semgrep_config, semgrep_version) if semgrep_version else None
+        semgrep_config, timeout_sec, semgrep_shards = opts.semgrep_config, opts.timeout_sec, opts.semgrep_shards
+        baseline_commit = opts.baseline_commit
+        try:
+            baseline = {}
+            if baseline_commit and scope:
+                try:
+                    baseline = file_findings_store.load(scope, baseline_commit)
+                except sqlite3.Error as e:
+                    logger.warning(f"Baseline findings lookup failed: {e}")
 
-def summarize_semgrep(output: dict) -> dict:
-    results = output.get("results", []) if isinstance(output, dict) else []
-    sev = {"HIGH": 0, "MEDIUM": 0, "LOW": 0, "INFO": 0}
-    issues = []
-    for r in results:
-        # Map semgrep severity to bandit-style levels
-        semgrep_sev = r.get("extra", {}).get("severity", "INFO").upper()
-        # Convert semgrep severities to bandit-style
-        if semgrep_sev == "ERROR":
-            mapped_sev = "HIGH"
-        elif semgrep_sev == "WARNING":
-            mapped_sev = "MEDIUM"
-        elif semgrep_sev == "INFO":
-            mapped_sev = "LOW"
+            logger.info(f"Using semgrep config: {semgrep_config}")
+            report("scanning", files_total=len(file_paths))
+            semgrep_t0 = time.time()
+            if baseline:
+                logger.info(f"Starting incremental semgrep scan of {len(file_paths)} files against {baseline_commit}")
+                semgrep_raw, findings, delta = run_incremental_semgrep_scan(
+                    repo_dir, file_paths, baseline, config=semgrep_config, timeout_sec=timeout_sec, shards=semgrep_shards
+                )
+                shard_errors = delta.pop("shard_errors")
+            elif semgrep_shards > 1:
+                logger.info(f"Starting sharded semgrep scan on {len(file_paths)} files in {repo_dir}")
+                semgrep_raw, shard_errors, failed_paths = run_sharded_semgrep_scan(
+                    repo_dir, file_paths, config=semgrep_config, timeout_sec=timeout_sec, shards=semgrep_shards
+                )
+                findings = record_file_findings(repo_dir, file_paths, semgrep_raw, skip=set(failed_paths)) if scope else {}
+                delta = None
+            else:
+                # Findings stream straight into the summary (and compact per-file records),
+                # so neither semgrep's stdout nor its full results are ever held at once
+                logger.info(f"Starting semgrep scan on {len(file_paths)} files in {repo_dir}")
+                acc = SemgrepSummary(opts.max_issues, base_dir=repo_dir)
+                grouped: Dict[str, List[dict]] = {}
+
+                def _on_result(r: dict) -> None:
+                    acc.add(r)
+                    if scope:
+                        _group_result(grouped, r, repo_dir)
+
+                semgrep_stats = SemgrepRunStats()
+                semgrep_raw = run_semgrep_scan(
+                    repo_dir, config=semgrep_config, timeout_sec=timeout_sec, on_result=_on_result, stats=semgrep_stats
+                )
+                findings = file_findings(repo_dir, file_paths, grouped) if scope else {}
+                delta = None
+            semgrep_sec = round(time.time() - semgrep_t0, 3)
+        finally:
+            shutil.rmtree(repo_dir, ignore_errors=True)
+        SCAN_PHASE_SECONDS.observe(semgrep_sec, phase="semgrep")
+        if semgrep_stats is not None:
+            SCAN_BYTES.inc(semgrep_stats.output_bytes, source="semgrep_output")
+        SCAN_ERRORS.inc(len(shard_errors), kind="semgrep_shard")
+        summarize_t0 = time.perf_counter()
+
+        # Files dropped after their retries ran out (not skipped for size) leave the checkout incomplete
+        files_missing = materialize_stats.files_failed - materialize_stats.files_too_large
+        if scope and not files_missing:
+            try:
+                file_findings_store.save(scope, commit, findings)
+            except sqlite3.Error as e:
+                logger.warning(f"Recording per-file findings failed: {e}")
+        if baseline_commit:
+            incremental = {"baseline_commit": baseline_commit, "baseline_found": delta is not None, **(delta or {})}
+
+        if semgrep_stats is not None:
+            summary = acc.summary(semgrep_raw.get("paths", {}))
         else:
-            mapped_sev = "LOW"
-            
-        if mapped_sev in sev:
-            sev[mapped_sev] += 1
-        
-        issues.append({
-            "filename": r.get("path"),
-            "line_number": r.get("start", {}).get("line"),
-            "test_id": r.get("check_id"),
-            "test_name": r.get("extra", {}).get("message", ""),
-            "issue_severity": mapped_sev,
-            "issue_confidence": "HIGH",  # semgrep doesn't have confidence levels
-            "issue_text": r.get("extra", {}).get("message", ""),
-        })
-    return {
-        "total_issues": len(results),
-        "high": sev["HIGH"],
-        "medium": sev["MEDIUM"],
-        "low": sev["LOW"],
-        "issues": issues,
-        "metrics": output.get("paths", {}),
+            summary = summarize_semgrep(semgrep_raw, opts.max_issues, base_dir=repo_dir)
+        file_count_scanned = len(file_paths)
+        SCANS.inc(result="scanned")
+        SCAN_FILES.inc(file_count_scanned, state="scanned")
+        for severity in ("high", "medium", "low"):
+            SCAN_ISSUES.inc(summary.get(severity, 0), severity=severity)
+        # Partial results (some shards failed, files missing) must not be served as complete later
+        if cache_key and not shard_errors and not files_missing:
+            try:
+                scan_result_cache.put(cache_key, {"summary": summary, "file_count_scanned": file_count_scanned})
+            except sqlite3.Error as e:
+                logger.warning(f"Scan result cache store failed: {e}")
+
+    partial = bool(shard_errors) or files_missing > 0
+    # A complete scan's issues are addressed like its cached result, so cache hits reuse them
+    issues_ref = persist_scan_issues(
+        summary,
+        scan_id=cache_key if not partial else None,
+        replace=cached is None,
+    )
+    if cached is None:
+        SCAN_PHASE_SECONDS.observe(time.perf_counter() - summarize_t0, phase="summarize")
+    scan_info = {
+        **issues_ref,
+        "file_count_scanned": file_count_scanned,
+        "file_regex": opts.file_regex,
+        "exclude_regex": opts.exclude_regex,
+        "duration_sec": round(time.time() - t0, 3),
+        "cache_hit": cached is not None,
+        "cache_key": cache_key,
+        "fetch_engine": opts.fetch_engine,
+        "materialize_sec": materialize_stats.duration_sec,
+        "checkout_storage": materialize_stats.storage,
+        "write_sec": materialize_stats.write_sec,
+        "semgrep_sec": semgrep_sec,
+        "semgrep_output_bytes": semgrep_stats.output_bytes if semgrep_stats else None,
+        "semgrep_parse_buffer_peak_bytes": semgrep_stats.parse_buffer_peak_bytes if semgrep_stats else None,
+        "issues_truncated": summary.get("issues_truncated", 0),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "listing_sec": materialize_stats.listing_sec,
+        "first_file_sec": materialize_stats.first_file_sec,
+        "files_reused": materialize_stats.files_reused,
+        "bytes_fetched": materialize_stats.bytes_fetched,
+        "bytes_reused": materialize_stats.bytes_reused,
+        "files_too_large": materialize_stats.files_too_large,
+        "throttle_signals": materialize_stats.throttle_signals,
+        "download_concurrency": {
+            "lowest": materialize_stats.concurrency_lowest,
+            "final": materialize_stats.concurrency_final,
+        },
+        "http_connections": dc.connection_stats(),
+        "incremental": incremental,
+        "semgrep_shards": opts.semgrep_shards,
+        "partial": partial,
+        "files_missing": files_missing,
+        "shard_errors": shard_errors,
     }
+    return summary, scan_info
 
-# ───────────────────────────── HTTP Endpoint ────────────────────────────────
-@app.route("/security-scan-model", methods=["POST"])
-def security_scan_model():
+
+def build_scan_result(
+    model: dict,
+    summary: dict,
+    scan_info: dict,
+    include_issues: bool,
+    include_metrics: bool,
+) -> dict:
+    """
+    Response body of a remote scan. Issues are paged from GET /scans/<scan_id>/issues;
+    they are only inlined (as "issues") when include_issues is set.
+    """
+    result = {
+        "summary": {k: v for k, v in summary.items() if k != "issues"},
+        "model": model,
+        "scan": {
+            "total": summary["total_issues"],
+            "high": summary["high"],
+            "medium": summary["medium"],
+            "low": summary["low"],
+            **scan_info,
+        },
+    }
+    if include_issues:
+        result["issues"] = summary["issues"]
+    if include_metrics:
+        result["metrics"] = summary.get("metrics")
+    return result
+
+
+def _run_security_scan(body: dict, progress: Optional[ProgressCallback] = None) -> Tuple[dict, int]:
     t0 = time.time()
+
+    def report(phase: str, **counters) -> None:
+        if progress is not None:
+            progress(phase, **counters)
+
     try:
-        body = request.get_json(silent=True) or {}
         model_name = body.get("modelName")
         version = body.get("version")
-        include_issues = bool(body.get("includeIssues", True))
+        include_issues = bool(body.get("includeIssues", False))
         include_metrics = bool(body.get("includeMetrics", False))
-        file_regex = body.get("fileRegex", DEFAULT_FILE_REGEX)
-        exclude_regex = body.get(
-            "excludeRegex",
-            r"(^|/)(node_modules|\.git|\.venv|\.streamlit|venv|env|__pycache__|\.ipynb_checkpoints)(/|$)"
-        )
-
-        max_files = int(body.get("maxFiles", 5000))
-        timeout_sec = int(body.get("timeoutSec", 300))
-        semgrep_config = body.get("semgrepConfig", DEFAULT_SEMGREP_CONFIG)
+        opts = ScanOptions.from_body(body)
+        file_regex = opts.file_regex
+        exclude_regex = opts.exclude_regex
+        max_files = opts.max_files
+        timeout_sec = opts.timeout_sec
+        semgrep_config = opts.semgrep_config
+        baseline_version = body.get("baselineVersion")
 
         # NEW: local scanning options
         use_local = bool(body.get("useLocal", True))
@@ -348,15 +2818,15 @@ def security_scan_model():
         if not use_local:
             # Original contract requires model_name and version when scanning remote model
             if not model_name or version is None:
-                return jsonify({"error": "modelName and version are required for remote scans"}), 400
+                return {"error": "modelName and version are required for remote scans"}, 400
         else:
             # If using local scan, ensure the path exists and is a directory
             if not local_path:
-                return jsonify({"error": "localPath must be provided when useLocal is true"}), 400
+                return {"error": "localPath must be provided when useLocal is true"}, 400
             # Prevent absolute path scanning unless intentional (optional guard)
             # You can harden this check if needed (e.g. require path under a specific base)
             if not os.path.exists(local_path) or not os.path.isdir(local_path):
-                return jsonify({"error": f"localPath does not exist or is not a directory: {local_path}"}), 400
+                return {"error": f"localPath does not exist or is not a directory: {local_path}"}, 400
 
         # Helper: enumerate local files matching include/exclude regexes
         def enumerate_local_files(base_dir: str, include_pattern: Optional[str], exclude_pattern: Optional[str], limit: int):
@@ -384,22 +2854,24 @@ def security_scan_model():
             repo_dir = os.path.abspath(local_path)
             logger.info(f"Using local path for scan: {repo_dir}")
 
+            report("listing")
             file_paths = enumerate_local_files(repo_dir, file_regex, exclude_regex, max_files)
             if not file_paths:
-                return jsonify({"error": "No files to scan after filtering", "regex": file_regex, "excludeRegex": exclude_regex}), 404
+                return {"error": "No files to scan after filtering", "regex": file_regex, "excludeRegex": exclude_regex}, 404
 
             # Run semgrep against the provided directory
             try:
                 logger.info(f"Starting semgrep scan (local dir) on {len(file_paths)} files in {repo_dir}")
+                report("scanning", files_total=len(file_paths))
                 semgrep_raw = run_semgrep_scan(repo_dir, config=semgrep_config, timeout_sec=timeout_sec)
             except Exception as e:
                 logger.exception("Semgrep failed for local scan")
-                return jsonify({"error": f"Semgrep failed: {e}"}), 500
+                return {"error": f"Semgrep failed: {e}"}, 500
 
             summary = summarize_semgrep(semgrep_raw)
 
             result = {
-                "summary": summary,
+                "summary": {k: v for k, v in summary.items() if k != "issues"},
                 "model": {
                     # for local scans, we do not have registered model metadata
                     "modelName": model_name or "local-scan",
@@ -417,6 +2889,7 @@ def security_scan_model():
                     "exclude_regex": exclude_regex,
                     "duration_sec": round(time.time() - t0, 3),
                     "scanned_path": repo_dir,
+                    **persist_scan_issues(summary),
                 },
             }
             if include_issues:
@@ -424,92 +2897,441 @@ def security_scan_model():
             if include_metrics:
                 result["metrics"] = summary.get("metrics")
 
-            return jsonify(result)
+            return result, 200
 
         # -------------------------------------------------------------
-        # Original Domino-backed flow below (unchanged except minor cleanup)
+        # Domino-backed flow: resolve the model version, then scan its commit
         # -------------------------------------------------------------
-        dc = DominoClient(DOMINO_DOMAIN, DOMINO_API_KEY)
-
-        # 1) Registered model version → commit, experimentRunId, project info
-        mv = get_registered_model_version(dc, model_name, int(version))
-        tags = mv.get("tags", {}) or {}
-        commit = tags.get("mlflow.source.git.commit")
-        owner_username = mv.get("ownerUsername") or mv.get("project", {}).get("ownerUsername")
-        project_id = mv.get("project", {}).get("id") or tags.get("mlflow.domino.project_id")
-        project_name = mv.get("project", {}).get("name") or tags.get("mlflow.domino.project_name")
-        run_url_rel = mv.get("versionUiDetails", {}).get("experimentRunInfo", {}).get("runUrl")
-        run_url = f"{DOMINO_DOMAIN}{run_url_rel}" if run_url_rel else None
-        experiment_run_id = mv.get("experimentRunId")
-
-        if not (owner_username and project_name and project_id):
-            return jsonify({"error": "Unable to resolve ownerUsername/projectName/projectId from model"}), 500
-        if not commit:
-            return jsonify({"error": "Model version missing tags.mlflow.source.git.commit; cannot pin snapshot."}), 400
-
-        # 2) Resolve main repository id/uri via gitBrowse
-        gb = get_git_browse(dc, owner_username, project_name)
-        repo_id = gb.get("projectMainRepositoryId")
-        repo_uri = gb.get("projectMainRepositoryUri")
-        if not repo_id:
-            return jsonify({"error": "No main repository found for project"}), 404
-
-        # 3) Download repo at commit to temp dir (only files matching regex)
-        repo_dir, file_paths = materialize_repo(dc, project_id, repo_id, commit, file_regex, exclude_regex, max_files)
-        if not file_paths:
-            shutil.rmtree(repo_dir, ignore_errors=True)
-            return jsonify({"error": "No files to scan after filtering", "regex": file_regex, "excludeRegex": exclude_regex}), 404
-
-        # 4) Semgrep scan
-        try:
-            logger.info(f"Starting semgrep scan on {len(file_paths)} files in {repo_dir}")
-            logger.info(f"Using semgrep config: {semgrep_config}")
-            semgrep_raw = run_semgrep_scan(repo_dir, config=semgrep_config, timeout_sec=timeout_sec)
-        finally:
-            shutil.rmtree(repo_dir, ignore_errors=True)
+        dc = get_domino_client()
 
-        summary = summarize_semgrep(semgrep_raw)
-
-        result = {
-            "summary": summary,
-            "model": {
-                "modelName": mv.get("modelName"),
-                "modelVersion": mv.get("modelVersion"),
-                "experimentRunId": experiment_run_id,
-                "runUrl": run_url,
-                "project": {"id": project_id, "name": project_name},
-                "git": {
-                    "commit": commit,
-                    "projectMainRepositoryId": repo_id,
-                    "projectMainRepositoryUri": repo_uri,
-                },
-            },
-            "scan": {
-                "total": summary["total_issues"],
-                "high": summary["high"],
-                "medium": summary["medium"],
-                "low": summary["low"],
-                "file_count_scanned": len(file_paths),
-                "file_regex": file_regex,
-                "exclude_regex": exclude_regex,
-                "duration_sec": round(time.time() - t0, 3),
-            },
-        }
-        if include_issues:
-            result["issues"] = summary["issues"]
-        if include_metrics:
-            result["metrics"] = summary.get("metrics")
+        report("resolving")
+        target = resolve_scan_target(dc, model_name, int(version))
+        if opts.baseline_commit is None and baseline_version is not None:
+            baseline_mv = get_registered_model_version(dc, model_name, int(baseline_version))
+            opts.baseline_commit = (baseline_mv.get("tags", {}) or {}).get("mlflow.source.git.commit")
 
-        return jsonify(result)
+        summary, scan_info = scan_commit(dc, target, opts, report)
+        scan_info["duration_sec"] = round(time.time() - t0, 3)
+        return build_scan_result(target.model_block(), summary, scan_info, include_issues, include_metrics), 200
 
+    except ScanError as e:
+        SCAN_ERRORS.inc(kind="scan_error")
+        return e.payload, e.status
     except DominoApiError as e:
+        SCAN_ERRORS.inc(kind="domino_api")
         logger.exception("Domino API error")
-        return jsonify({"error": str(e)}), 502
+        return {"error": str(e)}, 502
     except subprocess.TimeoutExpired:
-        return jsonify({"error": "Semgrep timed out"}), 504
+        SCAN_ERRORS.inc(kind="semgrep_timeout")
+        return {"error": "Semgrep timed out"}, 504
     except Exception as e:
+        SCAN_ERRORS.inc(kind="unexpected")
         logger.exception("Unexpected error in security_scan_model")
-        return jsonify({"error": f"Unexpected error: {e}"}), 500
+        return {"error": f"Unexpected error: {e}"}, 500
+
+
+# ───────────────────────────── Batch Scans ───────────────────────────────────
+
+def dashboard_batch_entries() -> List[dict]:
+    """
+    One batch entry per model in model_data. Its versions are display labels ("v1.10"),
+    not registered version numbers, so each model's latest registered version is scanned.
+    """
+    names = OrderedDict((m["name"], None) for m in model_data if m.get("name"))
+    return [{"modelName": name, "version": "latest"} for name in names]
+
+
+def _parse_model_version(version) -> int:
+    """Registered model versions are integers; accept "3" and "v3" as well."""
+    text = str(version).strip()
+    if text[:1] in ("v", "V"):
+        text = text[1:]
+    try:
+        return int(text)
+    except ValueError:
+        raise ScanError({"error": f"Not a registered model version number: {version!r}"}, 400)
+
+
+def run_batch_scan(
+    entries: List[dict],
+    opts: ScanOptions,
+    include_issues: bool = False,
+    include_metrics: bool = False,
+    concurrency: int = BATCH_CONCURRENCY,
+) -> Iterator[dict]:
+    """
+    Scan many registered model versions, yielding one record per model as it finishes.
+
+    An entry's version may be "latest", resolved to the model's newest registered
+    version (and reported as that number). Models are resolved concurrently, then
+    grouped by (repository, commit) so each
+    distinct snapshot is downloaded and scanned once. Up to `concurrency` snapshots are
+    scanned at a time; their downloads share one pool of MAX_WORKERS threads and their
+    semgrep processes share the process-wide semgrep slots. A final summary record
+    with "done": true closes the stream.
+    """
+    t0 = time.time()
+    counts = {"succeeded": 0, "failed": 0}
+
+    def _record(entry: dict, payload: dict, status: int) -> dict:
+        counts["succeeded" if status < 400 else "failed"] += 1
+        return {"modelName": entry.get("modelName"), "version": entry.get("version"), "httpStatus": status, "result": payload}
+
+    try:
+        dc = get_domino_client()
+    except DominoApiError as e:
+        for entry in entries:
+            yield _record(entry, {"error": str(e)}, 502)
+        yield {"done": True, "models": len(entries), **counts, "duration_sec": round(time.time() - t0, 3)}
+        return
+
+    def _resolve(entry: dict) -> ScanTarget:
+        if not entry.get("modelName") or entry.get("version") is None:
+            raise ScanError({"error": "modelName and version are required for remote scans"}, 400)
+        if entry["version"] == "latest":
+            entry["version"] = get_latest_model_version(dc, entry["modelName"])
+        return resolve_scan_target(dc, entry["modelName"], _parse_model_version(entry["version"]))
+
+    # Resolve every model first; identical snapshots are scanned once
+    groups: "OrderedDict[Tuple[str, str], List[Tuple[dict, ScanTarget]]]" = OrderedDict()
+    with ThreadPoolExecutor(max_workers=LIST_WORKERS) as ex:
+        futs = {ex.submit(_resolve, entry): entry for entry in entries}
+        for fut in as_completed(futs):
+            entry = futs[fut]
+            try:
+                target = fut.result()
+            except ScanError as e:
+                SCAN_ERRORS.inc(kind="scan_error")
+                yield _record(entry, e.payload, e.status)
+                continue
+            except DominoApiError as e:
+                SCAN_ERRORS.inc(kind="domino_api")
+                yield _record(entry, {"error": str(e)}, 502)
+                continue
+            except Exception as e:
+                SCAN_ERRORS.inc(kind="unexpected")
+                logger.exception("Unexpected error resolving batch scan target")
+                yield _record(entry, {"error": f"Unexpected error: {e}"}, 500)
+                continue
+            groups.setdefault((target.repo_id, target.commit), []).append((entry, target))
+
+    download_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="batch-download")
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="batch-scan") as ex:
+            futs = {
+                ex.submit(scan_commit, dc, members[0][1], opts, None, download_pool): members
+                for members in groups.values()
+            }
+            for fut in as_completed(futs):
+                members = futs[fut]
+                try:
+                    summary, scan_info = fut.result()
+                except ScanError as e:
+                    SCAN_ERRORS.inc(kind="scan_error")
+                    payload, status = e.payload, e.status
+                except DominoApiError as e:
+                    SCAN_ERRORS.inc(kind="domino_api")
+                    payload, status = {"error": str(e)}, 502
+                except subprocess.TimeoutExpired:
+                    SCAN_ERRORS.inc(kind="semgrep_timeout")
+                    payload, status = {"error": "Semgrep timed out"}, 504
+                except Exception as e:
+                    SCAN_ERRORS.inc(kind="unexpected")
+                    logger.exception("Unexpected error in batch scan")
+                    payload, status = {"error": f"Unexpected error: {e}"}, 500
+                else:
+                    scan_info["models_sharing_commit"] = len(members)
+                    for entry, target in members:
+                        yield _record(
+                            entry,
+                            build_scan_result(target.model_block(), summary, scan_info, include_issues, include_metrics),
+                            200,
+                        )
+                    continue
+                for entry, _ in members:
+                    yield _record(entry, payload, status)
+    finally:
+        download_pool.shutdown(wait=False, cancel_futures=True)
+
+    yield {
+        "done": True,
+        "models": len(entries),
+        "unique_commits": len(groups),
+        **counts,
+        "duration_sec": round(time.time() - t0, 3),
+    }
+
+
+# ───────────────────────────── Scan Jobs ─────────────────────────────────────
+
+class ScanQueueFullError(RuntimeError):
+    pass
+
+
+class ScanJob:
+    """A security scan request queued for background execution."""
+
+    def __init__(self, body: dict):
+        self.id = uuid.uuid4().hex
+        self.body = body
+        self.status = "queued"  # queued → running → succeeded | failed
+        self.progress: dict = {"phase": "queued"}
+        self.result: Optional[dict] = None
+        self.http_status: Optional[int] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.phase_started_at = self.created_at
+        self.version = 0  # bumped on every change; see wait_for_change()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def _touch(self) -> None:
+        # Caller holds self._lock
+        self.version += 1
+        self._changed.notify_all()
+
+    def start(self) -> None:
+        with self._lock:
+            self.status = "running"
+            self.started_at = time.time()
+            self._touch()
+
+    def update_progress(self, phase: str, **counters) -> None:
+        with self._lock:
+            if phase != self.progress.get("phase"):
+                self.progress = {"phase": phase}
+                self.phase_started_at = time.time()
+            self.progress.update(counters)
+            self._touch()
+
+    def finish(self, payload: dict, http_status: int) -> None:
+        with self._lock:
+            self.result = payload
+            self.http_status = http_status
+            self.status = "succeeded" if http_status < 400 else "failed"
+            self.progress = {"phase": "done"}
+            self.finished_at = time.time()
+            self._touch()
+
+    def wait_for_change(self, seen_version: int, timeout: float) -> int:
+        """Block until the job changes past seen_version (or timeout); returns the current version."""
+        with self._lock:
+            self._changed.wait_for(lambda: self.version != seen_version, timeout=timeout)
+            return self.version
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            progress = dict(self.progress)
+            if self.finished_at is None:
+                progress["phase_elapsed_sec"] = round(time.time() - self.phase_started_at, 3)
+            snap = {
+                "jobId": self.id,
+                "status": self.status,
+                "progress": progress,
+                "createdAt": self.created_at,
+                "startedAt": self.started_at,
+                "finishedAt": self.finished_at,
+            }
+            if self.finished_at is not None:
+                snap["httpStatus"] = self.http_status
+                snap["result"] = self.result
+            return snap
+
+
+class ScanJobQueue:
+    """
+    Bounded background executor for scan jobs.
+
+    At most `workers` scans run at once and at most `max_queued` wait behind them;
+    submissions beyond that are rejected rather than piling up semgrep processes.
+    Finished jobs are kept for `ttl_sec` so clients can poll for the result.
+    """
+
+    def __init__(self, workers: int = SCAN_JOB_WORKERS, max_queued: int = SCAN_JOB_QUEUE_DEPTH, ttl_sec: int = SCAN_JOB_TTL_SEC):
+        self.workers = max(1, workers)
+        self.ttl_sec = ttl_sec
+        self._queue: "queue.Queue[ScanJob]" = queue.Queue(maxsize=max(1, max_queued))
+        self._jobs: Dict[str, ScanJob] = {}
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, body: dict) -> ScanJob:
+        job = ScanJob(body)
+        with self._lock:
+            self._prune()
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise ScanQueueFullError(
+                    f"Scan queue is full ({self._queue.maxsize} jobs waiting); retry later"
+                )
+            self._jobs[job.id] = job
+            # Workers start lazily so that importing the app never spawns threads
+            if not self._threads:
+                for i in range(self.workers):
+                    t = threading.Thread(target=self._work, name=f"scan-job-{i}", daemon=True)
+                    t.start()
+                    self._threads.append(t)
+        return job
+
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.ttl_sec
+        expired = [jid for jid, j in self._jobs.items() if j.finished_at is not None and j.finished_at < cutoff]
+        for jid in expired:
+            del self._jobs[jid]
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            job.start()
+            try:
+                payload, status = perform_security_scan(job.body, progress=job.update_progress)
+            except Exception as e:
+                logger.exception(f"Scan job {job.id} crashed")
+                payload, status = {"error": f"Unexpected error: {e}"}, 500
+            job.finish(payload, status)
+            self._queue.task_done()
+
+
+scan_job_queue = ScanJobQueue()
+metrics.callback(
+    "secscan_scan_jobs_queued", "Scan jobs waiting for a worker", "gauge", (),
+    lambda: [((), scan_job_queue._queue.qsize())],
+)
+
+
+# ───────────────────────────── HTTP Endpoint ────────────────────────────────
+@app.route("/security-scan-model", methods=["POST"])
+def security_scan_model():
+    body = request.get_json(silent=True) or {}
+    if request.args.get("async", "").lower() in ("1", "true", "yes"):
+        try:
+            job = scan_job_queue.submit(body)
+        except ScanQueueFullError as e:
+            return jsonify({"error": str(e)}), 429
+        return jsonify({
+            "jobId": job.id,
+            "status": job.status,
+            "statusUrl": f"scan-jobs/{job.id}",
+        }), 202
+
+    payload, status = perform_security_scan(body)
+    return jsonify(payload), status
+
+
+@app.route("/security-scan-models", methods=["POST"])
+def security_scan_models():
+    body = request.get_json(silent=True) or {}
+    entries = dashboard_batch_entries() if body.get("all") else body.get("models")
+    if not isinstance(entries, list) or not entries:
+        return jsonify({"error": "Provide a non-empty \"models\" list of {modelName, version}, or \"all\": true"}), 400
+    try:
+        opts = ScanOptions.from_body(body)
+        concurrency = int(body.get("concurrency", BATCH_CONCURRENCY))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid scan option: {e}"}), 400
+    # Each concurrent snapshot also runs LIST_WORKERS listing threads; never exceed the configured cap
+    concurrency = min(max(concurrency, 1), BATCH_CONCURRENCY)
+
+    records = run_batch_scan(
+        entries,
+        opts,
+        include_issues=bool(body.get("includeIssues", False)),
+        include_metrics=bool(body.get("includeMetrics", False)),
+        concurrency=concurrency,
+    )
+    return Response((json.dumps(r) + "\n" for r in records), mimetype="application/x-ndjson")
+
+
+@app.route("/scans/<scan_id>/issues", methods=["GET"])
+def get_scan_issues(scan_id):
+    """
+    One page of a scan's issues. Query: severity (comma-separated HIGH/MEDIUM/LOW),
+    file (exact path, or a directory ending in "/"), test_id, limit and the cursor
+    returned as nextCursor by the previous page.
+    """
+    try:
+        after = int(request.args.get("cursor", "-1"))
+        limit = min(max(int(request.args.get("limit", ISSUES_PAGE_SIZE)), 1), ISSUES_PAGE_MAX)
+    except ValueError:
+        return jsonify({"error": "cursor and limit must be integers"}), 400
+    severities = [v.strip().upper() for v in request.args.get("severity", "").split(",") if v.strip()]
+
+    total = scan_issues_store.total(scan_id)
+    if total is None:
+        return jsonify({"error": f"Unknown or expired scan: {scan_id}"}), 404
+    issues, next_cursor = scan_issues_store.page(
+        scan_id,
+        after=after,
+        limit=limit,
+        severities=severities,
+        filename=request.args.get("file") or None,
+        test_id=request.args.get("test_id") or None,
+    )
+    return jsonify({
+        "scanId": scan_id,
+        "total": total,
+        "issues": issues,
+        "nextCursor": str(next_cursor) if next_cursor is not None else None,
+    })
+
+
+@app.route("/metadata-cache/invalidate", methods=["POST"])
+def invalidate_metadata_lookups():
+    body = request.get_json(silent=True) or {}
+    dropped = invalidate_metadata_cache(
+        model_name=body.get("modelName"),
+        version=body.get("version"),
+        owner_username=body.get("ownerUsername"),
+        project_name=body.get("projectName"),
+    )
+    return jsonify({
+        "invalidated": dropped,
+        "stats": {"model_version": model_version_cache.stats(), "git_browse": git_browse_cache.stats()},
+    })
+
+
+@app.route("/scan-jobs/<job_id>", methods=["GET"])
+def get_scan_job(job_id):
+    job = scan_job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown scan job: {job_id}"}), 404
+    return jsonify(job.snapshot())
+
+
+@app.route("/scan-jobs/<job_id>/events", methods=["GET"])
+def stream_scan_job(job_id):
+    """
+    Server-Sent Events feed of a scan job: a "progress" event (the job snapshot without
+    the result) whenever the job changes, at most every PROGRESS_INTERVAL_SEC and at
+    least every SCAN_EVENTS_HEARTBEAT_SEC, then one "done" event with the full snapshot.
+    """
+    job = scan_job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown scan job: {job_id}"}), 404
+
+    def events() -> Iterator[str]:
+        seen = -1
+        while True:
+            seen = job.wait_for_change(seen, timeout=SCAN_EVENTS_HEARTBEAT_SEC)
+            snap = job.snapshot()
+            event = "done" if snap["finishedAt"] is not None else "progress"
+            yield f"event: {event}\nid: {seen}\ndata: {json.dumps(snap)}\n\n"
+            if event == "done":
+                return
+            time.sleep(PROGRESS_INTERVAL_SEC)
+
+    return Response(
+        events(),
+        mimetype="text/event-stream",
+        # Proxies must not buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 def make_domino_api_request(endpoint, method='GET'):
@@ -540,10 +3362,11 @@ def get_experiment_run_details(experiment_id):
 
 
 # Test curl command at startup
-def test_api_connectivity():
+def test_api_connectivity() -> dict:
+    """Probe the governance API once with curl; returns {"ok", "http_code", "error"} for the readiness check."""
     if not DOMINO_DOMAIN or not DOMINO_API_KEY:
         logger.error("Missing DOMINO_DOMAIN or DOMINO_API_KEY environment variables")
-        return
+        return {"ok": False, "http_code": None, "error": "Missing DOMINO_DOMAIN or DOMINO_API_KEY"}
     
     test_url = f"{DOMINO_DOMAIN}/api/governance/v1/bundles"
     
@@ -564,22 +3387,312 @@ def test_api_connectivity():
         logger.info(f"Curl stdout: {result.stdout}")
         if result.stderr:
             logger.info(f"Curl stderr: {result.stderr}")
+        code = result.stdout.rpartition("HTTP_CODE:")[2].strip()
+        http_code = int(code) if code.isdigit() and int(code) else None
+        ok = result.returncode == 0 and http_code is not None and http_code < 400
+        error = None if ok else (f"HTTP {http_code}" if http_code else f"curl exit code {result.returncode}")
+        return {"ok": ok, "http_code": http_code, "error": error}
     except subprocess.TimeoutExpired:
         logger.error("Curl command timed out after 30 seconds")
         logger.info(f"Copy/paste to test manually: {curl_cmd_str}")
+        return {"ok": False, "http_code": None, "error": "timed out after 30 seconds"}
     except Exception as e:
         logger.error(f"Curl command failed: {str(e)}")
         logger.info(f"Copy/paste to test manually: {curl_cmd_str}")
+        return {"ok": False, "http_code": None, "error": str(e)}
+
+# ───────────────────────────── Startup & Readiness ───────────────────────────
+
+
+class ConnectivityProbe:
+    """
+    Runs test_api_connectivity on a daemon thread, off the startup path.
+
+    The first probe starts as soon as start() is called; later ones repeat every
+    interval_sec so readiness recovers (or degrades) with Domino. The latest result
+    is kept for the readiness endpoint.
+    """
+
+    def __init__(self, interval_sec: float):
+        self.interval_sec = interval_sec
+        self.result: Optional[dict] = None
+        self.checks = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="connectivity-probe", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            t0 = time.monotonic()
+            result = test_api_connectivity()
+            result["duration_sec"] = round(time.monotonic() - t0, 3)
+            result["checked_at"] = time.time()
+            with self._lock:
+                first = self.result is None
+                self.result = result
+                self.checks += 1
+            if first:
+                logger.warning(
+                    f"Domino API connectivity {'ok' if result['ok'] else 'FAILED (' + str(result['error']) + ')'} "
+                    f"in {result['duration_sec']}s"
+                )
+            if self.interval_sec <= 0:
+                return
+            time.sleep(self.interval_sec)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            if self.result is None:
+                return {"status": "pending", "checks": self.checks}
+            return {"status": "ok" if self.result["ok"] else "failed", "checks": self.checks, **self.result}
+
+
+connectivity_probe = ConnectivityProbe(CONNECTIVITY_PROBE_INTERVAL_SEC)
+_first_request_at: Optional[float] = None
+_first_request_lock = threading.Lock()
+
+
+@app.before_request
+def _note_first_request():
+    global _first_request_at
+    if _first_request_at is not None:
+        return
+    with _first_request_lock:
+        if _first_request_at is None:
+            _first_request_at = time.monotonic()
+            logger.warning(f"First request ({request.path}) {_first_request_at - PROCESS_STARTED_AT:.2f}s after process start")
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_t0 = time.perf_counter()
+
+
+@app.after_request
+def _observe_request(response):
+    t0 = g.get("request_t0")
+    if t0 is not None:
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - t0, route=route, method=request.method, status=response.status_code)
+    return response
+
+
+def time_to_first_request_sec() -> Optional[float]:
+    return None if _first_request_at is None else round(_first_request_at - PROCESS_STARTED_AT, 3)
+
 
 # Health check endpoints
 @app.route("/_stcore/health")
 def health():
     return "", 200
 
+@app.route("/_stcore/ready")
+def ready():
+    """Readiness: 200 once the dashboard page is rendered and the last Domino probe succeeded, else 503."""
+    connectivity_probe.start()  # no-op when __main__ already started it
+    domino = connectivity_probe.snapshot()
+    try:
+        get_home_page()
+        page = {"status": "ok"}
+    except Exception as e:
+        logger.error(f"Dashboard page render failed: {e}")
+        page = {"status": "failed", "error": str(e)}
+    is_ready = page["status"] == "ok" and domino["status"] == "ok"
+    body = {
+        "ready": is_ready,
+        "checks": {
+            "domino_api": domino,
+            "home_page": page,
+        },
+        "uptime_sec": round(time.monotonic() - PROCESS_STARTED_AT, 3),
+        "time_to_first_request_sec": time_to_first_request_sec(),
+    }
+    return jsonify(body), 200 if is_ready else 503
+
+@app.route("/metrics")
+def metrics_endpoint():
+    """Prometheus text exposition of this process's metrics."""
+    return Response(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.route("/_stcore/host-config")
 def host_config():
     return "", 200
 
+# ───────────────────────────── Reverse Proxy ─────────────────────────────────
+
+PROXY_SKIP_REQUEST_HEADERS = {
+    "host", "content-length", "transfer-encoding", "connection", "keep-alive",
+    "authorization",  # Skip this - conflicts with X-Domino-Api-Key
+}
+# requests decodes the upstream body, so its encoding and length no longer describe what we send
+PROXY_SKIP_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+# Request headers that change what upstream returns; hashed into every cache key
+PROXY_CACHE_KEY_HEADERS = ("x-domino-api-key", "cookie", "accept")
+
+_proxy_sessions: Dict[str, requests.Session] = {}
+_proxy_sessions_lock = threading.Lock()
+
+
+def get_proxy_session(url: str) -> requests.Session:
+    """Process-wide pooled session per upstream origin; never stores upstream cookies."""
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}".lower()
+    with _proxy_sessions_lock:
+        s = _proxy_sessions.get(origin)
+        if s is None:
+            s = requests.Session()
+            # One session serves every dashboard user, so a Set-Cookie must not leak to the next caller
+            s.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            s.mount(f"{parts.scheme}://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=PROXY_POOL_SIZE))
+            _proxy_sessions[origin] = s
+        return s
+
+
+def _cache_directives(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+def _freshness_sec(headers) -> float:
+    """Seconds a response may be served without revalidation: max-age, else Expires - Date, else 0."""
+    directives = _cache_directives(headers.get("Cache-Control"))
+    if "no-cache" in directives:
+        return 0.0
+    if directives.get("max-age"):
+        try:
+            return max(0.0, float(directives["max-age"]))
+        except ValueError:
+            return 0.0
+    if headers.get("Expires"):
+        try:
+            expires = parsedate_to_datetime(headers["Expires"]).timestamp()
+            date = parsedate_to_datetime(headers["Date"]).timestamp() if headers.get("Date") else time.time()
+            return max(0.0, expires - date)
+        except (TypeError, ValueError):
+            return 0.0
+    return 0.0
+
+
+@dataclass
+class ProxyCacheEntry:
+    headers: List[Tuple[str, str]]
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    max_age: float
+
+    def fresh(self) -> bool:
+        return time.monotonic() - self.stored_at < self.max_age
+
+
+class ProxyResponseCache:
+    """
+    LRU cache of proxied GET responses, keyed by URL, query and credentials.
+
+    Only 200 responses that upstream allows to be stored and that carry a freshness
+    lifetime or a validator (ETag / Last-Modified) are kept. Stale entries are
+    revalidated with a conditional request; a 304 refreshes them in place.
+    """
+
+    def __init__(self, maxsize: int, max_entry_bytes: int):
+        self.maxsize = maxsize
+        self.max_entry_bytes = max_entry_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._data: "OrderedDict[tuple, ProxyCacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    @staticmethod
+    def key(url: str, params: dict, headers: Dict[str, str]) -> tuple:
+        lowered = {k.lower(): v for k, v in headers.items()}
+        identity = "\n".join(lowered.get(h, "") for h in PROXY_CACHE_KEY_HEADERS)
+        return (url, tuple(sorted(params.items())), hashlib.sha256(identity.encode()).hexdigest())
+
+    @staticmethod
+    def storable(resp: requests.Response) -> bool:
+        if resp.status_code != 200:
+            return False
+        directives = _cache_directives(resp.headers.get("Cache-Control"))
+        if "no-store" in directives or "Set-Cookie" in resp.headers:
+            return False
+        vary = {v.strip().lower() for v in resp.headers.get("Vary", "").split(",") if v.strip()}
+        if not vary <= set(PROXY_CACHE_KEY_HEADERS) | {"accept-encoding"}:
+            return False
+        return bool(resp.headers.get("ETag") or resp.headers.get("Last-Modified") or _freshness_sec(resp.headers))
+
+    def get(self, key: tuple) -> Optional[ProxyCacheEntry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, entry: ProxyCacheEntry) -> None:
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def invalidate_url(self, url: str) -> int:
+        """Drop entries for url (any query or caller), e.g. after a write to it; returns how many."""
+        with self._lock:
+            keys = [k for k in self._data if k[0] == url]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.revalidated + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.revalidated) / lookups, 3) if lookups else None,
+                "size": len(self._data),
+            }
+
+
+proxy_cache = ProxyResponseCache(PROXY_CACHE_SIZE, PROXY_CACHE_MAX_ENTRY_BYTES)
+metrics.callback(
+    "proxy_cache_lookups_total", "/proxy GET cache lookups", "counter", ("outcome",),
+    lambda: [((outcome,), proxy_cache.stats()[outcome]) for outcome in ("hits", "revalidated", "misses")],
+)
+
+
+def _curl_equivalent(method: str, url: str, params: dict, headers: Dict[str, str]) -> str:
+    headers_str = " ".join([f"-H '{k}: {v}'" for k, v in headers.items()])
+    params_str = "&".join([f"{k}={v}" for k, v in params.items()])
+    final_url = f"{url}?{params_str}" if params_str else url
+    return f"curl -X {method} {headers_str} '{final_url}'"
+
+
+def _cached_response(entry: ProxyCacheEntry, outcome: str) -> Response:
+    response = Response(entry.body, status=200, headers=entry.headers + [("X-Proxy-Cache", outcome)])
+    return response.make_conditional(request)
+
+
 @app.route("/proxy/<path:path>", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"])
 def proxy_request(path):
     logger.info(f"Proxy request: {request.method} {path}")
@@ -598,16 +3711,11 @@ def proxy_request(path):
     upstream_url = urljoin(target_base.rstrip("/") + "/", path)
     
     # Forward headers (exclude hop-by-hop headers and conflicting auth)
-    forward_headers = {}
-    skip_headers = {
-        "host", "content-length", "transfer-encoding", "connection", "keep-alive",
-        "authorization"  # Skip this - conflicts with X-Domino-Api-Key
+    forward_headers = {
+        key: value for key, value in request.headers
+        if key.lower() not in PROXY_SKIP_REQUEST_HEADERS
     }
     
-    for key, value in request.headers:
-        if key.lower() not in skip_headers:
-            forward_headers[key] = value
-    
     # Filter out the 'target' parameter from upstream request
     upstream_params = {k: v for k, v in request.args.items() if k != 'target'}
     
@@ -616,26 +3724,67 @@ def proxy_request(path):
         logger.info(f"Upstream params: {upstream_params}")
     
     # Log the equivalent curl command for debugging
-    headers_str = " ".join([f"-H '{k}: {v}'" for k, v in forward_headers.items()])
-    params_str = "&".join([f"{k}={v}" for k, v in upstream_params.items()])
-    final_url = f"{upstream_url}?{params_str}" if params_str else upstream_url
-    curl_equivalent = f"curl -X {request.method} {headers_str} '{final_url}'"
-    logger.info(f"Equivalent curl command:")
-    logger.info(f"  {curl_equivalent}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Equivalent curl command: {_curl_equivalent(request.method, upstream_url, upstream_params, forward_headers)}")
+    
+    # Idempotent GETs go through the response cache unless the caller forbids it
+    client_cc = _cache_directives(request.headers.get("Cache-Control"))
+    cache_key = None
+    entry = None
+    if request.method == "GET" and proxy_cache.enabled and "no-store" not in client_cc:
+        cache_key = proxy_cache.key(upstream_url, upstream_params, forward_headers)
+        entry = proxy_cache.get(cache_key)
+        if entry is not None and entry.fresh() and "no-cache" not in client_cc:
+            proxy_cache.record("hits")
+            return _cached_response(entry, "HIT")
+        if entry is not None:
+            forward_headers = {
+                k: v for k, v in forward_headers.items()
+                if k.lower() not in ("if-none-match", "if-modified-since")
+            }
+            if entry.etag:
+                forward_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                forward_headers["If-Modified-Since"] = entry.last_modified
     
     try:
-        # Make the upstream request
-        resp = requests.request(
+        # Make the upstream request over the pooled session for this host
+        upstream_t0 = time.perf_counter()
+        resp = get_proxy_session(upstream_url).request(
             method=request.method,
             url=upstream_url,
             params=upstream_params,
             data=request.get_data(),
             headers=forward_headers,
-            timeout=30,
+            timeout=PROXY_TIMEOUT_SEC,
             stream=True
         )
         
         logger.info(f"Upstream response: {resp.status_code}")
+        PROXY_UPSTREAM_SECONDS.observe(time.perf_counter() - upstream_t0, method=request.method, status=resp.status_code)
+        
+        if entry is not None and resp.status_code == 304:
+            resp.close()
+            refreshed = replace(
+                entry,
+                etag=resp.headers.get("ETag", entry.etag),
+                stored_at=time.monotonic(),
+                max_age=_freshness_sec(resp.headers) if resp.headers.get("Cache-Control") or resp.headers.get("Expires") else entry.max_age,
+            )
+            proxy_cache.put(cache_key, refreshed)
+            proxy_cache.record("revalidated")
+            return _cached_response(refreshed, "REVALIDATED")
+        if cache_key is not None:
+            proxy_cache.record("misses")
+        elif request.method != "GET" and resp.status_code < 400:
+            # A successful write may change what a cached GET of the same resource returns
+            proxy_cache.invalidate_url(upstream_url)
+        
+        # Forward response headers (exclude hop-by-hop)
+        response_headers = [
+            (key, value) for key, value in resp.headers.items()
+            if key.lower() not in PROXY_SKIP_RESPONSE_HEADERS
+        ]
         
         # Log response body for debugging (truncated)
         if resp.status_code >= 400:
@@ -643,14 +3792,6 @@ def proxy_request(path):
                 # Get a copy of the content for logging
                 content = resp.content
                 logger.error(f"Upstream error response body: {content[:1000].decode('utf-8', errors='ignore')}")
-                # Create new response with the content
-                response_headers = []
-                hop_by_hop = {"content-encoding", "transfer-encoding", "connection", "keep-alive"}
-                
-                for key, value in resp.headers.items():
-                    if key.lower() not in hop_by_hop:
-                        response_headers.append((key, value))
-                
                 return Response(
                     content,
                     status=resp.status_code,
@@ -659,16 +3800,31 @@ def proxy_request(path):
             except Exception as e:
                 logger.error(f"Error reading response content: {str(e)}")
         
-        # Forward response headers (exclude hop-by-hop)
-        response_headers = []
-        hop_by_hop = {"content-encoding", "transfer-encoding", "connection", "keep-alive"}
-        
-        for key, value in resp.headers.items():
-            if key.lower() not in hop_by_hop:
-                response_headers.append((key, value))
+        body = resp.iter_content(chunk_size=8192)
+        if cache_key is not None and proxy_cache.storable(resp):
+            # Buffer up to the entry cap; a larger body is streamed on uncached
+            chunks = []
+            size = 0
+            for chunk in body:
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > proxy_cache.max_entry_bytes:
+                    break
+            else:
+                content = b"".join(chunks)
+                proxy_cache.put(cache_key, ProxyCacheEntry(
+                    headers=response_headers,
+                    body=content,
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                    stored_at=time.monotonic(),
+                    max_age=_freshness_sec(resp.headers),
+                ))
+                return Response(content, status=resp.status_code, headers=response_headers + [("X-Proxy-Cache", "MISS")])
+            body = itertools.chain(chunks, body)
         
         return Response(
-            resp.iter_content(chunk_size=8192),
+            body,
             status=resp.status_code,
             headers=response_headers,
             direct_passthrough=True
@@ -692,18 +3848,239 @@ def safe_domino_config():
         "API_KEY": DOMINO_API_KEY,   
     }
 
+# ───────────────────────────── Model Inventory ───────────────────────────────
+
+MODEL_SORT_FIELDS = ("name", "risk_score", "utilization_score", "days_noncompliant")
+MODELS_PAGE_SIZE = 25
+MODELS_PAGE_MAX = 200
+
+
+def _search_tokens(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+class ModelIndex:
+    """
+    Read-only query index over the model inventory, built once per data set.
+
+    Stage and type filters are precomputed id sets, text search uses an inverted index
+    of name and tag tokens (prefix matches via bisect over the sorted vocabulary), and
+    every sortable field has a precomputed order plus each model's rank in it. A query
+    intersects the smallest sets first and only sorts the ids it matched, so unfiltered
+    pages are a slice and filtered ones cost O(k log k) in the number of matches.
+    """
+
+    def __init__(self, models: List[dict]):
+        self.models = models
+        self.by_stage: Dict[str, set] = {}
+        self.by_type: Dict[str, set] = {}
+        tokens: Dict[str, set] = {}
+        for i, m in enumerate(models):
+            self.by_stage.setdefault(str(m.get("stage", "")).lower(), set()).add(i)
+            self.by_type.setdefault(str(m.get("type", "")).lower(), set()).add(i)
+            for tok in _search_tokens(" ".join([str(m.get("name", ""))] + [str(t) for t in m.get("tags") or []])):
+                tokens.setdefault(tok, set()).add(i)
+        self.tokens = tokens
+        self.vocabulary = sorted(tokens)
+
+        self.orders: Dict[str, List[int]] = {}
+        self.ranks: Dict[str, List[int]] = {}
+        for field in MODEL_SORT_FIELDS:
+            if field == "name":
+                key = lambda i: (str(models[i].get("name", "")).lower(), i)
+            else:
+                # Missing values sort last in ascending order
+                key = lambda i, f=field: (models[i].get(f) is None, models[i].get(f) or 0, i)
+            order = sorted(range(len(models)), key=key)
+            rank = [0] * len(models)
+            for pos, i in enumerate(order):
+                rank[i] = pos
+            self.orders[field] = order
+            self.ranks[field] = rank
+
+    def _matching_token(self, prefix: str) -> set:
+        ids: set = set()
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        for tok in self.vocabulary[start:]:
+            if not tok.startswith(prefix):
+                break
+            ids |= self.tokens[tok]
+        return ids
+
+    def query(
+        self,
+        stages: Optional[List[str]] = None,
+        types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        sort: str = "name",
+        descending: bool = False,
+        offset: int = 0,
+        limit: int = MODELS_PAGE_SIZE,
+    ) -> Tuple[List[dict], int]:
+        """Returns (models on the requested page, number of models matching the filters)."""
+        if sort not in self.orders:
+            raise ValueError(f"sort must be one of {', '.join(MODEL_SORT_FIELDS)}")
+        candidates: List[set] = []
+        if stages:
+            candidates.append(set().union(*(self.by_stage.get(s.lower(), set()) for s in stages)))
+        if types:
+            candidates.append(set().union(*(self.by_type.get(t.lower(), set()) for t in types)))
+        for tok in _search_tokens(search or ""):
+            candidates.append(self._matching_token(tok))
+
+        order = self.orders[sort]
+        if not candidates:
+            total = len(order)
+            if descending:
+                # Slice from the end so a page costs O(limit), not a copy of the whole order
+                stop = max(total - offset, 0)
+                ids = order[max(stop - limit, 0):stop][::-1]
+            else:
+                ids = order[offset:offset + limit]
+        else:
+            candidates.sort(key=len)
+            matched = candidates[0].intersection(*candidates[1:])
+            rank = self.ranks[sort]
+            total = len(matched)
+            ids = sorted(matched, key=rank.__getitem__, reverse=descending)[offset:offset + limit]
+        return [self.models[i] for i in ids], total
+
+
+model_index = ModelIndex(model_data)
+
+
+def _csv_arg(name: str) -> List[str]:
+    return [v.strip() for v in request.args.get(name, "").split(",") if v.strip()]
+
+
+@app.route("/api/models", methods=["GET"])
+def list_models():
+    """
+    A page of the model inventory. Query: stage and type (comma-separated, any of),
+    q (name/tag search; every word must prefix-match), sort (name, risk_score,
+    utilization_score, days_noncompliant), order (asc/desc), limit, and either offset
+    or the cursor returned as nextCursor by the previous page.
+    """
+    try:
+        offset = int(request.args.get("cursor") or request.args.get("offset") or 0)
+        limit = min(max(int(request.args.get("limit", MODELS_PAGE_SIZE)), 1), MODELS_PAGE_MAX)
+        models, total = model_index.query(
+            stages=_csv_arg("stage"),
+            types=_csv_arg("type"),
+            search=request.args.get("q"),
+            sort=request.args.get("sort", "name"),
+            descending=request.args.get("order", "asc").lower() == "desc",
+            offset=max(offset, 0),
+            limit=limit,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    next_offset = offset + len(models)
+    response = jsonify({
+        "models": models,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "nextCursor": str(next_offset) if next_offset < total else None,
+    })
+    # Static per process: clients and proxies revalidate with the ETag and get 304s
+    response.set_etag(hashlib.sha256(response.get_data()).hexdigest()[:32])
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+# ───────────────────────────── Dashboard Page ────────────────────────────────
+
+class PrecomputedPage:
+    """
+    A rendered page held in memory with precompressed variants.
+
+    Each encoding (identity, gzip and, when the brotli package is installed, br) gets
+    its own strong ETag derived from the content, so clients revalidate with
+    If-None-Match and get 304 Not Modified without the page being rebuilt.
+    """
+
+    def __init__(self, body: bytes, mimetype: str = "text/html"):
+        self.mimetype = mimetype
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants: Dict[str, Tuple[bytes, str]] = {
+            "identity": (body, digest),
+            "gzip": (gzip.compress(body, compresslevel=9, mtime=0), f"{digest}-gzip"),
+        }
+        if brotli is not None:
+            self.variants["br"] = (brotli.compress(body, quality=11), f"{digest}-br")
+
+    def _negotiate(self) -> str:
+        accepted = request.accept_encodings
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and accepted[encoding] > 0:
+                return encoding
+        return "identity"
+
+    def respond(self) -> Response:
+        encoding = self._negotiate()
+        body, etag = self.variants[encoding]
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype=self.mimetype)
+            if encoding != "identity":
+                response.headers["Content-Encoding"] = encoding
+        response.set_etag(etag)
+        response.vary.add("Accept-Encoding")
+        # The page embeds the Domino API config: browsers may keep it but must revalidate
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
+
+_home_page: Optional[PrecomputedPage] = None
+_home_page_lock = threading.Lock()
+
+
+def get_home_page() -> PrecomputedPage:
+    """The rendered dashboard, built on first use and reused until invalidate_home_page()."""
+    global _home_page
+    page = _home_page
+    if page is None:
+        with _home_page_lock:
+            if _home_page is None:
+                t0 = time.time()
+                with app.app_context():
+                    html = render_template("index.html", DOMINO=safe_domino_config())
+                _home_page = PrecomputedPage(html.encode("utf-8"))
+                sizes = ", ".join(f"{enc} {len(body)}B" for enc, (body, _) in _home_page.variants.items())
+                logger.info(f"Rendered home page in {time.time() - t0:.3f}s ({sizes})")
+            page = _home_page
+    return page
+
+
+def invalidate_home_page() -> None:
+    """Call after the Domino config changes; the next request re-renders."""
+    global _home_page
+    with _home_page_lock:
+        _home_page = None
+
+
 @app.route("/")
 def home():
-    return render_template("index.html", DOMINO=safe_domino_config(), MODELDATA=model_data)
+    return get_home_page().respond()
 
 @app.route("/original")
 def original():
     return render_template("original_index.html", DOMINO=safe_domino_config())
 
 if __name__ == "__main__":
-    # Test API connectivity on startup
-    test_api_connectivity()
+    # Probe API connectivity in the background; /_stcore/ready reports the result
+    connectivity_probe.start()
+    get_home_page()
     
     port = int(os.environ.get("PORT", 8888))
-    logger.info(f"Starting Flask app on port {port}")
-    app.run(host="0.0.0.0", port=port, debug=False)
\ No newline at end of file
+    if os.environ.get("SERVER") == "waitress":
+        # Production mode without fork: one process, WEB_THREADS request threads
+        from waitress import serve
+        threads = int(os.environ.get("WEB_THREADS", "16"))
+        logger.warning(f"Starting waitress on port {port} with {threads} threads ({time.monotonic() - PROCESS_STARTED_AT:.2f}s after process start)")
+        serve(app, host="0.0.0.0", port=port, threads=threads)
+    else:
+        logger.warning(f"Starting Flask app on port {port} ({time.monotonic() - PROCESS_STARTED_AT:.2f}s after process start)")
+        app.run(host="0.0.0.0", port=port, debug=False)
\ No newline at end of file
@@ -4,6 +4,20 @@ set -euo pipefail
 # usage: PORT=8501 bash app.sh
 PORT="${PORT:-${1:-8888}}"
 
+export PORT
+SERVER="${SERVER:-dev}"  # dev (Flask dev server), gunicorn or waitress
+PIDFILE="${WEB_PIDFILE:-/tmp/model-dashboard-${PORT}.pid}"
+
+# 0) Stop a running gunicorn gracefully: in-flight requests get up to WEB_GRACEFUL_TIMEOUT_SEC to finish
+if [ -f "$PIDFILE" ] && kill -0 "$(cat "$PIDFILE")" 2>/dev/null; then
+  echo "Stopping gunicorn master $(cat "$PIDFILE") gracefully…"
+  kill -TERM "$(cat "$PIDFILE")" || true
+  for _ in $(seq 1 "${WEB_GRACEFUL_TIMEOUT_SEC:-30}"); do
+    kill -0 "$(cat "$PIDFILE" 2>/dev/null)" 2>/dev/null || break
+    sleep 1
+  done
+fi
+
 # 1) Kill anything listening on $PORT via fuser (works where ss/lsof aren’t available)
 if command -v fuser &>/dev/null; then
   echo "Killing any process on port $PORT…"
@@ -31,4 +45,9 @@ fi
 
 # 4) Launch your Flask app
 export FLASK_APP=app.py
-python app.py
+case "$SERVER" in
+  gunicorn) exec gunicorn -c gunicorn.conf.py app:app ;;
+  waitress) exec python app.py ;;
+  dev)      exec python app.py ;;
+  *)        echo "Unknown SERVER=$SERVER (expected dev, gunicorn or waitress)"; exit 1 ;;
+esac
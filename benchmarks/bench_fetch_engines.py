@@ -0,0 +1,77 @@
+# benchmarks/bench_fetch_engines.py
+"""
+Compare the thread and asyncio fetch engines of materialize_repo against a local fake.
+
+    python -m benchmarks.bench_fetch_engines --depth 3 --fanout 4 --files-per-dir 50 --latency 0.02
+
+Each engine is run --runs times with the blob cache disabled so every file is fetched.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from benchmarks.fake_domino import FakeDomino, RepoShape  # noqa: E402
+
+
+def run_engine(engine: str, dc: app.DominoClient, args: argparse.Namespace) -> dict:
+    stats = app.MaterializeStats()
+    t0 = time.perf_counter()
+    if engine == "asyncio":
+        repo_dir, paths = app.materialize_repo_async(
+            dc, "bench-project", "bench-repo", "bench-commit", ".*", None, args.max_files,
+            concurrency=args.async_concurrency, stats=stats, blob_cache=None,
+        )
+    else:
+        repo_dir, paths = app.materialize_repo(
+            dc, "bench-project", "bench-repo", "bench-commit", ".*", None, args.max_files,
+            workers=args.thread_workers, stats=stats, blob_cache=None,
+        )
+    elapsed = time.perf_counter() - t0
+    shutil.rmtree(repo_dir, ignore_errors=True)
+    return {"elapsed": elapsed, "files": len(paths), "first_file": stats.first_file_sec}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--files-per-dir", type=int, default=50)
+    parser.add_argument("--file-size", type=int, default=2048)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every fake API call")
+    parser.add_argument("--max-files", type=int, default=100000)
+    parser.add_argument("--thread-workers", type=int, default=app.MAX_WORKERS)
+    parser.add_argument("--async-concurrency", type=int, default=app.ASYNC_CONCURRENCY)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    engines = ["thread"] + (["asyncio"] if app.aiohttp is not None else [])
+    if app.aiohttp is None:
+        print("aiohttp not installed; benchmarking the thread engine only")
+
+    shape = RepoShape(args.depth, args.fanout, args.files_per_dir, args.file_size)
+    server = FakeDomino(shape, latency_sec=args.latency).start()
+    try:
+        dc = app.DominoClient(server.url, "bench-key", pool_size=max(args.thread_workers, app.LIST_WORKERS) * 2)
+        print(f"repo: {server.file_count} files in {len(server.tree)} directories, {args.latency * 1000:.0f} ms latency")
+        for engine in engines:
+            runs = [run_engine(engine, dc, args) for _ in range(args.runs)]
+            times = [r["elapsed"] for r in runs]
+            median = statistics.median(times)
+            print(
+                f"{engine:>8}: median {median:.3f}s  min {min(times):.3f}s  "
+                f"{runs[0]['files'] / median:.0f} files/s  first file {runs[0]['first_file']}s"
+            )
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
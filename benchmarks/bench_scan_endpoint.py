@@ -0,0 +1,190 @@
+# benchmarks/bench_scan_endpoint.py
+"""
+Drive the real POST /security-scan-model endpoint against a local fake Domino API.
+
+    python -m benchmarks.bench_scan_endpoint --depth 3 --fanout 4 --files-per-dir 20 \
+        --latency 0.01 --throttle-rate 0.02 --requests 24 --concurrency 4 --fake-semgrep
+
+The app is served over HTTP on a local port and scanned by --concurrency clients, each
+pinned to its own model version (so its own commit) to keep requests from coalescing.
+Every request rescans unless --cached is given. --fake-semgrep puts a stub semgrep on
+PATH that reports no findings instantly, which isolates the Domino and checkout path.
+A --proxy-requests phase then measures /proxy against the fake governance API.
+
+Reports throughput, p50/p99 latency, per-phase medians from the scan blocks and the
+peak RSS of the process (app, clients and fake server together).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_domino import FakeDomino, RepoShape  # noqa: E402
+
+FAKE_SEMGREP = """#!{python}
+import json, sys
+if "--version" in sys.argv:
+    print("0.0.0-bench")
+else:
+    print(json.dumps({{"version": "0.0.0-bench", "results": [], "errors": [], "paths": {{"scanned": []}}}}))
+"""
+
+
+def install_fake_semgrep(directory: str) -> None:
+    path = os.path.join(directory, "semgrep")
+    with open(path, "w") as f:
+        f.write(FAKE_SEMGREP.format(python=sys.executable))
+    os.chmod(path, 0o755)
+    os.environ["PATH"] = directory + os.pathsep + os.environ.get("PATH", "")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_clients(n_requests: int, concurrency: int, send) -> dict:
+    """Run send(client_index) n_requests times over `concurrency` threads; collect latencies and failures."""
+    latencies: List[float] = []
+    results: List[dict] = []
+    failures: List[str] = []
+    lock = threading.Lock()
+    remaining = [n_requests]
+
+    def _client(index: int) -> None:
+        session = requests.Session()
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            t0 = time.perf_counter()
+            try:
+                r = send(session, index)
+            except requests.RequestException as e:
+                with lock:
+                    failures.append(str(e))
+                continue
+            elapsed = time.perf_counter() - t0
+            with lock:
+                if r.status_code == 200:
+                    latencies.append(elapsed)
+                    if r.headers.get("Content-Type", "").startswith("application/json"):
+                        results.append(r.json())
+                else:
+                    failures.append(f"{r.status_code} {r.text[:200]}")
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=_client, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {"elapsed": time.perf_counter() - t0, "latencies": latencies, "results": results, "failures": failures}
+
+
+def report_latencies(label: str, run: dict, unit: str = "req") -> None:
+    lat = run["latencies"]
+    if not lat:
+        print(f"{label}: no successful requests; first failure: {run['failures'][:1]}")
+        return
+    print(
+        f"{label}: {len(lat)} ok, {len(run['failures'])} failed in {run['elapsed']:.2f}s  "
+        f"{len(lat) / run['elapsed']:.2f} {unit}/s  p50 {percentile(lat, 50) * 1000:.0f} ms  p99 {percentile(lat, 99) * 1000:.0f} ms"
+    )
+    if run["failures"]:
+        print(f"  first failure: {run['failures'][0]}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--files-per-dir", type=int, default=20)
+    parser.add_argument("--file-size", type=int, default=2048)
+    parser.add_argument("--max-file-size", type=int, help="spread file sizes from --file-size up to this")
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds added to every fake API call")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of fake API calls answered with 429")
+    parser.add_argument("--requests", type=int, default=12, help="scan requests in total")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--fetch-engine", choices=("thread", "asyncio"), default="thread")
+    parser.add_argument("--cached", action="store_true", help="let the scan result cache answer repeat scans")
+    parser.add_argument("--fake-semgrep", action="store_true", help="use an instant no-findings semgrep stub")
+    parser.add_argument("--proxy-requests", type=int, default=200, help="/proxy requests after the scans (0 = skip)")
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args()
+
+    shape = RepoShape(args.depth, args.fanout, args.files_per_dir, args.file_size, args.max_file_size)
+    fake = FakeDomino(shape, latency_sec=args.latency, throttle_rate=args.throttle_rate).start()
+    workdir = tempfile.mkdtemp(prefix="bench-scan-")
+    if args.fake_semgrep:
+        install_fake_semgrep(workdir)
+
+    # app reads its configuration at import time, so the environment is set first
+    os.environ["DOMINO_DOMAIN"] = fake.url
+    os.environ["DOMINO_API_KEY"] = "bench-key"
+    os.environ["SEC_SCAN_CACHE_DIR"] = os.path.join(workdir, "cache")
+    import app
+    from werkzeug.serving import make_server
+
+    httpd = make_server("127.0.0.1", args.port, app.app, threaded=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{httpd.server_port}"
+    print(
+        f"repo: {fake.file_count} files ({fake.repo_bytes / 1e6:.1f} MB) in {len(fake.tree)} directories, "
+        f"{args.latency * 1000:.0f} ms latency, {args.throttle_rate:.0%} throttled, "
+        f"semgrep: {'stub' if args.fake_semgrep else app.get_semgrep_version() or 'NOT INSTALLED'}"
+    )
+
+    try:
+        def _scan(session: requests.Session, index: int) -> requests.Response:
+            return session.post(f"{base}/security-scan-model", json={
+                "modelName": "bench-model",
+                "version": index + 1,
+                "useLocal": False,
+                "fetchEngine": args.fetch_engine,
+                "forceRescan": not args.cached,
+            }, timeout=600)
+
+        scans = run_clients(args.requests, args.concurrency, _scan)
+        report_latencies("scans", scans, "scans")
+        blocks = [r["scan"] for r in scans["results"]]
+        if blocks:
+            files = sum(b["file_count_scanned"] for b in blocks)
+            print(f"  {files / scans['elapsed']:.0f} files/s scanned")
+            for key in ("listing_sec", "materialize_sec", "semgrep_sec"):
+                values = [b[key] for b in blocks if b.get(key) is not None]
+                if values:
+                    print(f"  median {key}: {statistics.median(values):.3f}s")
+
+        if args.proxy_requests:
+            def _proxy(session: requests.Session, index: int) -> requests.Response:
+                return session.get(f"{base}/proxy/api/governance/v1/bundles",
+                                   params={"target": fake.url}, headers={"X-Domino-Api-Key": "bench-key"}, timeout=30)
+
+            proxied = run_clients(args.proxy_requests, args.concurrency, _proxy)
+            report_latencies("proxy", proxied)
+            print(f"  proxy cache: {app.proxy_cache.stats()}")
+
+        rss = app.peak_rss_bytes()
+        print(f"fake Domino: {fake.requests} requests, {fake.throttled} throttled")
+        print(f"peak RSS: {rss / 1e6:.0f} MB" if rss else "peak RSS: unavailable on this platform")
+    finally:
+        httpd.shutdown()
+        fake.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
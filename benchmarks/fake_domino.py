@@ -0,0 +1,197 @@
+# benchmarks/fake_domino.py
+"""
+Local stand-in for the Domino endpoints used by the scan pipeline and the proxy.
+
+Serves a synthetic repository so the pipeline can be measured without a live Domino domain:
+
+    /api/registeredmodels/v1/<name>                any model; its latestVersion is latest_version
+    /api/registeredmodels/v1/<name>/versions/<n>   any model; version n is pinned to commit "bench-commit-<n>"
+    /v4/code/gitBrowse                             the project's main repository ("bench-repo")
+    /v4/projects/<p>/gitRepositories/<r>/git/browse and .../git/raw
+    /api/governance/v1/bundles                     a small JSON list with an ETag, for /proxy
+
+    server = FakeDomino(RepoShape(depth=3, fanout=4, files_per_dir=20), latency_sec=0.02, throttle_rate=0.05)
+    server.start()
+    ... point a DominoClient (or DOMINO_DOMAIN) at server.url ...
+    server.stop()
+
+A throttle_rate fraction of requests is answered with 429 and Retry-After: 0.
+"""
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class RepoShape:
+    depth: int = 2               # directory levels below the root
+    fanout: int = 4              # subdirectories per directory
+    files_per_dir: int = 10      # files in every directory
+    file_size: int = 2048        # bytes per file
+    max_file_size: Optional[int] = None  # when set, sizes spread evenly from file_size to this
+
+    def size_of(self, index: int) -> int:
+        if not self.max_file_size or self.max_file_size <= self.file_size:
+            return self.file_size
+        span = self.max_file_size - self.file_size
+        return self.file_size + (index * 7919) % (span + 1)
+
+
+# Python source, so a real semgrep has something to parse (and a finding or two)
+FILE_HEADER = b"import subprocess\n\n\ndef run(cmd):\n    return subprocess.call(cmd, shell=True)\n\n"
+
+
+def file_body(size: int) -> bytes:
+    lines = bytearray(FILE_HEADER)
+    i = 0
+    while len(lines) < size:
+        lines += f"value_{i} = {i}\n".encode()
+        i += 1
+    return bytes(lines[:size])
+
+
+def build_repo(shape: RepoShape) -> Dict[str, List[dict]]:
+    """Directory path ("" = root) → /git/browse items for that directory."""
+    tree: Dict[str, List[dict]] = {}
+
+    def _fill(directory: str, level: int) -> None:
+        prefix = f"{directory}/" if directory else ""
+        items = []
+        for i in range(shape.files_per_dir):
+            path = f"{prefix}module_{i}.py"
+            items.append({"kind": "file", "name": f"module_{i}.py", "path": path,
+                          "size": shape.size_of(len(tree) * shape.files_per_dir + i),
+                          "sha": f"{hash(path) & 0xffffffff:08x}"})
+        if level < shape.depth:
+            for i in range(shape.fanout):
+                sub = f"{prefix}pkg_{i}"
+                items.append({"kind": "dir", "name": f"pkg_{i}", "path": sub})
+                _fill(sub, level + 1)
+        tree[directory] = items
+
+    _fill("", 0)
+    return tree
+
+
+class FakeDomino:
+    """Threaded HTTP server answering the Domino model, gitBrowse and git endpoints for one synthetic repo."""
+
+    def __init__(
+        self,
+        shape: RepoShape,
+        latency_sec: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        throttle_rate: float = 0.0,
+        seed: int = 0,
+        latest_version: int = 1,
+    ):
+        self.shape = shape
+        self.latest_version = latest_version
+        self.latency_sec = latency_sec
+        self.throttle_rate = throttle_rate
+        self.tree = build_repo(shape)
+        self.sizes = {it["path"]: it["size"] for items in self.tree.values() for it in items if it["kind"] == "file"}
+        self.file_count = len(self.sizes)
+        self.repo_bytes = sum(self.sizes.values())
+        self.requests = 0
+        self.throttled = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeDomino":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _throttle(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            if self.throttle_rate and self._random.random() < self.throttle_rate:
+                self.throttled += 1
+                return True
+            return False
+
+    def _handler(self):
+        server = self
+        body_cache = file_body(max(self.sizes.values(), default=0))
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str = "application/json", headers: Optional[dict] = None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, payload, headers: Optional[dict] = None) -> None:
+                self._send(200, json.dumps(payload).encode(), headers=headers)
+
+            def do_GET(self):
+                if server.latency_sec:
+                    time.sleep(server.latency_sec)
+                if server._throttle():
+                    return self._send(429, b'{"error": "rate limited"}', headers={"Retry-After": "0"})
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if url.path.endswith("/git/browse"):
+                    items = server.tree.get(query.get("directory", ""))
+                    if items is None:
+                        return self._send(404, b'{"error": "no such directory"}')
+                    return self._json({"data": {"items": items}})
+                if url.path.endswith("/git/raw"):
+                    size = server.sizes.get(query.get("fileName", ""))
+                    if size is None:
+                        return self._send(404, b'{"error": "no such file"}')
+                    return self._send(200, body_cache[:size], "application/octet-stream")
+                if url.path.startswith("/api/registeredmodels/v1/") and "/versions/" in url.path:
+                    name, _, version = url.path[len("/api/registeredmodels/v1/"):].partition("/versions/")
+                    return self._json({
+                        "modelName": name,
+                        "modelVersion": version,
+                        "experimentRunId": f"bench-run-{version}",
+                        "ownerUsername": "bench-owner",
+                        "project": {"id": "bench-project", "name": "bench-project", "ownerUsername": "bench-owner"},
+                        "tags": {"mlflow.source.git.commit": f"bench-commit-{version}"},
+                    })
+                if url.path.startswith("/api/registeredmodels/v1/"):
+                    name = url.path[len("/api/registeredmodels/v1/"):]
+                    return self._json({"name": name, "latestVersion": server.latest_version})
+                if url.path == "/v4/code/gitBrowse":
+                    return self._json({
+                        "projectMainRepositoryId": "bench-repo",
+                        "projectMainRepositoryUri": "https://git.example.com/bench-owner/bench-project.git",
+                    })
+                if url.path == "/api/governance/v1/bundles":
+                    headers = {"ETag": '"bundles-v1"', "Cache-Control": "max-age=5"}
+                    if self.headers.get("If-None-Match") == headers["ETag"]:
+                        return self._send(304, b"", headers=headers)
+                    return self._json([{"id": f"bundle-{i}", "name": f"Bundle {i}"} for i in range(20)], headers=headers)
+                self._send(404, b'{"error": "not found"}')
+
+        return Handler
@@ -0,0 +1,129 @@
+# benchmarks/load_dashboard.py
+"""
+Load a running dashboard with concurrent page loads while security scans run.
+
+    SERVER=gunicorn PORT=8501 bash app.sh &
+    python -m benchmarks.load_dashboard --url http://localhost:8501 --clients 32 --duration 20 \
+        --scan-clients 2 --scan-body '{"modelName": "my-model", "version": 3, "forceRescan": true}'
+
+Each dashboard client loops over `GET /` followed by `GET /api/models` on its own
+kept-alive session. Each scan client posts --scan-body to /security-scan-model back to
+back (synchronously, so each holds a request thread for the length of a scan). The
+dashboard phase is reported separately with and without scans running.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from typing import List, Optional
+
+import requests
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def dashboard_client(url: str, stop: threading.Event, latencies: List[float], errors: List[str]) -> None:
+    s = requests.Session()
+    while not stop.is_set():
+        for path in ("/", "/api/models?limit=25"):
+            t0 = time.perf_counter()
+            try:
+                r = s.get(url + path, timeout=30)
+                r.content
+                if r.status_code != 200:
+                    errors.append(f"{path} -> {r.status_code}")
+                    continue
+            except requests.RequestException as e:
+                errors.append(f"{path} -> {e}")
+                continue
+            latencies.append(time.perf_counter() - t0)
+
+
+def scan_client(url: str, body: dict, stop: threading.Event, durations: List[float], errors: List[str]) -> None:
+    s = requests.Session()
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            r = s.post(url + "/security-scan-model", json=body, timeout=600)
+        except requests.RequestException as e:
+            errors.append(str(e))
+            continue
+        if r.status_code == 200:
+            durations.append(time.perf_counter() - t0)
+        else:
+            errors.append(f"{r.status_code} {r.text[:200]}")
+            time.sleep(1)
+
+
+def run_phase(args: argparse.Namespace, scan_body: Optional[dict]) -> dict:
+    stop = threading.Event()
+    latencies: List[float] = []
+    errors: List[str] = []
+    scan_durations: List[float] = []
+    scan_errors: List[str] = []
+    threads = [
+        threading.Thread(target=dashboard_client, args=(args.url, stop, latencies, errors), daemon=True)
+        for _ in range(args.clients)
+    ]
+    if scan_body is not None:
+        threads += [
+            threading.Thread(target=scan_client, args=(args.url, scan_body, stop, scan_durations, scan_errors), daemon=True)
+            for _ in range(args.scan_clients)
+        ]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    elapsed = time.perf_counter() - t0
+    for t in threads:
+        t.join(timeout=1)
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else None,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else None,
+        "errors": errors,
+        "scans": len(scan_durations),
+        "scan_median_sec": statistics.median(scan_durations) if scan_durations else None,
+        "scan_errors": scan_errors,
+    }
+
+
+def report(label: str, result: dict) -> None:
+    if not result["requests"]:
+        print(f"{label}: no successful requests ({len(result['errors'])} errors, e.g. {result['errors'][:1]})")
+        return
+    line = (
+        f"{label}: {result['requests']} requests  {result['rps']:.0f} req/s  "
+        f"p50 {result['p50_ms']:.1f} ms  p99 {result['p99_ms']:.1f} ms  errors {len(result['errors'])}"
+    )
+    if result["scans"] or result["scan_errors"]:
+        median = f"{result['scan_median_sec']:.1f}s" if result["scan_median_sec"] is not None else "-"
+        line += f"  | scans done {result['scans']} (median {median}), failed {len(result['scan_errors'])}"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8501")
+    parser.add_argument("--clients", type=int, default=16, help="concurrent dashboard clients")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per phase")
+    parser.add_argument("--scan-clients", type=int, default=2, help="concurrent back-to-back scan requests")
+    parser.add_argument("--scan-body", help="JSON body for /security-scan-model; omit to skip the scan phase")
+    args = parser.parse_args()
+    args.url = args.url.rstrip("/")
+
+    report("dashboard only", run_phase(args, None))
+    if args.scan_body:
+        report("with scans", run_phase(args, json.loads(args.scan_body)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for the production mode of app.sh:
+
+    SERVER=gunicorn PORT=8501 bash app.sh
+
+The app is imported once in the master (preload_app) and the dashboard page is rendered
+there before the workers fork, so model_data, the model index and the precompressed page
+are shared copy-on-write. gthread workers serve each request on its own thread, so a
+long synchronous scan ties up one thread rather than the whole worker.
+
+Graceful restarts: `kill -HUP $(cat <pidfile>)` replaces the workers after in-flight
+requests finish; `kill -TERM` stops the server the same way.
+"""
+import gc
+import os
+import time
+
+port = os.environ.get("PORT", "8888")
+
+bind = f"0.0.0.0:{port}"
+# Scan jobs and their progress live in the worker that queued them, so keep one worker
+# unless async scan polling is routed back to the same process
+workers = int(os.environ.get("WEB_WORKERS", "1"))
+threads = int(os.environ.get("WEB_THREADS", "16"))
+worker_class = "gthread"
+preload_app = True
+timeout = int(os.environ.get("WEB_TIMEOUT_SEC", "60"))  # worker heartbeat, not a per-request limit under gthread
+graceful_timeout = int(os.environ.get("WEB_GRACEFUL_TIMEOUT_SEC", "30"))
+keepalive = 5
+pidfile = os.environ.get("WEB_PIDFILE", f"/tmp/model-dashboard-{port}.pid")
+accesslog = "-"
+
+
+def when_ready(server):
+    # Master, after the preloaded import and before any worker forks
+    import app
+    app.get_home_page()
+    # Keep the preloaded objects out of the collector so it doesn't touch (and copy) their pages
+    gc.freeze()
+    server.log.info(f"Dashboard preloaded {time.monotonic() - app.PROCESS_STARTED_AT:.2f}s after process start")
+
+
+def post_fork(server, worker):
+    # Threads don't survive fork, so each worker runs its own connectivity probe
+    import app
+    app.connectivity_probe.start()
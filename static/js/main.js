@@ -1,13 +1,11 @@
 // static/js/main.js
 const DOMINO_API_BASE = window.location.origin + window.location.pathname.replace(/\/$/, '');
 const ORIGINAL_API_BASE = window.DOMINO?.API_BASE || '';
-const HARDCODED_MODEL_DATA = window.MODELDATA || [];
 console.log('window.DOMINO?.API_BASE', window.DOMINO?.API_BASE);
 console.log('window.location.origin', window.location.origin);
 console.log('window.location.pathname', window.location.pathname);
 console.log('using proxy base', DOMINO_API_BASE);
 console.log('proxying to', ORIGINAL_API_BASE);
-console.log('HARDCODED_MODEL_DATA', HARDCODED_MODEL_DATA);
 const API_KEY = window.DOMINO?.API_KEY || null;
 
 // Global state - single source of truth
@@ -17,7 +15,17 @@ let appState = {
     evidence: {},
     models: {},
     tableData: [],
-    securityScans: {}
+    securityScans: {},
+    // Current /api/models query
+    modelQuery: {
+        stage: 'all',
+        q: '',
+        sort: 'name',
+        order: 'asc',
+        offset: 0,
+        limit: 25
+    },
+    modelTotal: 0
 };
 
 // Helper function to make proxy API calls
@@ -42,10 +50,57 @@ async function proxyFetch(apiPath, options = {}) {
 }
 
 // Security scan functions
-async function triggerSecurityScan(modelName, modelVersion) {
+const SCAN_POLL_INTERVAL_MS = 2000;
+
+// Resolves with the finished scan job snapshot, calling onProgress(progress) on every update.
+// Uses the job's Server-Sent Events feed and falls back to polling if the stream drops.
+function waitForScanJob(statusUrl, onProgress) {
+    const basePath = window.location.pathname.replace(/\/$/, '');
+    const jobUrl = `${basePath}/${statusUrl}`;
+
+    return new Promise((resolve, reject) => {
+        const poll = async () => {
+            try {
+                const response = await fetch(jobUrl);
+                if (!response.ok) {
+                    throw new Error(`Scan status failed: ${response.status} ${response.statusText}`);
+                }
+                const job = await response.json();
+                if (job.finishedAt) {
+                    resolve(job);
+                    return;
+                }
+                onProgress(job.progress);
+                setTimeout(poll, SCAN_POLL_INTERVAL_MS);
+            } catch (error) {
+                reject(error);
+            }
+        };
+
+        if (!window.EventSource) {
+            poll();
+            return;
+        }
+        const source = new EventSource(`${jobUrl}/events`);
+        source.addEventListener('progress', (event) => {
+            onProgress(JSON.parse(event.data).progress);
+        });
+        source.addEventListener('done', (event) => {
+            source.close();
+            resolve(JSON.parse(event.data));
+        });
+        source.onerror = () => {
+            // Closed before the "done" event (proxy timeout, server restart): keep going by polling
+            source.close();
+            poll();
+        };
+    });
+}
+
+async function triggerSecurityScan(modelName, modelVersion, onProgress = () => {}) {
     try {
         const basePath = window.location.pathname.replace(/\/$/, '');
-        const response = await fetch(`${basePath}/security-scan-model`, {
+        const response = await fetch(`${basePath}/security-scan-model?async=1`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -55,8 +110,7 @@ async function triggerSecurityScan(modelName, modelVersion) {
                 version: modelVersion,
                 fileRegex: ".*",
                 excludeRegex: "(^|/)(node_modules|\\.git|\\.venv|venv|env|__pycache__|\\.ipynb_checkpoints)(/|$)",
-                semgrepConfig: "auto",
-                includeIssues: true
+                semgrepConfig: "auto"
             })
         });
         
@@ -64,14 +118,18 @@ async function triggerSecurityScan(modelName, modelVersion) {
             throw new Error(`Security scan failed: ${response.status} ${response.statusText}`);
         }
         
-        const result = await response.json();
+        const job = await waitForScanJob((await response.json()).statusUrl, onProgress);
+        if (job.httpStatus >= 400) {
+            throw new Error(`Security scan failed: ${job.httpStatus} ${job.result?.error || ''}`);
+        }
+        const result = job.result;
         
         const transformedResult = {
             total_issues: result.scan?.total || 0,
             high_severity: result.scan?.high || 0,
             medium_severity: result.scan?.medium || 0,
             low_severity: result.scan?.low || 0,
-            issues: result.issues || [],
+            issues_url: result.scan?.issues_url || null,
             timestamp: Date.now()
         };
         
@@ -82,6 +140,60 @@ async function triggerSecurityScan(modelName, modelVersion) {
     }
 }
 
+const SCAN_PHASE_LABELS = {
+    queued: 'Waiting for a scan worker',
+    resolving: 'Resolving model version',
+    listing: 'Listing files',
+    downloading: 'Downloading repository',
+    scanning: 'Running Semgrep',
+    done: 'Finishing'
+};
+
+function formatBytes(bytes) {
+    if (!bytes) return '0 B';
+    const units = ['B', 'KB', 'MB', 'GB'];
+    const i = Math.min(Math.floor(Math.log(bytes) / Math.log(1024)), units.length - 1);
+    return `${(bytes / Math.pow(1024, i)).toFixed(i ? 1 : 0)} ${units[i]}`;
+}
+
+function displaySecurityScanProgress(progress, containerElement) {
+    const phase = progress?.phase || 'queued';
+    const details = [];
+    let percent = null;
+
+    if (phase === 'downloading') {
+        details.push(`${progress.dirs_listed || 0} directories listed`);
+        if (progress.files_total !== undefined) {
+            details.push(`${progress.files_downloaded || 0} / ${progress.files_total} files downloaded`);
+            percent = progress.files_total ? Math.round(100 * (progress.files_downloaded || 0) / progress.files_total) : 100;
+        } else {
+            details.push(`${progress.files_downloaded || 0} of ${progress.files_listed || 0} files found so far downloaded`);
+        }
+        details.push(`${formatBytes(progress.bytes_fetched)} fetched`);
+        if (progress.bytes_reused) {
+            details.push(`${formatBytes(progress.bytes_reused)} reused from cache`);
+        }
+        if (progress.files_failed) {
+            details.push(`${progress.files_failed} failed`);
+        }
+    } else if (phase === 'scanning' && progress.files_total !== undefined) {
+        details.push(`${progress.files_total} files`);
+    }
+    if (progress?.phase_elapsed_sec !== undefined) {
+        details.push(`${progress.phase_elapsed_sec.toFixed(1)}s elapsed`);
+    }
+
+    containerElement.innerHTML = `
+        <div class="security-scan-progress">
+            <h4>${SCAN_PHASE_LABELS[phase] || phase}...</h4>
+            ${percent !== null ? `
+                <div class="scan-progress-bar"><div class="scan-progress-fill" style="width: ${percent}%"></div></div>
+            ` : ''}
+            <div class="scan-progress-details">${details.join(' &middot; ')}</div>
+        </div>
+    `;
+}
+
 function showSecurityScanSpinner(buttonElement) {
     const originalText = buttonElement.innerHTML;
     buttonElement.innerHTML = '<span class="spinner"></span> Scanning...';
@@ -122,25 +234,24 @@ function displaySecurityScanResults(results, containerElement) {
                     <span class="stat-value">${results.low_severity || 0}</span>
                 </div>
             </div>
-            ${results.issues && results.issues.length > 0 ? `
+            ${results.total_issues > 0 && results.issues_url ? `
                 <div class="scan-details">
                     <h5>Issues Found:</h5>
-                    <div class="issues-list">
-                        ${results.issues.slice(0, 5).map(issue => `
-                            <div class="issue-item severity-${issue.severity?.toLowerCase() || 'unknown'}">
-                                <div class="issue-title">${issue.test_name || 'Unknown Issue'}</div>
-                                <div class="issue-file">${issue.filename || 'Unknown file'}:${issue.line_number || 'N/A'}</div>
-                                <div class="issue-message">${issue.issue_text || 'No description available'}</div>
-                            </div>
-                        `).join('')}
-                        ${results.issues.length > 5 ? `
-                            <div class="more-issues">
-                                ... and ${results.issues.length - 5} more issues
-                            </div>
-                        ` : ''}
+                    <div class="issue-filters">
+                        <select class="issue-filter-severity">
+                            <option value="">All severities</option>
+                            <option value="HIGH">High</option>
+                            <option value="MEDIUM">Medium</option>
+                            <option value="LOW">Low</option>
+                        </select>
+                        <input type="text" class="issue-filter-file" placeholder="File or directory/">
+                        <input type="text" class="issue-filter-test" placeholder="Rule id">
+                        <button class="btn btn-secondary issue-filter-apply">Filter</button>
                     </div>
+                    <div class="issues-list"></div>
+                    <button class="btn btn-secondary more-issues" style="display: none;">Load more issues</button>
                 </div>
-            ` : '<div class="no-issues">No security issues found!</div>'}
+            ` : results.total_issues > 0 ? '' : '<div class="no-issues">No security issues found!</div>'}
             <div class="scan-timestamp">
                 <small>Scanned: ${new Date(results.timestamp || Date.now()).toLocaleString()}</small>
             </div>
@@ -148,6 +259,67 @@ function displaySecurityScanResults(results, containerElement) {
     `;
     
     containerElement.innerHTML = resultsHtml;
+
+    if (results.total_issues > 0 && results.issues_url) {
+        const details = containerElement.querySelector('.scan-details');
+        details.querySelector('.issue-filter-apply').addEventListener('click', () => loadScanIssues(details, results.issues_url, true));
+        details.querySelector('.more-issues').addEventListener('click', () => loadScanIssues(details, results.issues_url, false));
+        loadScanIssues(details, results.issues_url, true);
+    }
+}
+
+const ISSUES_PAGE_SIZE = 25;
+
+function escapeHtml(value) {
+    return String(value ?? '').replace(/[&<>"']/g, (c) => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[c]);
+}
+
+// Fetch one page of a scan's issues into detailsElement; reset starts over with the current filters.
+async function loadScanIssues(detailsElement, issuesUrl, reset) {
+    const list = detailsElement.querySelector('.issues-list');
+    const moreButton = detailsElement.querySelector('.more-issues');
+    if (reset) {
+        list.innerHTML = '';
+        detailsElement.dataset.cursor = '';
+    }
+
+    const params = new URLSearchParams({ limit: ISSUES_PAGE_SIZE });
+    const severity = detailsElement.querySelector('.issue-filter-severity').value;
+    const file = detailsElement.querySelector('.issue-filter-file').value.trim();
+    const testId = detailsElement.querySelector('.issue-filter-test').value.trim();
+    if (severity) params.set('severity', severity);
+    if (file) params.set('file', file);
+    if (testId) params.set('test_id', testId);
+    if (detailsElement.dataset.cursor) params.set('cursor', detailsElement.dataset.cursor);
+
+    moreButton.disabled = true;
+    try {
+        const basePath = window.location.pathname.replace(/\/$/, '');
+        const response = await fetch(`${basePath}/${issuesUrl}?${params}`);
+        if (!response.ok) {
+            throw new Error(`Loading issues failed: ${response.status} ${response.statusText}`);
+        }
+        const page = await response.json();
+        list.insertAdjacentHTML('beforeend', page.issues.map(issue => `
+            <div class="issue-item severity-${escapeHtml(issue.issue_severity?.toLowerCase() || 'unknown')}">
+                <div class="issue-title">${escapeHtml(issue.test_name || 'Unknown Issue')}</div>
+                <div class="issue-file">${escapeHtml(issue.filename || 'Unknown file')}:${escapeHtml(issue.line_number || 'N/A')}</div>
+                <div class="issue-message">${escapeHtml(issue.test_id || '')}</div>
+            </div>
+        `).join(''));
+        if (reset && page.issues.length === 0) {
+            list.innerHTML = '<div class="no-issues">No issues match these filters.</div>';
+        }
+        detailsElement.dataset.cursor = page.nextCursor || '';
+        moreButton.style.display = page.nextCursor ? '' : 'none';
+    } catch (error) {
+        console.error('Issue page error:', error);
+        list.insertAdjacentHTML('beforeend', `<div class="security-scan-error">${escapeHtml(error.message)}</div>`);
+    } finally {
+        moreButton.disabled = false;
+    }
 }
 
 async function handleSecurityScan(modelName, modelVersion, buttonElement) {
@@ -159,12 +331,23 @@ async function handleSecurityScan(modelName, modelVersion, buttonElement) {
                                return container;
                            })();
     
+    // A scan for this model is already running; its progress is shown in the panel
+    const scanKey = `${modelName}:${modelVersion}`;
+    if (appState.securityScans[scanKey]?.running) {
+        return;
+    }
+    appState.securityScans[scanKey] = { running: true };
+
     const originalText = showSecurityScanSpinner(buttonElement);
+    displaySecurityScanProgress({ phase: 'queued' }, resultsContainer);
     
     try {
-        const results = await triggerSecurityScan(modelName, modelVersion);
+        const results = await triggerSecurityScan(modelName, modelVersion,
+            (progress) => displaySecurityScanProgress(progress, resultsContainer));
+        appState.securityScans[scanKey] = results;
         displaySecurityScanResults(results, resultsContainer);
     } catch (error) {
+        delete appState.securityScans[scanKey];
         resultsContainer.innerHTML = `
             <div class="security-scan-error">
                 <h4>Security Scan Failed</h4>
@@ -240,8 +423,30 @@ function createSparkline(data) {
 
 
 
-function processHardcodedData() {
-    appState.tableData = HARDCODED_MODEL_DATA.map(model => ({
+// Fetch the current page of models from /api/models; filtering, sorting and paging happen server-side
+async function fetchModels() {
+    const query = appState.modelQuery;
+    const params = new URLSearchParams({
+        sort: query.sort,
+        order: query.order,
+        offset: query.offset,
+        limit: query.limit
+    });
+    if (query.stage !== 'all') params.set('stage', query.stage);
+    if (query.q) params.set('q', query.q);
+
+    const basePath = window.location.pathname.replace(/\/$/, '');
+    const response = await fetch(`${basePath}/api/models?${params}`);
+    if (!response.ok) {
+        throw new Error(`Loading models failed: ${response.status} ${response.statusText}`);
+    }
+    const page = await response.json();
+    appState.modelTotal = page.total;
+    return page.models;
+}
+
+function processModelData(models) {
+    appState.tableData = models.map(model => ({
         modelName: model.name || 'Unknown',
         modelVersion: model.version || 'n/a',
         dominoModelName: model.name || 'Unknown',
@@ -277,7 +482,42 @@ function processHardcodedData() {
         confidenceDistribution: model.confidence_distribution
     }));
 
-    console.log('Hardcoded data processed:', appState.tableData);
+    console.log('Model page processed:', appState.tableData);
+}
+
+function renderPagination() {
+    const { offset, limit } = appState.modelQuery;
+    const total = appState.modelTotal;
+    const info = document.querySelector('.page-info');
+    if (info) {
+        info.textContent = total ? `${offset + 1}–${Math.min(offset + limit, total)} of ${total}` : '';
+    }
+    const prev = document.querySelector('.page-prev');
+    const next = document.querySelector('.page-next');
+    if (prev) prev.disabled = offset === 0;
+    if (next) next.disabled = offset + limit >= total;
+
+    document.querySelectorAll('th.sortable').forEach(th => {
+        th.classList.remove('sorted-asc', 'sorted-desc');
+        if (th.dataset.sort === appState.modelQuery.sort) {
+            th.classList.add(`sorted-${appState.modelQuery.order}`);
+        }
+    });
+}
+
+// Reload the table for the current query
+async function loadModels() {
+    showLoading();
+    try {
+        processModelData(await fetchModels());
+        renderTable();
+    } catch (error) {
+        console.error('Model load error:', error);
+        appState.tableData = [];
+        appState.modelTotal = 0;
+        renderTable();
+    }
+    renderPagination();
 }
 
 function renderTable() {
@@ -502,27 +742,32 @@ function toggleDetails(button, index) {
 }
 
 function filterByStatus(status) {
-    const rows = document.querySelectorAll('tbody tr:not(.expandable-row)');
-    rows.forEach(row => {
-        if (status === 'all') {
-            row.style.display = '';
-        } else {
-            const statusCell = row.querySelector('.status-badge');
-            const matches = statusCell?.textContent.toLowerCase().includes(status.toLowerCase());
-            row.style.display = matches ? '' : 'none';
-        }
-    });
+    appState.modelQuery.stage = status;
+    appState.modelQuery.offset = 0;
+    loadModels();
+}
+
+function sortBy(field) {
+    const query = appState.modelQuery;
+    if (query.sort === field) {
+        query.order = query.order === 'desc' ? 'asc' : 'desc';
+    } else {
+        query.sort = field;
+        query.order = 'desc';
+    }
+    query.offset = 0;
+    loadModels();
+}
+
+function changePage(direction) {
+    const query = appState.modelQuery;
+    query.offset = Math.max(0, query.offset + direction * query.limit);
+    loadModels();
 }
 
-// Simplified initialization using hardcoded data
 function initializeDashboard() {
-    console.log('Initializing Dashboard with hardcoded data...');
-    showLoading();
-    
-    processHardcodedData();
-    renderTable();
-    
-    console.log('Dashboard ready');
+    console.log('Initializing Dashboard from /api/models...');
+    loadModels().then(() => console.log('Dashboard ready'));
 }
 
 // Event Listeners
@@ -539,18 +784,24 @@ document.querySelectorAll('.tab').forEach(tab => {
     });
 });
 
+document.querySelectorAll('th.sortable').forEach(th => {
+    th.addEventListener('click', () => sortBy(th.dataset.sort));
+});
+
+document.querySelector('.page-prev')?.addEventListener('click', () => changePage(-1));
+document.querySelector('.page-next')?.addEventListener('click', () => changePage(1));
+
 const searchBox = document.querySelector('.search-box');
 if (searchBox) {
+    let searchTimer = null;
     searchBox.addEventListener('input', function(e) {
-        const searchTerm = e.target.value.toLowerCase();
-        const rows = document.querySelectorAll('tbody tr:not(.expandable-row)');
-        
-        rows.forEach(row => {
-            const modelName = row.querySelector('.model-name')?.textContent.toLowerCase() || '';
-            const ownerName = row.querySelector('.user-name')?.textContent.toLowerCase() || '';
-            const matches = modelName.includes(searchTerm) || ownerName.includes(searchTerm);
-            row.style.display = matches ? '' : 'none';
-        });
+        // Debounced: one request once typing pauses
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => {
+            appState.modelQuery.q = e.target.value.trim();
+            appState.modelQuery.offset = 0;
+            loadModels();
+        }, 250);
     });
 }
 
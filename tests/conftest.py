@@ -0,0 +1,61 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+
+import pytest
+
+# app reads its configuration at import time; keep caches out of the user's home directory
+os.environ["SEC_SCAN_CACHE_DIR"] = tempfile.mkdtemp(prefix="secscan-tests-")
+os.environ.setdefault("DOMINO_DOMAIN", "http://127.0.0.1:9")
+os.environ.setdefault("DOMINO_API_KEY", "test-key")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+FAKE_SEMGREP = """#!{python}
+import json, os, sys
+if "--version" in sys.argv:
+    print("0.0.0-test")
+    sys.exit(0)
+target = sys.argv[-1]
+paths = [os.path.join(root, f) for root, _, files in os.walk(target) for f in files]
+results = [
+    {{"check_id": "test.rule", "path": p, "start": {{"line": 1}},
+      "extra": {{"severity": "WARNING", "message": "test finding"}}}}
+    for p in paths
+]
+print(json.dumps({{"version": "0.0.0-test", "results": results, "errors": [], "paths": {{"scanned": paths}}}}))
+"""
+
+
+@pytest.fixture
+def fake_semgrep(tmp_path, monkeypatch):
+    """A semgrep on PATH that reports one finding per file."""
+    path = tmp_path / "semgrep"
+    path.write_text(FAKE_SEMGREP.format(python=sys.executable))
+    path.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setattr(app_module, "_semgrep_version", None)
+    return path
+
+
+@pytest.fixture
+def fake_domino():
+    from benchmarks.fake_domino import FakeDomino, RepoShape
+
+    server = FakeDomino(RepoShape(depth=1, fanout=2, files_per_dir=3, file_size=64)).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def domino_client(fake_domino):
+    return app_module.DominoClient(fake_domino.url, "test-key", retries=0)
@@ -0,0 +1,62 @@
+# tests/test_batch_scan.py
+import json
+
+import pytest
+
+import app
+from model_data import model_data
+
+
+def test_parse_model_version_accepts_registered_numbers():
+    assert app._parse_model_version(3) == 3
+    assert app._parse_model_version("3") == 3
+    assert app._parse_model_version("v3") == 3
+
+
+@pytest.mark.parametrize("version", sorted({m["version"] for m in model_data}))
+def test_parse_model_version_rejects_dashboard_labels(version):
+    with pytest.raises(app.ScanError) as exc:
+        app._parse_model_version(version)
+    assert exc.value.status == 400
+
+
+def test_all_scans_every_shipped_model_at_its_latest_version(client, monkeypatch, fake_semgrep, fake_domino, domino_client):
+    fake_domino.latest_version = 7
+    monkeypatch.setattr(app, "get_domino_client", lambda: domino_client)
+    r = client.post("/security-scan-models", json={"all": True, "forceRescan": True})
+    assert r.status_code == 200
+    lines = [json.loads(line) for line in r.get_data(as_text=True).splitlines()]
+    records, done = lines[:-1], lines[-1]
+
+    assert sorted(rec["modelName"] for rec in records) == sorted(m["name"] for m in model_data)
+    assert all(rec["httpStatus"] == 200 and rec["version"] == 7 for rec in records)
+    assert done["done"] is True and done["succeeded"] == len(model_data) and done["failed"] == 0
+    # The fake pins every model's version 7 to one commit, which is scanned once
+    assert done["unique_commits"] == 1
+
+
+def test_models_list_is_required(client):
+    r = client.post("/security-scan-models", json={"models": []})
+    assert r.status_code == 400
+
+
+def test_invalid_versions_stream_400_records(client):
+    entries = [{"modelName": m["name"], "version": m["version"]} for m in model_data[:3]]
+    r = client.post("/security-scan-models", json={"models": entries})
+    lines = [json.loads(line) for line in r.get_data(as_text=True).splitlines()]
+    assert [rec["httpStatus"] for rec in lines[:-1]] == [400, 400, 400]
+    assert lines[-1]["done"] is True and lines[-1]["failed"] == 3
+
+
+@pytest.mark.parametrize("requested, expected", [(100000, app.BATCH_CONCURRENCY), (1, 1), (0, 1), (-5, 1)])
+def test_concurrency_is_clamped(client, monkeypatch, requested, expected):
+    seen = {}
+
+    def _fake_batch(entries, opts, include_issues=False, include_metrics=False, concurrency=None):
+        seen["concurrency"] = concurrency
+        yield {"done": True}
+
+    monkeypatch.setattr(app, "run_batch_scan", _fake_batch)
+    r = client.post("/security-scan-models", json={"models": [{"modelName": "m", "version": 1}], "concurrency": requested})
+    r.get_data()
+    assert seen["concurrency"] == expected
@@ -0,0 +1,103 @@
+# tests/test_checkout.py
+import os
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def ram_dir(tmp_path, monkeypatch):
+    path = tmp_path / "shm"
+    path.mkdir()
+    monkeypatch.setattr(app, "RAM_DIR", str(path))
+    return path
+
+
+def _entry(path, size):
+    return app.RepoEntry(path, size, None)
+
+
+def test_planner_spills_to_disk_past_the_threshold(ram_dir):
+    planner = app._CheckoutPlanner(100, None)
+    assert planner.storage == "memory"
+    ram_checkout = planner.repo_dir
+    planner.add(_entry("a.py", 60))
+    assert planner.repo_dir == ram_checkout
+
+    # Crossing the threshold moves later files to disk straight away
+    planner.add(_entry("b.py", 60))
+    assert planner.storage == "disk"
+    assert not planner.repo_dir.startswith(str(ram_dir))
+
+    os.makedirs(os.path.join(ram_checkout, "pkg"))
+    with open(os.path.join(ram_checkout, "pkg", "a.py"), "w") as f:
+        f.write("x")
+    planner.settle()
+    assert os.path.exists(os.path.join(planner.repo_dir, "pkg", "a.py"))
+    assert not os.path.exists(ram_checkout)
+    planner.discard()
+
+
+def test_planner_without_ram_budget_uses_disk(ram_dir):
+    planner = app._CheckoutPlanner(0, None)
+    assert planner.storage == "disk"
+    assert os.listdir(ram_dir) == []
+    planner.discard()
+
+
+@pytest.mark.parametrize("engine", ["thread", "asyncio"])
+@pytest.mark.parametrize("ram_max_bytes, storage", [(1 << 20, "memory"), (200, "disk")])
+def test_checkout_storage(engine, ram_max_bytes, storage, ram_dir, fake_domino, domino_client):
+    if engine == "asyncio" and app.aiohttp is None:
+        pytest.skip("aiohttp is not installed")
+    materialize = app.materialize_repo if engine == "thread" else app.materialize_repo_async
+    target = app.resolve_scan_target(domino_client, "test-model", 1)
+    stats = app.MaterializeStats()
+    repo_dir, written = materialize(
+        domino_client, target.project_id, target.repo_id, target.commit, None, None, 1000,
+        stats=stats, blob_cache=None, ram_max_bytes=ram_max_bytes,
+    )
+    try:
+        assert stats.storage == storage
+        assert len(written) == fake_domino.file_count
+        assert all(os.path.isfile(os.path.join(repo_dir, p)) for p in written)
+        # A spilled checkout leaves nothing behind in RAM
+        assert os.listdir(ram_dir) == ([os.path.basename(repo_dir)] if storage == "memory" else [])
+    finally:
+        app.shutil.rmtree(repo_dir, ignore_errors=True)
+
+
+@pytest.mark.parametrize("engine", ["thread", "asyncio"])
+def test_second_checkout_reuses_blob_cache(engine, tmp_path, fake_domino, domino_client):
+    if engine == "asyncio" and app.aiohttp is None:
+        pytest.skip("aiohttp is not installed")
+    materialize = app.materialize_repo if engine == "thread" else app.materialize_repo_async
+    blob_cache = app.BlobCache(str(tmp_path / "blobs"))
+    target = app.resolve_scan_target(domino_client, "test-model", 1)
+    for expected_reused in (0, fake_domino.file_count):
+        stats = app.MaterializeStats()
+        repo_dir, written = materialize(
+            domino_client, target.project_id, target.repo_id, target.commit, None, None, 1000,
+            stats=stats, blob_cache=blob_cache, ram_max_bytes=0,
+        )
+        app.shutil.rmtree(repo_dir, ignore_errors=True)
+        assert len(written) == fake_domino.file_count
+        assert stats.files_reused == expected_reused
+
+
+def test_asyncio_engine_backs_off_when_throttled(fake_domino, domino_client):
+    if app.aiohttp is None:
+        pytest.skip("aiohttp is not installed")
+    target = app.resolve_scan_target(domino_client, "test-model", 1)
+    fake_domino.throttle_rate = 0.3
+    domino_client.retries = 20
+    stats = app.MaterializeStats()
+    repo_dir, written = app.materialize_repo_async(
+        domino_client, target.project_id, target.repo_id, target.commit, None, None, 1000,
+        concurrency=8, stats=stats, blob_cache=None, ram_max_bytes=0,
+    )
+    app.shutil.rmtree(repo_dir, ignore_errors=True)
+    assert len(written) == fake_domino.file_count
+    assert stats.throttle_signals > 0
+    assert stats.concurrency_lowest < 8
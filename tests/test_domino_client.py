@@ -0,0 +1,186 @@
+# tests/test_domino_client.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+
+import pytest
+import requests
+
+import app
+
+
+def test_requests_beyond_pool_wait_for_a_kept_alive_connection(fake_domino):
+    dc = app.DominoClient(fake_domino.url, "test-key", pool_size=2, retries=0)
+    fake_domino.latency_sec = 0.02
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        list(ex.map(lambda _: dc.get_json("/v4/code/gitBrowse"), range(32)))
+    stats = dc.connection_stats()
+    assert stats["requests"] == 32
+    assert stats["connections_opened"] <= 2
+
+
+class _Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class _Session:
+    """Stands in for requests.Session: answers each get() with the next scripted outcome."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(app.time, "sleep", delays.append)
+    return delays
+
+
+def _client(outcomes, retries=4):
+    dc = app.DominoClient("http://domino.test", "test-key", retries=retries)
+    dc.s = _Session(outcomes)
+    return dc
+
+
+def test_throttling_and_server_errors_are_retried(sleeps):
+    throttled = []
+    responses = [_Response(429), _Response(503), _Response(500), _Response(200)]
+    dc = _client(responses)
+    r = dc._get("http://domino.test/x", on_throttle=lambda: throttled.append(1))
+    assert r.status_code == 200
+    assert dc.s.calls == 4 and len(sleeps) == 3
+    assert dc.n_retries == 3 and dc.n_throttled == 2 and len(throttled) == 2
+    assert all(resp.closed for resp in responses[:3])
+
+
+def test_last_response_is_returned_when_retries_run_out(sleeps):
+    dc = _client([_Response(502)] * 3, retries=2)
+    assert dc._get("http://domino.test/x").status_code == 502
+    assert dc.s.calls == 3 and len(sleeps) == 2
+
+
+def test_client_errors_are_not_retried(sleeps):
+    dc = _client([_Response(404)])
+    assert dc._get("http://domino.test/x").status_code == 404
+    assert sleeps == []
+
+
+def test_connection_errors_are_retried_then_raised(sleeps):
+    dc = _client([requests.ConnectionError("reset"), _Response(200)])
+    assert dc._get("http://domino.test/x").status_code == 200
+
+    dc = _client([requests.ConnectionError("reset")] * 3, retries=2)
+    with pytest.raises(requests.ConnectionError):
+        dc._get("http://domino.test/x")
+    assert dc.s.calls == 3
+
+
+def test_retry_after_seconds_is_honoured(sleeps):
+    dc = _client([_Response(429, {"Retry-After": "2"}), _Response(200)])
+    dc._get("http://domino.test/x")
+    assert sleeps == [2.0]
+
+
+def test_retry_after_http_date_is_honoured():
+    delay = app.retry_delay(0, formatdate(time.time() + 10, usegmt=True))
+    assert 8 <= delay <= 10
+    assert app.retry_delay(0, formatdate(time.time() - 60, usegmt=True)) == 0.0
+
+
+def test_retry_after_is_capped_and_garbage_falls_back_to_backoff(monkeypatch):
+    assert app.retry_delay(0, "3600") == app.HTTP_BACKOFF_MAX_SEC
+    monkeypatch.setattr(app.random, "uniform", lambda lo, hi: ("jitter", lo, hi))
+    assert app.retry_delay(0, "soon") == ("jitter", 0, app.HTTP_BACKOFF_BASE_SEC)
+
+
+def test_full_jitter_backoff_bounds(monkeypatch):
+    bounds = []
+    monkeypatch.setattr(app.random, "uniform", lambda lo, hi: bounds.append((lo, hi)) or hi)
+    for attempt in range(12):
+        app.retry_delay(attempt)
+    assert bounds == [
+        (0, min(app.HTTP_BACKOFF_MAX_SEC, app.HTTP_BACKOFF_BASE_SEC * 2 ** attempt)) for attempt in range(12)
+    ]
+    monkeypatch.undo()
+    for attempt in range(6):
+        for _ in range(50):
+            assert 0 <= app.retry_delay(attempt) <= app.HTTP_BACKOFF_BASE_SEC * 2 ** attempt
+
+
+def test_limiter_halves_on_throttle_down_to_minimum():
+    limiter = app.AdaptiveLimiter(8, minimum=1, cooldown_sec=0)
+    limits = []
+    for _ in range(5):
+        limiter.on_throttle()
+        limits.append(limiter.limit)
+    assert limits == [4, 2, 1, 1, 1]
+    assert limiter.lowest_limit == 1 and limiter.throttle_signals == 5
+
+
+def test_limiter_counts_a_burst_of_throttles_once():
+    limiter = app.AdaptiveLimiter(8, cooldown_sec=60)
+    for _ in range(4):
+        limiter.on_throttle()
+    assert limiter.limit == 4 and limiter.throttle_signals == 4
+
+
+def test_limiter_recovers_one_step_per_limit_successes():
+    limiter = app.AdaptiveLimiter(4, cooldown_sec=0)
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.limit == 1
+
+    def _succeed(n):
+        for _ in range(n):
+            with limiter:
+                pass
+
+    _succeed(1)
+    assert limiter.limit == 2
+    _succeed(1)
+    assert limiter.limit == 2
+    _succeed(1)
+    assert limiter.limit == 3
+    # Failures don't count towards recovery
+    for _ in range(5):
+        with pytest.raises(RuntimeError):
+            with limiter:
+                raise RuntimeError("fetch failed")
+    assert limiter.limit == 3
+    _succeed(3 + 4)
+    assert limiter.limit == 4 == limiter.maximum
+
+
+def test_limiter_caps_fetches_in_flight():
+    limiter = app.AdaptiveLimiter(2)
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    def _fetch(_):
+        with limiter:
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.005)
+            with lock:
+                in_flight[0] -= 1
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        list(ex.map(_fetch, range(16)))
+    assert peak[0] == 2
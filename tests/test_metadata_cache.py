@@ -0,0 +1,30 @@
+# tests/test_metadata_cache.py
+import app
+
+
+def test_invalidate_drops_matching_lookups(client, monkeypatch):
+    monkeypatch.setattr(app, "model_version_cache", app.TTLCache("model_version", 10, 60))
+    monkeypatch.setattr(app, "git_browse_cache", app.TTLCache("git_browse", 10, 60))
+    app.model_version_cache.put(("d", "m", 1), {})
+    app.model_version_cache.put(("d", "m", 2), {})
+    app.model_version_cache.put(("d", "other", 1), {})
+    app.git_browse_cache.put(("d", "alice", "proj"), {})
+
+    r = client.post("/metadata-cache/invalidate", json={"modelName": "m", "version": 1})
+    assert r.status_code == 200
+    assert r.get_json()["invalidated"] == {"model_version": 1, "git_browse": 0}
+
+    r = client.post("/metadata-cache/invalidate", json={})
+    assert r.get_json()["invalidated"] == {"model_version": 2, "git_browse": 1}
+
+
+def test_lookups_are_counted_in_metrics(client, monkeypatch):
+    monkeypatch.setattr(app, "model_version_cache", app.TTLCache("model_version", 10, 60))
+    calls = []
+    for _ in range(3):
+        app._cached_lookup(app.model_version_cache, ("d", "m", 1), lambda: calls.append(1) or {})
+    assert len(calls) == 1
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert 'secscan_metadata_cache_lookups_total{cache="model_version",outcome="hits"} 2' in body
+    assert 'secscan_metadata_cache_lookups_total{cache="model_version",outcome="misses"} 1' in body
@@ -0,0 +1,27 @@
+# tests/test_model_index.py
+import pytest
+
+import app
+from model_data import model_data
+
+
+@pytest.mark.parametrize("sort", ["name", "risk_score"])
+@pytest.mark.parametrize("offset, limit", [(0, 5), (3, 10), (38, 5), (40, 1), (41, 5), (100, 5), (0, 100)])
+def test_descending_pages_match_reversed_order(sort, offset, limit):
+    everything, total = app.model_index.query(sort=sort, offset=0, limit=len(model_data))
+    page, page_total = app.model_index.query(sort=sort, descending=True, offset=offset, limit=limit)
+    assert page_total == total == len(model_data)
+    assert page == everything[::-1][offset:offset + limit]
+
+
+def test_descending_pages_tile_the_index():
+    seen = []
+    offset = 0
+    while True:
+        page, _ = app.model_index.query(sort="risk_score", descending=True, offset=offset, limit=7)
+        if not page:
+            break
+        seen += page
+        offset += len(page)
+    assert [id(m) for m in seen] == [id(m) for m in app.model_index.query(sort="risk_score", descending=True, limit=100)[0]]
+    assert len(seen) == len(model_data)
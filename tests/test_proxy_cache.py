@@ -0,0 +1,96 @@
+# tests/test_proxy_cache.py
+import pytest
+
+import app
+
+BUNDLES = "/proxy/api/governance/v1/bundles"
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = app.ProxyResponseCache(16, 1 << 20)
+    monkeypatch.setattr(app, "proxy_cache", cache)
+    return cache
+
+
+def _get(client, fake_domino, api_key="key-a", **headers):
+    return client.get(BUNDLES, query_string={"target": fake_domino.url},
+                      headers={"X-Domino-Api-Key": api_key, **headers})
+
+
+def _age(cache, seconds):
+    for entry in cache._data.values():
+        entry.stored_at -= seconds
+
+
+def test_fresh_response_is_served_from_cache(client, fake_domino, cache):
+    first = _get(client, fake_domino)
+    assert first.status_code == 200 and first.headers["X-Proxy-Cache"] == "MISS"
+    upstream = fake_domino.requests
+
+    second = _get(client, fake_domino)
+    assert second.status_code == 200 and second.headers["X-Proxy-Cache"] == "HIT"
+    assert second.get_json() == first.get_json()
+    assert fake_domino.requests == upstream
+
+
+def test_max_age_expiry_triggers_revalidation(client, fake_domino, cache):
+    _get(client, fake_domino)
+    (entry,) = cache._data.values()
+    assert entry.max_age == 5 and entry.etag == '"bundles-v1"'
+    assert entry.fresh()
+
+    _age(cache, 4)
+    assert _get(client, fake_domino).headers["X-Proxy-Cache"] == "HIT"
+    _age(cache, 2)
+    assert not entry.fresh()
+
+
+def test_upstream_304_becomes_cached_200(client, fake_domino, cache):
+    first = _get(client, fake_domino)
+    _age(cache, 10)
+    upstream = fake_domino.requests
+
+    # The fake only answers 304 when the proxy sent the stored ETag as If-None-Match
+    revalidated = _get(client, fake_domino)
+    assert fake_domino.requests == upstream + 1
+    assert revalidated.status_code == 200
+    assert revalidated.headers["X-Proxy-Cache"] == "REVALIDATED"
+    assert revalidated.get_json() == first.get_json()
+    assert cache.stats()["revalidated"] == 1
+
+    # The 304 refreshed the entry's lifetime
+    assert _get(client, fake_domino).headers["X-Proxy-Cache"] == "HIT"
+
+
+def test_client_if_none_match_gets_304_from_cache(client, fake_domino, cache):
+    _get(client, fake_domino)
+    r = _get(client, fake_domino, **{"If-None-Match": '"bundles-v1"'})
+    assert r.status_code == 304
+    assert r.headers["X-Proxy-Cache"] == "HIT"
+
+
+def test_responses_do_not_leak_between_api_keys(client, fake_domino, cache):
+    _get(client, fake_domino, api_key="key-a")
+    upstream = fake_domino.requests
+
+    other = _get(client, fake_domino, api_key="key-b")
+    assert other.headers["X-Proxy-Cache"] == "MISS"
+    assert fake_domino.requests == upstream + 1
+    assert _get(client, fake_domino, api_key="key-a").headers["X-Proxy-Cache"] == "HIT"
+
+    key_a = app.ProxyResponseCache.key("u", {}, {"X-Domino-Api-Key": "key-a"})
+    assert key_a != app.ProxyResponseCache.key("u", {}, {"X-Domino-Api-Key": "key-b"})
+    assert key_a == app.ProxyResponseCache.key("u", {}, {"x-domino-api-key": "key-a"})
+
+
+def test_no_store_request_bypasses_cache(client, fake_domino, cache):
+    _get(client, fake_domino)
+    r = _get(client, fake_domino, **{"Cache-Control": "no-store"})
+    assert r.status_code == 200 and "X-Proxy-Cache" not in r.headers
+
+
+def test_one_pooled_session_per_origin():
+    a = app.get_proxy_session("http://example.test:8080/api/x")
+    assert app.get_proxy_session("HTTP://EXAMPLE.TEST:8080/other") is a
+    assert app.get_proxy_session("http://example.test:9090/api/x") is not a
@@ -0,0 +1,21 @@
+# tests/test_repo_listing.py
+import time
+
+import app
+
+TREE = {
+    "": [{"kind": "file", "path": "root.py"}, {"kind": "dir", "path": "slow"}, {"kind": "dir", "path": "fast"}],
+    "slow": [{"kind": "file", "path": f"slow/{i}.py"} for i in range(3)],
+    "fast": [{"kind": "file", "path": f"fast/{i}.py"} for i in range(3)],
+}
+
+
+def test_max_files_cap_keeps_breadth_first_prefix(monkeypatch):
+    def _browse(dc, project_id, repo_id, commit, directory):
+        if directory == "slow":
+            time.sleep(0.2)  # answered after "fast", which was submitted later
+        return TREE[directory]
+
+    monkeypatch.setattr(app, "_browse_directory", _browse)
+    paths = list(app.iter_repo_paths(None, "p", "r", "c", max_files=4, workers=4))
+    assert paths == ["root.py", "slow/0.py", "slow/1.py", "slow/2.py"]
@@ -0,0 +1,178 @@
+# tests/test_scan_cache.py
+import itertools
+
+import pytest
+
+import app
+
+_versions = itertools.count(1000)
+
+
+def _scan(dc, version, **body):
+    target = app.resolve_scan_target(dc, "test-model", version)
+    opts = app.ScanOptions.from_body({"fileRegex": r"\.py$", **body})
+    return app.scan_commit(dc, target, opts)
+
+
+def test_checkout_with_failed_downloads_is_not_cached(fake_semgrep, fake_domino, domino_client):
+    version = next(_versions)
+    missing = sorted(fake_domino.sizes)[0]
+    size = fake_domino.sizes.pop(missing)  # listed, but git/raw answers 404
+    # New content, so the blob cache (shared with earlier tests) can't supply it either
+    item = next(it for items in fake_domino.tree.values() for it in items if it["path"] == missing)
+    item["sha"] = f"changed-{version}"
+
+    summary, info = _scan(domino_client, version)
+    assert info["partial"] is True
+    assert info["files_missing"] == 1
+    assert info["file_count_scanned"] == fake_domino.file_count - 1
+
+    fake_domino.sizes[missing] = size
+    summary, info = _scan(domino_client, version)
+    assert info["cache_hit"] is False
+    assert info["partial"] is False
+    assert info["file_count_scanned"] == fake_domino.file_count
+
+    summary, info = _scan(domino_client, version)
+    assert info["cache_hit"] is True
+    assert info["file_count_scanned"] == fake_domino.file_count
+
+
+def test_cache_key_includes_max_file_bytes_only_when_set():
+    base = ("repo", "abc", "p/default", r"\.py$", None, 5000, "1.0")
+    assert app.scan_cache_key(*base) == app.scan_cache_key(*base, 0, 0)
+    assert app.scan_cache_key(*base, 0, 10) != app.scan_cache_key(*base)
+    assert app.scan_cache_key(*base, 0, 10) != app.scan_cache_key(*base, 10, 0)
+
+
+def test_max_file_bytes_scan_is_not_served_from_uncapped_result(fake_semgrep, fake_domino, domino_client):
+    version = next(_versions)
+    _, info = _scan(domino_client, version)
+    assert info["cache_hit"] is False
+
+    # Every file exceeds the cap, so a fresh run finds nothing to scan instead of a cache hit
+    with pytest.raises(app.ScanError) as exc:
+        _scan(domino_client, version, maxFileBytes=10)
+    assert exc.value.status == 404
+
+    _, info = _scan(domino_client, version, maxFileBytes=1000)
+    assert info["cache_hit"] is False
+
+
+def test_scans_with_different_file_caps_do_not_coalesce(monkeypatch):
+    keys = []
+
+    def _do(key, fn, progress):
+        keys.append(key)
+        return ({}, 200), False, 0
+
+    monkeypatch.setattr(app.scan_flights, "do", _do)
+    for cap in (0, 10):
+        app.perform_security_scan({"useLocal": False, "modelName": "m", "version": 1, "maxFileBytes": cap})
+    assert keys[0] != keys[1]
+
+
+def test_differential_scan_is_cached_apart_from_full_scan(fake_semgrep, fake_domino, domino_client):
+    baseline, version = next(_versions), next(_versions)
+    _, info = _scan(domino_client, baseline)
+    baseline_commit = app.resolve_scan_target(domino_client, "test-model", baseline).commit
+
+    _, info = _scan(domino_client, version, baselineCommit=baseline_commit)
+    assert info["cache_hit"] is False
+    assert info["incremental"]["baseline_found"] is True
+    incremental_key = info["cache_key"]
+
+    _, info = _scan(domino_client, version)
+    assert info["cache_hit"] is False
+    assert info["incremental"] is None
+    assert info["cache_key"] != incremental_key
+
+    _, info = _scan(domino_client, version, baselineCommit=baseline_commit)
+    assert info["cache_hit"] is True
+    assert info["cache_key"] == incremental_key
+
+
+def _issues():
+    issues = []
+    for n, (severity, filename) in enumerate([
+        ("LOW", "a.py"), ("HIGH", "pkg/b.py"), ("MEDIUM", "pkg/sub/c.py"), ("HIGH", "a.py"),
+        ("LOW", "pkg/b.py"), ("MEDIUM", "a.py"), ("HIGH", "pkg/sub/c.py"), ("LOW", "pkgs/d.py"),
+        ("HIGH", "a.py"), ("MEDIUM", "pkg/b.py"), ("LOW", "a.py"), ("HIGH", "pkg/b.py"),
+    ]):
+        issues.append({
+            "issue_severity": severity, "filename": filename, "line_number": 100 - n,
+            "test_id": "rule.exec" if n % 3 == 0 else "rule.sql", "issue_text": f"issue {n}",
+        })
+    return issues
+
+
+@pytest.fixture
+def issues_store(tmp_path):
+    store = app.ScanIssuesStore(str(tmp_path / "issues.sqlite3"))
+    store.save("scan-1", _issues())
+    return store
+
+
+def _all_pages(store, limit, **filters):
+    pages, after = [], -1
+    while True:
+        issues, cursor = store.page("scan-1", after=after, limit=limit, **filters)
+        pages.append(issues)
+        if cursor is None:
+            return pages
+        after = cursor
+
+
+def test_issues_are_numbered_most_severe_first(issues_store):
+    (issues,) = _all_pages(issues_store, 100)
+    keys = [(app.SEVERITY_ORDER[i["issue_severity"]], i["filename"], i["line_number"]) for i in issues]
+    assert keys == sorted(keys)
+    assert issues_store.total("scan-1") == 12
+
+
+@pytest.mark.parametrize("limit, sizes", [(5, [5, 5, 2]), (4, [4, 4, 4]), (12, [12]), (1, [1] * 12), (50, [12])])
+def test_page_boundaries(issues_store, limit, sizes):
+    pages = _all_pages(issues_store, limit)
+    assert [len(p) for p in pages] == sizes
+    flat = [i for p in pages for i in p]
+    assert flat == _all_pages(issues_store, 100)[0]
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"severities": ["HIGH"]}, lambda i: i["issue_severity"] == "HIGH"),
+    ({"severities": ["HIGH", "LOW"]}, lambda i: i["issue_severity"] in ("HIGH", "LOW")),
+    ({"filename": "a.py"}, lambda i: i["filename"] == "a.py"),
+    ({"filename": "pkg/"}, lambda i: i["filename"].startswith("pkg/")),
+    ({"test_id": "rule.exec"}, lambda i: i["test_id"] == "rule.exec"),
+    ({"severities": ["HIGH"], "filename": "pkg/", "test_id": "rule.sql"},
+     lambda i: i["issue_severity"] == "HIGH" and i["filename"].startswith("pkg/") and i["test_id"] == "rule.sql"),
+])
+def test_filters_across_pages(issues_store, filters, expected):
+    everything = _all_pages(issues_store, 100)[0]
+    paged = [i for p in _all_pages(issues_store, 2, **filters) for i in p]
+    assert paged == [i for i in everything if expected(i)]
+    assert paged
+
+
+def test_unknown_and_expired_scans_have_no_total(tmp_path, issues_store):
+    assert issues_store.total("nope") is None
+    expired = app.ScanIssuesStore(str(tmp_path / "issues.sqlite3"), max_age_sec=-1)
+    assert expired.total("scan-1") is None
+
+
+def test_issues_endpoint_pages_and_filters(client, monkeypatch, issues_store):
+    monkeypatch.setattr(app, "scan_issues_store", issues_store)
+    r = client.get("/scans/scan-1/issues", query_string={"limit": 3, "severity": "high, medium"})
+    body = r.get_json()
+    assert r.status_code == 200 and body["total"] == 12 and len(body["issues"]) == 3
+
+    seen = body["issues"]
+    while body["nextCursor"] is not None:
+        body = client.get("/scans/scan-1/issues", query_string={
+            "limit": 3, "severity": "high, medium", "cursor": body["nextCursor"],
+        }).get_json()
+        seen += body["issues"]
+    assert [i["issue_severity"] for i in seen] == ["HIGH"] * 5 + ["MEDIUM"] * 3
+
+    assert client.get("/scans/nope/issues").status_code == 404
+    assert client.get("/scans/scan-1/issues", query_string={"cursor": "x"}).status_code == 400
@@ -0,0 +1,45 @@
+# tests/test_semgrep_stream.py
+import io
+import json
+
+import pytest
+
+import app
+
+
+def _parse(text, chunk_size):
+    results = []
+    output = app.SemgrepJsonStream(io.StringIO(text), results.append, chunk_size=chunk_size).parse()
+    return output, results
+
+
+@pytest.mark.parametrize("text, chunk_sizes", [
+    ('{"a": 123.45}', (1, 5, 10)),
+    ('{"a": 1e5}', (1, 4, 8)),
+    ('{"a": -0.5E-3, "b": 12}', (1, 2, 3, 7, 9)),
+])
+def test_numbers_split_across_chunks(text, chunk_sizes):
+    for chunk_size in chunk_sizes:
+        output, _ = _parse(text, chunk_size)
+        assert output == {"results": [], **json.loads(text)}, chunk_size
+
+
+def test_results_streamed_at_every_chunk_size():
+    doc = {
+        "version": "1.2.3",
+        "results": [
+            {"check_id": "r1", "path": "a.py", "start": {"line": 10, "col": 1.5}, "extra": {"severity": "ERROR"}},
+            {"check_id": "r2", "path": "b.py", "start": {"line": 2e3}, "extra": {"ok": True, "n": None}},
+        ],
+        "errors": [],
+        "paths": {"scanned": ["a.py", "b.py"]},
+    }
+    text = json.dumps(doc)
+    for chunk_size in range(1, len(text) + 1):
+        output, results = _parse(text, chunk_size)
+        assert results == doc["results"], chunk_size
+        assert output == {**doc, "results": []}, chunk_size
+
+
+def test_empty_output_is_no_findings():
+    assert _parse("", 4) == ({"results": []}, [])
@@ -0,0 +1,114 @@
+# tests/test_sharded_scan.py
+import functools
+import os
+import subprocess
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    paths = []
+    for d in ("", "pkg", "pkg/sub", "other"):
+        for i in range(3):
+            rel = os.path.join(d, f"mod_{i}.py") if d else f"mod_{i}.py"
+            path = root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x = 1\n" * (i + 1))
+            paths.append(rel)
+    return str(root), sorted(paths)
+
+
+def _findings(output):
+    return sorted((r["check_id"], r["path"]) for r in output["results"])
+
+
+def test_shard_results_merge_like_a_single_scan(fake_semgrep, repo):
+    root, paths = repo
+    single = app.run_semgrep_scan(root)
+    merged, shard_errors, failed_paths = app.run_sharded_semgrep_scan(root, paths, shards=3, cpu_budget=3)
+
+    assert shard_errors == [] and failed_paths == []
+    assert _findings(merged) == _findings(single)
+    assert sorted(merged["paths"]["scanned"]) == sorted(os.path.join(root, p) for p in paths)
+    assert merged["version"] == "0.0.0-test"
+    # Shard scratch dirs are cleaned up beside the checkout
+    assert not [d for d in os.listdir(os.path.dirname(root)) if d.startswith("domino_shard_")]
+
+
+def _failing_shard(monkeypatch, exc):
+    """Make the shard holding other/mod_0.py fail with exc; the rest scan normally."""
+    real = app.run_semgrep_scan
+
+    def _scan(target_dir, **kwargs):
+        if os.path.exists(os.path.join(target_dir, "other", "mod_0.py")):
+            raise exc
+        return real(target_dir, **kwargs)
+
+    monkeypatch.setattr(app, "run_semgrep_scan", _scan)
+
+
+def test_failed_shard_is_reported_and_other_findings_kept(fake_semgrep, repo, monkeypatch):
+    root, paths = repo
+    _failing_shard(monkeypatch, RuntimeError("semgrep crashed"))
+    merged, shard_errors, failed_paths = app.run_sharded_semgrep_scan(root, paths, shards=3, cpu_budget=3)
+
+    assert len(shard_errors) == 1
+    assert shard_errors[0]["error"] == "semgrep crashed"
+    assert shard_errors[0]["file_count"] == len(failed_paths)
+    assert "other/mod_0.py" in failed_paths
+    scanned = {os.path.relpath(p, root) for _, p in _findings(merged)}
+    assert scanned == set(paths) - set(failed_paths)
+    assert scanned  # the other shards' findings survive
+
+
+def test_timed_out_shard_is_reported(fake_semgrep, repo, monkeypatch):
+    root, paths = repo
+    _failing_shard(monkeypatch, subprocess.TimeoutExpired(["semgrep"], 5))
+    _, shard_errors, failed_paths = app.run_sharded_semgrep_scan(root, paths, shards=2, cpu_budget=2, timeout_sec=5)
+    assert [e["error"] for e in shard_errors] == ["timed out after 5s"]
+    assert failed_paths
+
+
+def test_every_shard_failing_raises(fake_semgrep, repo, monkeypatch):
+    root, paths = repo
+
+    def _crash(target_dir, **kwargs):
+        raise RuntimeError("semgrep crashed")
+
+    monkeypatch.setattr(app, "run_semgrep_scan", _crash)
+    with pytest.raises(RuntimeError, match="All semgrep shards failed"):
+        app.run_sharded_semgrep_scan(root, paths, shards=2, cpu_budget=2)
+
+    def _hang(target_dir, **kwargs):
+        raise subprocess.TimeoutExpired(["semgrep"], 5)
+
+    monkeypatch.setattr(app, "run_semgrep_scan", _hang)
+    with pytest.raises(subprocess.TimeoutExpired):
+        app.run_sharded_semgrep_scan(root, paths, shards=2, cpu_budget=2)
+
+
+def test_scan_with_failed_shard_is_partial_and_not_cached(fake_semgrep, fake_domino, domino_client, monkeypatch):
+    target = app.resolve_scan_target(domino_client, "test-model", 2000)
+    opts = app.ScanOptions.from_body({"fileRegex": r"\.py$", "semgrepShards": 2})
+    real = app.run_semgrep_scan
+
+    def _scan(target_dir, **kwargs):
+        if os.path.exists(os.path.join(target_dir, "module_0.py")):
+            raise RuntimeError("semgrep crashed")
+        return real(target_dir, **kwargs)
+
+    monkeypatch.setattr(app, "run_semgrep_scan", _scan)
+    # Two shards whatever this machine's CPU count
+    monkeypatch.setattr(app, "run_sharded_semgrep_scan", functools.partial(app.run_sharded_semgrep_scan, cpu_budget=2))
+    summary, info = app.scan_commit(domino_client, target, opts)
+    assert info["partial"] is True
+    assert len(info["shard_errors"]) == 1
+    assert 0 < info["file_count_scanned"]
+
+    monkeypatch.setattr(app, "run_semgrep_scan", real)
+    _, info = app.scan_commit(domino_client, target, opts)
+    assert info["cache_hit"] is False and info["partial"] is False